@@ -2,6 +2,25 @@
  * Character and Location Gallery Logic
  */
 
+// Inline placeholder (from site data) painted behind a card image while it loads
+function placeholderStyle(data) {
+    if (!data || !data.placeholder) return '';
+    return ` style="background: url('${data.placeholder}') center / cover no-repeat;"`;
+}
+
+// Cards are one column on mobile, otherwise at most ~400px wide
+const CARD_SIZES = '(max-width: 768px) 100vw, 400px';
+
+// Lazy card image; <picture> with AVIF/WebP renditions when the site data has them.
+// No width/height attributes: the card CSS reserves space with aspect-ratio.
+function cardImage(src, alt, data) {
+    const img = `<img src="${src}" alt="${alt}" class="card-thumbnail" loading="lazy" decoding="async"` +
+        `${data && data.srcset && data.srcset.webp ? ` srcset="${data.srcset.webp}" sizes="${CARD_SIZES}"` : ''}` +
+        `${placeholderStyle(data)} onerror="this.removeAttribute('srcset'); this.src='images/placeholder.png'">`;
+    if (!data || !data.srcset || !data.srcset.avif) return img;
+    return `<picture><source type="image/avif" srcset="${data.srcset.avif}" sizes="${CARD_SIZES}">${img}</picture>`;
+}
+
 class CharacterGallery {
     constructor() {
         this.characters = {};
@@ -15,11 +34,7 @@ class CharacterGallery {
 
     async init() {
         try {
-            const response = await fetch('data/characters.json');
-            if (!response.ok) {
-                throw new Error('Failed to load characters data');
-            }
-            this.characters = await response.json();
+            this.characters = await loadSiteData('characters');
             this.renderGallery();
             this.setupFilters();
             this.setupModal();
@@ -71,7 +86,7 @@ class CharacterGallery {
 
             return `
                 <div class="character-card" data-category="${char.category}">
-                    ${thumbnail ? `<img src="${thumbnail}" alt="${char.name}" class="card-thumbnail" onerror="this.src='images/placeholder.png'">` : ''}
+                    ${thumbnail ? cardImage(thumbnail, char.name, char) : ''}
                     <div class="card-content">
                         <h3>${char.name}</h3>
                         ${role ? `<p class="role">${role}</p>` : ''}
@@ -126,40 +141,8 @@ class CharacterGallery {
     }
 
     getThumbnail(char) {
-        const thumbnailMap = {
-            // Main party characters
-            'Val': 'images/characters/val-portrait.png',
-            'Prismor': 'images/characters/prismor-portrait.png',
-            'Apocalypse Winter': 'images/characters/apocalypse-winter-portrait.png',
-            'Lunara': 'images/characters/lunara-portrait.png',
-            'Malrik': 'images/characters/malrik-portrait.png',
-
-            // NPCs
-            'Sorrel - Halfling': 'images/npcs/sorrel-halfling-portrait.png',
-            'Sorrel (halfling disguise)': 'images/npcs/sorrel-halfling-portrait.png',
-            'Sorrel - Dragon Form': 'images/npcs/sorrel-dragon-portrait.png',
-            'Marge': 'images/npcs/marge-portrait.png',
-            'Barth': 'images/npcs/barth-portrait.png',
-            'Marivielle Greenbough': 'images/npcs/marivielle-portrait.png',
-            'Lord Alric': 'images/npcs/lord-alric-portrait.png',
-
-            // Monsters/Creatures
-            'Verdant Mephit': 'images/monsters/verdant-mephit.png',
-            'Gear Mephit': 'images/monsters/gear-mephit.png',
-            'Starlight Mephit': 'images/monsters/starlight-mephit.png',
-            'Blink Mephit': 'images/monsters/blink-mephit.png',
-            'Melody Mephit': 'images/monsters/melody-mephit.png',
-
-            // Background NPCs
-            'Fantasy Crowd': 'images/npcs/fantasy-crowd.png',
-            'Festival crowd': 'images/npcs/festival-crowd.png',
-            'Halfling courier': 'images/npcs/halfling-courier.png',
-            'Gambler': 'images/npcs/gambler.png',
-            'Well-dressed gambler': 'images/npcs/gambler.png',
-            'Race contestants': 'images/npcs/race-contestants.png'
-        };
-
-        return thumbnailMap[char.name] || null;
+        // Card-sized rendition (or PNG) written by generate_site_data.py
+        return char.image || null;
     }
 
     getSummary(char) {
@@ -340,11 +323,7 @@ class LocationGallery {
 
     async init() {
         try {
-            const response = await fetch('data/locations.json');
-            if (!response.ok) {
-                throw new Error('Failed to load locations data');
-            }
-            this.locations = await response.json();
+            this.locations = await loadSiteData('locations');
             this.renderGallery();
             this.setupModal();
         } catch (error) {
@@ -368,12 +347,12 @@ class LocationGallery {
 
         container.innerHTML = locations.map(([name, data]) => {
             const detailUrl = this.getDetailUrl(name);
-            const thumbnail = this.getThumbnail(name);
+            const thumbnail = this.getThumbnail(name, data);
             const summary = this.getSummary(name);
 
             return `
                 <div class="character-card location-card">
-                    ${thumbnail ? `<img src="${thumbnail}" alt="${data.name || name}" class="card-thumbnail" onerror="this.src='images/placeholder.png'">` : ''}
+                    ${thumbnail ? cardImage(thumbnail, data.name || name, data) : ''}
                     <div class="card-content">
                         <h3>${data.name || name}</h3>
                         ${data.description_components?.type ?
@@ -416,22 +395,9 @@ class LocationGallery {
         return urlMap[locationName] || null;
     }
 
-    getThumbnail(locationName) {
-        const thumbnailMap = {
-            'Everpeak Citadel Exterior': 'images/locations/everpeak_citadel_exterior.png',
-            'Festival Marketplace': 'images/locations/festival_marketplace.png',
-            'Grand Courtyard': 'images/locations/grand_courtyard.png',
-            'The Grand Library': 'images/locations/the_grand_library.png',
-            'The Observatory': 'images/locations/the_observatory.png',
-            'Courier Tunnels': 'images/locations/courier_tunnels.png',
-            'Balcony Garden Café': 'images/locations/balcony_garden_café.png',
-            "Barth's Forge": 'images/locations/barths_forge.png',
-            'Sled Race Course': 'images/locations/sled_race_course.png',
-            'The Elven Sanctum': 'images/locations/the_elven_sanctum.png',
-            'Mountain Path': 'images/locations/mountain_path.png'
-        };
-
-        return thumbnailMap[locationName] || null;
+    getThumbnail(locationName, data) {
+        // Card-sized rendition (or PNG) written by generate_site_data.py
+        return (data && data.image) || null;
     }
 
     getSummary(locationName) {
@@ -2,28 +2,50 @@
  * Comic Reader - Main navigation and display logic
  */
 
+// Rendered page width, matching .page-display padding in reader.css
+const PAGE_SIZES = '(max-width: 768px) calc(100vw - 40px), min(1200px, calc(100vw - 80px))';
+
+// Preferred first: the browser takes the first <source> type it supports
+const PAGE_FORMATS = ['avif', 'webp'];
+
+// Upcoming pages the service worker caches ahead, in reading order
+const WARM_AHEAD = 4;
+
+// Pages fetched and decoded around the current one; looks further ahead
+// (and not behind) while the reader flips quickly in one direction
+const PREFETCH_AHEAD = 1;
+const PREFETCH_BEHIND = 1;
+const FAST_PREFETCH_AHEAD = 4;
+const FAST_NAV_INTERVAL = 1200; // ms between page turns
+const NAV_HISTORY = 4;
+
+const SEARCH_DEBOUNCE = 120; // ms
+const SEARCH_MAX_RESULTS = 12;
+
 class ComicReader {
     constructor() {
         this.pages = [];
         this.currentPageIndex = 0;
         this.viewMode = 'single'; // 'single' or 'grid'
         this.isLoading = false;
+        this.preloadedImages = new Map(); // page index -> detached <img>
+        this.navHistory = [];
+        this.panelMode = false; // Guided panel-by-panel reading
+        this.panelIndex = 0;
+        this.search = new PageSearch();
     }
 
     async init() {
         try {
             // Load page metadata
-            const response = await fetch('data/pages.json');
-            if (!response.ok) {
-                throw new Error('Failed to load pages data');
-            }
-            this.pages = await response.json();
+            this.pages = this.unpackPages(await loadSiteData('pages'));
 
             // Initialize UI
             this.setupControls();
             this.setupKeyboardShortcuts();
             this.setupTouchGestures();
             this.setupBrowserNavigation();
+            this.setupSearch();
             this.loadPageFromURL();
             this.updateDisplay();
             this.preloadAdjacentPages();
@@ -40,6 +62,46 @@ class ComicReader {
         }
     }
 
+    unpackPages(data) {
+        // Expand the packed pages.json written by generate_site_data.py
+        // (pack_pages) back into one self-contained entry per page
+        if (Array.isArray(data)) return data;
+
+        const { base, sheets } = data;
+        const resolve = (path, dir) => (path.startsWith('images/') ? path : dir + path);
+
+        return data.pages.map(packed => {
+            const page = { is_spread: false, is_cover: false, ...packed };
+            page.image = resolve(packed.image, base.pages);
+            page.thumbnail = resolve(packed.thumbnail, base.thumbnails);
+
+            if (packed.srcset) {
+                page.srcset = {};
+                Object.entries(packed.srcset).forEach(([format, candidates]) => {
+                    page.srcset[format] = candidates
+                        .map(([file, width]) => `${resolve(file, base.pages)} ${width}w`)
+                        .join(', ');
+                });
+            }
+
+            if (packed.sprite) {
+                const [sheet, x, y, width, height] = packed.sprite;
+                const [path, sheetWidth, sheetHeight] = sheets[sheet];
+                page.sprite = {
+                    sheet: resolve(path, base.thumbnails),
+                    sheet_width: sheetWidth,
+                    sheet_height: sheetHeight,
+                    x, y, width, height
+                };
+            }
+
+            if (packed.panels) {
+                page.panels = packed.panels.map(([x, y, width, height]) => ({ x, y, width, height }));
+            }
+            return page;
+        });
+    }
+
     setupControls() {
         // Navigation buttons
         document.getElementById('first-page').addEventListener('click', () => this.goToFirstPage());
@@ -52,6 +114,84 @@ class ComicReader {
         document.getElementById('view-grid').addEventListener('click', () => this.switchView('grid'));
         document.getElementById('toggle-grid-view').addEventListener('click', () => this.switchView('grid'));
         document.getElementById('close-grid').addEventListener('click', () => this.switchView('single'));
+        document.getElementById('view-panels').addEventListener('click', () => this.togglePanelMode());
+    }
+
+    setupSearch() {
+        const input = document.getElementById('page-search');
+        const results = document.getElementById('search-results');
+        let timer = null;
+        let latest = 0;
+
+        input.addEventListener('input', () => {
+            clearTimeout(timer);
+            timer = setTimeout(async () => {
+                // Ignore responses that arrive after a newer query
+                const query = input.value;
+                const request = ++latest;
+                const matches = query.trim() ? await this.search.search(query) : [];
+                if (request === latest) this.renderSearchResults(matches, query);
+            }, SEARCH_DEBOUNCE);
+        });
+
+        input.addEventListener('keydown', (e) => {
+            const items = Array.from(results.querySelectorAll('li[data-index]'));
+            const active = results.querySelector('li.active');
+            let position = items.indexOf(active);
+
+            if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+                e.preventDefault();
+                if (!items.length) return;
+                position = e.key === 'ArrowDown'
+                    ? Math.min(items.length - 1, position + 1)
+                    : Math.max(0, position - 1);
+                items.forEach((item, i) => item.classList.toggle('active', i === position));
+            } else if (e.key === 'Enter') {
+                const choice = active || items[0];
+                if (choice) this.openSearchResult(Number(choice.dataset.index));
+            } else if (e.key === 'Escape') {
+                this.closeSearch();
+            }
+        });
+
+        results.addEventListener('click', (e) => {
+            const item = e.target.closest('li[data-index]');
+            if (item) this.openSearchResult(Number(item.dataset.index));
+        });
+    }
+
+    renderSearchResults(matches, query) {
+        const results = document.getElementById('search-results');
+        if (!query.trim()) {
+            results.classList.add('hidden');
+            return;
+        }
+
+        const items = matches.slice(0, SEARCH_MAX_RESULTS).map(match => {
+            const index = this.pages.findIndex(p => p.page === match.page);
+            if (index === -1) return '';
+            const page = this.pages[index];
+            const label = page.page === 0 ? 'Cover' : `Page ${page.page}`;
+            const meta = [...(page.characters || []).slice(0, 3), ...(page.locations || [])].join(' • ');
+            return `<li role="option" data-index="${index}">${label}: ${page.title}` +
+                `<span class="result-meta">${meta}</span></li>`;
+        }).join('');
+
+        results.innerHTML = items || '<li class="no-results">No matching pages</li>';
+        results.classList.remove('hidden');
+    }
+
+    openSearchResult(pageIndex) {
+        this.closeSearch();
+        this.switchView('single');
+        this.goToPage(pageIndex);
+    }
+
+    closeSearch() {
+        const input = document.getElementById('page-search');
+        document.getElementById('search-results').classList.add('hidden');
+        input.value = '';
+        input.blur();
     }
 
     setupKeyboardShortcuts() {
@@ -87,6 +227,11 @@ class ComicReader {
                     e.preventDefault();
                     this.toggleView();
                     break;
+                case 'p':
+                case 'P':
+                    e.preventDefault();
+                    this.togglePanelMode();
+                    break;
             }
         });
     }
@@ -126,6 +271,7 @@ class ComicReader {
                 const pageIndex = this.pages.findIndex(p => p.page === e.state.page);
                 if (pageIndex !== -1) {
                     this.currentPageIndex = pageIndex;
+                    this.panelIndex = 0;
                     this.updateDisplay(false); // Don't push state again
                     this.preloadAdjacentPages();
                 }
@@ -146,10 +292,12 @@ class ComicReader {
         }
     }
 
-    goToPage(pageIndex, pushState = true) {
+    goToPage(pageIndex, pushState = true, panelIndex = 0) {
         if (pageIndex < 0 || pageIndex >= this.pages.length) return;
 
         this.currentPageIndex = pageIndex;
+        this.panelIndex = panelIndex;
+        this.recordNavigation(pageIndex);
         this.updateDisplay(pushState);
         this.preloadAdjacentPages();
 
@@ -166,23 +314,78 @@ class ComicReader {
     }
 
     previousPage() {
+        // In panel view, step back through this page's panels first
+        if (this.panelMode && this.panelIndex > 0) {
+            this.panelIndex--;
+            this.applyPanelZoom();
+            return;
+        }
         if (this.currentPageIndex > 0) {
-            this.goToPage(this.currentPageIndex - 1);
+            const previous = this.pages[this.currentPageIndex - 1];
+            const lastPanel = this.panelMode ? Math.max(0, this.panelCount(previous) - 1) : 0;
+            this.goToPage(this.currentPageIndex - 1, true, lastPanel);
         }
     }
 
     nextPage() {
+        // In panel view, step through this page's panels first
+        const page = this.pages[this.currentPageIndex];
+        if (this.panelMode && this.panelIndex < this.panelCount(page) - 1) {
+            this.panelIndex++;
+            this.applyPanelZoom();
+            return;
+        }
         if (this.currentPageIndex < this.pages.length - 1) {
             this.goToPage(this.currentPageIndex + 1);
         }
     }
 
+    panelCount(page) {
+        return page.panels ? page.panels.length : 0;
+    }
+
+    togglePanelMode() {
+        this.panelMode = !this.panelMode;
+        this.panelIndex = 0;
+
+        const button = document.getElementById('view-panels');
+        button.classList.toggle('active', this.panelMode);
+        button.setAttribute('aria-pressed', String(this.panelMode));
+        this.applyPanelZoom();
+    }
+
+    applyPanelZoom() {
+        // Scale and shift the page already on screen so the current panel
+        // (normalized rect from pages.json) fills the view - no extra requests
+        const display = document.querySelector('.page-display');
+        const picture = document.getElementById('main-page-picture');
+        const page = this.pages[this.currentPageIndex];
+        const rect = this.panelMode && page.panels && page.panels[this.panelIndex];
+
+        display.classList.toggle('panel-mode', this.panelMode);
+        if (!rect) {
+            picture.style.transform = '';
+            return;
+        }
+
+        const scale = Math.min(1 / rect.width, 1 / rect.height);
+        const centerX = rect.x + rect.width / 2;
+        const centerY = rect.y + rect.height / 2;
+        const shiftX = (0.5 / scale - centerX) * 100;
+        const shiftY = (0.5 / scale - centerY) * 100;
+        picture.style.transform = `scale(${scale}) translate(${shiftX}%, ${shiftY}%)`;
+    }
+
     updateDisplay(pushState = true) {
         const page = this.pages[this.currentPageIndex];
+        const picture = document.getElementById('main-page-picture');
         const img = document.getElementById('main-page-image');
 
-        // Update image
-        img.src = page.image;
+        // Update image (responsive renditions when available)
+        this.setPageSources(picture, img, page);
+        this.showPlaceholder(picture, img, page);
+        this.scheduleWarmUp(img);
+        this.applyPanelZoom();
         img.alt = page.title;
 
         // Update page info
@@ -251,24 +454,186 @@ class ComicReader {
         );
     }
 
+    setPageSources(picture, img, page) {
+        if (img.parentNode !== picture) {
+            picture.appendChild(img);
+        }
+
+        // Replace <source> elements with this page's srcset per format
+        picture.querySelectorAll('source').forEach(source => source.remove());
+        const srcset = page.srcset || {};
+        PAGE_FORMATS.forEach(format => {
+            if (!srcset[format]) return;
+            const source = document.createElement('source');
+            source.type = `image/${format}`;
+            source.srcset = srcset[format];
+            source.sizes = PAGE_SIZES;
+            picture.insertBefore(source, img);
+        });
+
+        // Intrinsic size reserves the layout box before the image arrives
+        if (page.width && page.height) {
+            img.width = page.width;
+            img.height = page.height;
+        }
+        img.src = page.image;
+    }
+
+    showPlaceholder(picture, img, page) {
+        // Paint the inline placeholder behind the image until it has loaded
+        if (!page.placeholder) {
+            picture.style.backgroundImage = '';
+            img.classList.remove('is-loading');
+            return;
+        }
+
+        picture.style.backgroundImage = `url("${page.placeholder}")`;
+        if (img.complete) {
+            img.classList.remove('is-loading');
+            return;
+        }
+
+        img.classList.add('is-loading');
+        const reveal = () => img.classList.remove('is-loading');
+        img.addEventListener('load', reveal, { once: true });
+        img.addEventListener('error', reveal, { once: true });
+    }
+
+    recordNavigation(pageIndex) {
+        this.navHistory.push({ index: pageIndex, time: performance.now() });
+        if (this.navHistory.length > NAV_HISTORY) {
+            this.navHistory.shift();
+        }
+    }
+
+    navigationPace() {
+        // Direction of the last page turn, and whether recent turns were
+        // quick single steps the same way
+        const history = this.navHistory;
+        const steps = [];
+        for (let i = 1; i < history.length; i++) {
+            steps.push({
+                delta: history[i].index - history[i - 1].index,
+                interval: history[i].time - history[i - 1].time
+            });
+        }
+
+        const direction = steps.length && steps[steps.length - 1].delta < 0 ? -1 : 1;
+        const fast = steps.length >= 2 && steps.every(step =>
+            step.delta === direction && step.interval < FAST_NAV_INTERVAL
+        );
+        return { direction, fast };
+    }
+
+    prefetchLimit() {
+        // How many pages the connection can afford to fetch ahead
+        const connection = navigator.connection;
+        if (!connection) return Infinity;
+        if (connection.saveData) return 0;
+        if (connection.effectiveType === 'slow-2g' || connection.effectiveType === '2g') return 1;
+        if (connection.effectiveType === '3g') return 2;
+        return Infinity;
+    }
+
+    prefetchIndexes() {
+        // Pages to have fetched and decoded, most urgent first
+        const { direction, fast } = this.navigationPace();
+        const ahead = fast ? FAST_PREFETCH_AHEAD : PREFETCH_AHEAD;
+        const behind = fast ? 0 : PREFETCH_BEHIND;
+
+        const indexes = [];
+        for (let i = 1; i <= Math.max(ahead, behind); i++) {
+            if (i <= ahead) indexes.push(this.currentPageIndex + direction * i);
+            if (i <= behind) indexes.push(this.currentPageIndex - direction * i);
+        }
+        return indexes
+            .filter(idx => idx >= 0 && idx < this.pages.length)
+            .slice(0, this.prefetchLimit());
+    }
+
     preloadAdjacentPages() {
-        // Remove old preload links
-        document.querySelectorAll('link[rel="prefetch"]').forEach(link => link.remove());
-
-        // Preload next and previous pages
-        const preloadIndexes = [
-            this.currentPageIndex - 1,
-            this.currentPageIndex + 1
-        ];
-
-        preloadIndexes.forEach(idx => {
-            if (idx >= 0 && idx < this.pages.length) {
-                const link = document.createElement('link');
-                link.rel = 'prefetch';
-                link.href = this.pages[idx].image;
-                document.head.appendChild(link);
+        // Fetch and decode upcoming pages through detached <picture> elements
+        // so the browser picks the same rendition it will display
+        const wanted = this.prefetchIndexes();
+
+        // Cancel fetches for pages that dropped out of the window (the page
+        // now on screen is loading in the main image, so leave it be)
+        this.preloadedImages.forEach((img, idx) => {
+            if (!wanted.includes(idx)) {
+                if (idx !== this.currentPageIndex) this.cancelPreload(img);
+                this.preloadedImages.delete(idx);
             }
         });
+
+        wanted.forEach((idx, priority) => {
+            if (this.preloadedImages.has(idx)) return;
+
+            const picture = document.createElement('picture');
+            const img = document.createElement('img');
+            img.decoding = 'async';
+            img.fetchPriority = priority === 0 ? 'high' : 'low';
+            this.setPageSources(picture, img, this.pages[idx]);
+            // Decode off the main thread now so the swap doesn't stall later
+            img.decode().catch(() => {});
+            this.preloadedImages.set(idx, img);
+        });
+    }
+
+    cancelPreload(img) {
+        // Removing the sources and src aborts an in-flight fetch
+        if (img.complete) return;
+        img.parentNode.querySelectorAll('source').forEach(source => source.remove());
+        img.removeAttribute('srcset');
+        img.removeAttribute('src');
+    }
+
+    scheduleWarmUp(img) {
+        // Once the browser has picked a rendition, cache the same one ahead
+        if (img.complete && img.currentSrc) {
+            this.warmUpcomingPages(img.currentSrc);
+        } else {
+            img.addEventListener('load', () => this.warmUpcomingPages(img.currentSrc), { once: true });
+        }
+    }
+
+    warmUpcomingPages(currentSrc) {
+        const controller = navigator.serviceWorker && navigator.serviceWorker.controller;
+        const ahead = Math.min(WARM_AHEAD, this.prefetchLimit());
+        if (!controller || !ahead) return;
+
+        const choice = this.renditionChoice(this.pages[this.currentPageIndex], currentSrc);
+        const urls = this.pages
+            .slice(this.currentPageIndex + 1, this.currentPageIndex + 1 + ahead)
+            .map(page => new URL(this.renditionURL(page, choice), window.location.href).href);
+        if (urls.length) {
+            controller.postMessage({ type: 'warm', urls });
+        }
+    }
+
+    renditionChoice(page, currentSrc) {
+        // Format and width of the srcset candidate the browser is showing
+        if (!currentSrc || !page.srcset) return null;
+        const path = new URL(currentSrc, window.location.href).pathname;
+        for (const [format, srcset] of Object.entries(page.srcset)) {
+            for (const candidate of srcset.split(',')) {
+                const [url, descriptor] = candidate.trim().split(/\s+/);
+                if (path.endsWith('/' + url)) {
+                    return { format, descriptor };
+                }
+            }
+        }
+        return null;
+    }
+
+    renditionURL(page, choice) {
+        const srcset = choice && page.srcset && page.srcset[choice.format];
+        if (srcset) {
+            for (const candidate of srcset.split(',')) {
+                const [url, descriptor] = candidate.trim().split(/\s+/);
+                if (descriptor === choice.descriptor) return url;
+            }
+        }
+        return page.image;
     }
 
     switchView(mode) {
@@ -300,9 +665,7 @@ class ComicReader {
         const grid = document.getElementById('thumbnail-grid');
         grid.innerHTML = this.pages.map((page, idx) => `
             <div class="thumbnail-item" data-page="${idx}">
-                <img src="${page.thumbnail}"
-                     alt="${page.title}"
-                     loading="lazy">
+                ${this.renderThumbnail(page)}
                 <div class="thumbnail-label">
                     <div class="thumbnail-title">${page.title}</div>
                     <div class="thumbnail-number">Page ${page.page === 0 ? 'Cover' : page.page}</div>
@@ -320,6 +683,29 @@ class ComicReader {
         });
     }
 
+    renderThumbnail(page) {
+        // Sprite sheet cell: every thumbnail shares one (or a few) sheet requests
+        const sprite = page.sprite;
+        if (!sprite) {
+            return `<img src="${page.thumbnail}" alt="${page.title}" loading="lazy">`;
+        }
+
+        const sizeX = sprite.sheet_width / sprite.width * 100;
+        const sizeY = sprite.sheet_height / sprite.height * 100;
+        const spanX = sprite.sheet_width - sprite.width;
+        const spanY = sprite.sheet_height - sprite.height;
+        const posX = spanX > 0 ? sprite.x / spanX * 100 : 0;
+        const posY = spanY > 0 ? sprite.y / spanY * 100 : 0;
+
+        return `<div class="thumbnail-sprite"
+                     role="img"
+                     aria-label="${page.title}"
+                     style="background-image: url('${sprite.sheet}');
+                            background-size: ${sizeX}% ${sizeY}%;
+                            background-position: ${posX}% ${posY}%;
+                            aspect-ratio: ${sprite.width} / ${sprite.height};"></div>`;
+    }
+
     showError(message) {
         const container = document.querySelector('.reader-container');
         const errorDiv = document.createElement('div');
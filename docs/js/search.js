@@ -0,0 +1,93 @@
+/**
+ * Page search over the precomputed index in data/search/
+ * (built by scripts/utilities/search_index.py).
+ *
+ * Terms are sharded by first character, so a query fetches one small shard
+ * per distinct first letter; the last term is matched as a prefix.
+ */
+
+// Mirrors search_index.py
+const SEARCH_MIN_TERM_LENGTH = 2;
+const SEARCH_STOPWORDS = new Set([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from',
+    'has', 'have', 'he', 'her', 'his', 'i', 'if', 'in', 'into', 'is', 'it',
+    'its', 'me', 'my', 'no', 'not', 'of', 'on', 'or', 'our', 'she', 'so',
+    'that', 'the', 'their', 'them', 'then', 'there', 'they', 'this', 'to',
+    'up', 'us', 'was', 'we', 'were', 'what', 'will', 'with', 'you', 'your'
+]);
+
+class PageSearch {
+    constructor(baseURL = 'data/search/') {
+        this.baseURL = baseURL;
+        this.shards = new Map(); // shard key -> Promise of {term: [page, score, ...]}
+    }
+
+    static normalize(text) {
+        return text.toLowerCase().normalize('NFKD').replace(/[\u0300-\u036f]/g, '');
+    }
+
+    static shardKey(term) {
+        return /^[a-z0-9]/.test(term) ? term[0] : '_';
+    }
+
+    queryTerms(query) {
+        // Complete words are filtered like the indexer; a word still being
+        // typed (no trailing space) is kept as a prefix even when short
+        const words = PageSearch.normalize(query).match(/[a-z0-9]+/g) || [];
+        const typing = /\S$/.test(query) ? words.pop() : null;
+        const terms = words.filter(word =>
+            word.length >= SEARCH_MIN_TERM_LENGTH && !SEARCH_STOPWORDS.has(word)
+        );
+        if (typing) terms.push(typing);
+        return terms;
+    }
+
+    loadShard(key) {
+        if (!this.shards.has(key)) {
+            const shard = fetch(`${this.baseURL}${key}.json`)
+                .then(response => (response.ok ? response.json() : { terms: {} }))
+                .then(data => data.terms)
+                .catch(() => {
+                    this.shards.delete(key); // Retry next time (e.g. back online)
+                    return {};
+                });
+            this.shards.set(key, shard);
+        }
+        return this.shards.get(key);
+    }
+
+    async search(query) {
+        // Pages matching every term, best first: [{page, score}]
+        const terms = this.queryTerms(query);
+        if (!terms.length) return [];
+
+        const typingPrefix = /\S$/.test(query);
+        const shards = await Promise.all(terms.map(term => this.loadShard(PageSearch.shardKey(term))));
+
+        let scores = null;
+        terms.forEach((term, i) => {
+            const prefix = typingPrefix && i === terms.length - 1;
+            const termScores = new Map();
+            Object.entries(shards[i]).forEach(([indexed, postings]) => {
+                if (prefix ? !indexed.startsWith(term) : indexed !== term) return;
+                for (let p = 0; p < postings.length; p += 2) {
+                    const page = postings[p];
+                    termScores.set(page, Math.max(termScores.get(page) || 0, postings[p + 1]));
+                }
+            });
+
+            if (scores === null) {
+                scores = termScores;
+            } else {
+                const combined = new Map();
+                scores.forEach((score, page) => {
+                    if (termScores.has(page)) combined.set(page, score + termScores.get(page));
+                });
+                scores = combined;
+            }
+        });
+
+        return Array.from(scores, ([page, score]) => ({ page, score }))
+            .sort((a, b) => b.score - a.score || a.page - b.page);
+    }
+}
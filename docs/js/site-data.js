@@ -0,0 +1,28 @@
+/**
+ * Site data loading.
+ * Prefers data/site-data.json (pages, characters and locations bundled by
+ * generate_site_data.py) so the first page view makes one data request;
+ * falls back to the individual files when the bundle isn't built.
+ */
+
+const SITE_DATA_BUNDLE = 'data/site-data.json';
+
+let siteDataBundle = null;
+
+function loadSiteData(name) {
+    if (!siteDataBundle) {
+        siteDataBundle = fetch(SITE_DATA_BUNDLE)
+            .then(response => (response.ok ? response.json() : null))
+            .catch(() => null);
+    }
+
+    return siteDataBundle.then(bundle => {
+        if (bundle && bundle[name] !== undefined) return bundle[name];
+        return fetch(`data/${name}.json`).then(response => {
+            if (!response.ok) {
+                throw new Error(`Failed to load ${name} data`);
+            }
+            return response.json();
+        });
+    });
+}
@@ -0,0 +1,12 @@
+/**
+ * Service worker registration (offline reading and image caching).
+ * sw.js is generated by scripts/utilities/generate_service_worker.py.
+ */
+
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('sw.js').catch(error => {
+            console.warn('Service worker registration failed:', error);
+        });
+    });
+}
@@ -9,15 +9,25 @@ import json
 import zipfile
 import argparse
 from pathlib import Path
+from xml.sax.saxutils import escape
 from PIL import Image
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utilities.layout_engine import (
-    assemble_page_with_layout,
+    assemble_page_with_rects,
     PAGE_WIDTH,
     PAGE_HEIGHT
 )
+from utilities.image_formats import (
+    FORMATS,
+    is_format_supported,
+    parse_size,
+    format_size,
+    resize_to_width,
+    encode_image,
+    encode_to_target
+)
 
 # Configuration
 PAGES_JSON_DIR = Path("pages")
@@ -26,6 +36,12 @@ PANELS_DIR = OUTPUT_DIR / "panels"
 PAGES_DIR = OUTPUT_DIR / "pages"
 CBZ_FILE = OUTPUT_DIR / "everpeak-citadel.cbz"
 
+# CBZ payload presets (explicit --format/--quality/etc. override these)
+CBZ_PRESETS = {
+    'archive': {'format': 'png', 'quality': None, 'target_bytes': None, 'max_width': None},
+    'mobile': {'format': 'webp', 'quality': None, 'target_bytes': 350 * 1024, 'max_width': 1200},
+}
+
 # Simplified system: only 2 layouts
 # - Splash: 1 panel (full page)
 # - Grid 2x2: 4 panels (or fewer)
@@ -177,6 +193,31 @@ def cleanup_variants(page_num, panels):
     return deleted_count
 
 
+def write_page_layout(page_num, panels, rects):
+    """Write output/pages/page-NNN.layout.json (panel rectangles in page pixels)."""
+    layout_file = PAGES_DIR / f"page-{page_num:03d}.layout.json"
+    with open(layout_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'width': PAGE_WIDTH,
+            'height': PAGE_HEIGHT,
+            'panels': [
+                {'panel_num': panel['panel_num'], **rect}
+                for panel, rect in zip(panels, rects)
+            ]
+        }, f, indent=2)
+    return layout_file
+
+
+def render_panel_files(panel_files):
+    """
+    Assemble panel image files into a page; returns (page image, panel rects).
+
+    Module-level and picklable, so the review server can run it in a worker process.
+    """
+    panel_images = [Image.open(path) for path in panel_files]
+    return assemble_page_with_rects(panel_images, len(panel_images))
+
+
 def assemble_page(page_data, cleanup=False):
     """Assemble panels into a page using simplified layout system."""
 
@@ -211,18 +252,16 @@ def assemble_page(page_data, cleanup=False):
             panel_images.append(placeholder)
 
     # Use simplified layout engine
-    page_img = assemble_page_with_layout(
-        panels_data=panels,
-        panel_images=panel_images,
-        page_width=PAGE_WIDTH,
-        page_height=PAGE_HEIGHT
-    )
+    page_img, rects = assemble_page_with_rects(panel_images, num_panels)
 
     # Save page
     output_file = PAGES_DIR / f"page-{page_num:03d}.png"
     page_img.save(output_file)
     print(f"✓ Saved {output_file.name} (1600x2400)")
 
+    # Save panel geometry alongside it for guided reading on the site
+    write_page_layout(page_num, panels, rects)
+
     # Cleanup variants if requested
     if cleanup:
         cleanup_variants(page_num, panels)
@@ -230,39 +269,106 @@ def assemble_page(page_data, cleanup=False):
     return output_file
 
 
-def create_cbz(pages_data, output_file=None):
-    """Create CBZ file from assembled pages."""
+def encode_cbz_page(page_file, fmt='png', quality=None, target_bytes=None, max_width=None):
+    """
+    Encode one assembled page for the CBZ.
 
-    if output_file is None:
-        output_file = CBZ_FILE
+    PNG pages at full size are passed through without decoding.
 
-    print("\n→ Creating CBZ archive...")
+    Returns:
+        (bytes, width, height)
+    """
+    if fmt == 'png' and not max_width and not target_bytes:
+        with Image.open(page_file) as img:
+            width, height = img.size
+        return page_file.read_bytes(), width, height
 
-    # ComicInfo.xml metadata
-    comic_info = """<?xml version="1.0"?>
+    with Image.open(page_file) as img:
+        img = resize_to_width(img.convert('RGB'), max_width)
+        if target_bytes:
+            data, _ = encode_to_target(img, fmt, target_bytes)
+        else:
+            data = encode_image(img, fmt, quality)
+        return data, img.width, img.height
+
+
+def build_comic_info(page_count, page_entries):
+    """Build ComicInfo.xml, including a <Pages> block with dimensions and sizes."""
+    page_lines = []
+    for index, entry in enumerate(page_entries):
+        page_type = ' Type="FrontCover"' if entry['page_num'] == 0 else ''
+        page_lines.append(
+            f'    <Page Image="{index}"{page_type} ImageSize="{entry["size"]}" '
+            f'ImageWidth="{entry["width"]}" ImageHeight="{entry["height"]}" />'
+        )
+
+    return """<?xml version="1.0"?>
 <ComicInfo xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
-  <Title>Everpeak Citadel: Echoes of the Dawn's Crown</Title>
+  <Title>{title}</Title>
   <Series>Everpeak Citadel</Series>
   <Number>1</Number>
-  <Summary>A D&D adventure in the frozen peaks of Everpeak Citadel.</Summary>
+  <Summary>{summary}</Summary>
   <Publisher>AI-Generated</Publisher>
   <Genre>Fantasy</Genre>
-  <PageCount>{}</PageCount>
+  <PageCount>{page_count}</PageCount>
   <LanguageISO>en</LanguageISO>
-</ComicInfo>""".format(len(pages_data))
+  <Pages>
+{pages}
+  </Pages>
+</ComicInfo>""".format(
+        title=escape("Everpeak Citadel: Echoes of the Dawn's Crown"),
+        summary=escape("A D&D adventure in the frozen peaks of Everpeak Citadel."),
+        page_count=page_count,
+        pages='\n'.join(page_lines)
+    )
 
-    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as cbz:
-        # Add ComicInfo.xml
-        cbz.writestr('ComicInfo.xml', comic_info)
 
-        # Add pages in order
+def create_cbz(pages_data, output_file=None, fmt='png', quality=None,
+               target_bytes=None, max_width=None):
+    """Create CBZ file from assembled pages."""
+
+    if output_file is None:
+        output_file = CBZ_FILE
+
+    print("\n→ Creating CBZ archive...")
+    if target_bytes:
+        print(f"  Format: {fmt.upper()} (target {format_size(target_bytes)}/page)")
+    elif quality:
+        print(f"  Format: {fmt.upper()} (quality {quality})")
+    else:
+        print(f"  Format: {fmt.upper()}")
+    if max_width:
+        print(f"  Max width: {max_width}px")
+
+    # Already-compressed payloads gain nothing from deflate
+    compress_type = zipfile.ZIP_DEFLATED if fmt == 'png' else zipfile.ZIP_STORED
+    ext = FORMATS[fmt]['ext']
+
+    page_entries = []
+    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as cbz:
+        # Add pages in order (one decode + encode per page)
         for page in sorted(pages_data, key=lambda p: p['page_num']):
             page_file = PAGES_DIR / f"page-{page['page_num']:03d}.png"
-            if page_file.exists():
-                # CBZ readers expect sequential numbering
-                cbz.write(page_file, f"{page['page_num']:03d}.png")
-
-    print(f"✓ Created {output_file}")
+            if not page_file.exists():
+                continue
+
+            data, width, height = encode_cbz_page(
+                page_file, fmt, quality, target_bytes, max_width
+            )
+            # CBZ readers expect sequential numbering
+            cbz.writestr(f"{page['page_num']:03d}.{ext}", data, compress_type=compress_type)
+            page_entries.append({
+                'page_num': page['page_num'],
+                'size': len(data),
+                'width': width,
+                'height': height
+            })
+
+        # ComicInfo.xml goes last because it records the encoded page sizes
+        cbz.writestr('ComicInfo.xml', build_comic_info(len(page_entries), page_entries))
+
+    total_bytes = sum(entry['size'] for entry in page_entries)
+    print(f"✓ Created {output_file} ({len(page_entries)} pages, {format_size(total_bytes)})")
     print(f"\n🎉 Comic complete! Open {output_file} in any CBZ reader.")
 
 
@@ -293,6 +399,9 @@ Examples:
   python assemble.py                      # Assemble all available pages
   python assemble.py 1 --no-cbz           # Assemble page without creating CBZ
   python assemble.py 1 --cleanup-variants # Assemble and delete variant files
+  python assemble.py --format webp --quality 85     # WebP pages in the CBZ
+  python assemble.py --format jpeg --target-size 400KB
+  python assemble.py --preset mobile      # Small WebP archive for tablets/phones
         """
     )
 
@@ -321,8 +430,61 @@ Examples:
         help='Delete variant files (v1, v2, etc.) after successful assembly'
     )
 
+    parser.add_argument(
+        '--preset',
+        choices=sorted(CBZ_PRESETS),
+        default='archive',
+        help='CBZ payload preset (default: archive = full-size PNG)'
+    )
+
+    parser.add_argument(
+        '--format',
+        choices=sorted(FORMATS),
+        help='Image format for CBZ pages (overrides preset)'
+    )
+
+    parser.add_argument(
+        '--quality',
+        type=int,
+        help='Encoder quality for lossy formats (overrides preset)'
+    )
+
+    parser.add_argument(
+        '--target-size',
+        type=str,
+        help='Per-page byte target for lossy formats, e.g. 400KB (overrides --quality)'
+    )
+
+    parser.add_argument(
+        '--max-width',
+        type=int,
+        help='Downscale CBZ pages to this width (overrides preset)'
+    )
+
     args = parser.parse_args()
 
+    # Resolve CBZ payload settings: preset first, explicit flags win
+    cbz_settings = dict(CBZ_PRESETS[args.preset])
+    if args.format:
+        cbz_settings['format'] = args.format
+    if args.quality is not None:
+        cbz_settings['quality'] = args.quality
+        cbz_settings['target_bytes'] = None
+    if args.target_size:
+        try:
+            cbz_settings['target_bytes'] = parse_size(args.target_size)
+        except ValueError:
+            print(f"✗ Invalid --target-size: {args.target_size}")
+            sys.exit(1)
+    if args.max_width is not None:
+        cbz_settings['max_width'] = args.max_width
+
+    if not args.no_cbz and not is_format_supported(cbz_settings['format']):
+        print(f"✗ This Pillow build cannot write {cbz_settings['format'].upper()}")
+        if cbz_settings['format'] == 'avif':
+            print("  Upgrade to Pillow 11.3+ or install pillow-avif-plugin")
+        sys.exit(1)
+
     print("=" * 60)
     print("EVERPEAK CITADEL PAGE ASSEMBLY")
     print("=" * 60)
@@ -380,7 +542,14 @@ Examples:
         print("=" * 60)
 
         output_file = Path(args.output) if args.output else CBZ_FILE
-        create_cbz(assembled_pages, output_file)
+        create_cbz(
+            assembled_pages,
+            output_file,
+            fmt=cbz_settings['format'],
+            quality=cbz_settings['quality'],
+            target_bytes=cbz_settings['target_bytes'],
+            max_width=cbz_settings['max_width']
+        )
     else:
         print(f"\n✓ Assembled {len(assembled_pages)} page(s) successfully")
         print("  Skipped CBZ creation (--no-cbz flag)")
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Headless first-pass review of panel variants for Everpeak Citadel comic.
+
+Scores every variant of every unselected panel with local heuristics:
+- failed-generation placeholders (generate.py's light gray error frame)
+- blank or near-uniform frames
+- sharpness (variance of the Laplacian)
+- color-histogram similarity to the portraits of the panel's characters and NPCs in docs/images
+
+When one usable variant clearly beats the rest, it becomes the panel's
+selection, recorded in the selections store with source 'auto'. The other
+variants stay on disk, so a reviewer can still switch. Panels whose best
+variants score too close together, or that have no usable variant, are left
+for review.py.
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from PIL import Image, ImageChops, ImageFilter, ImageStat
+
+from assemble import parse_page_range
+from project_index import ProjectIndex
+from selections_store import SelectionStore
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utilities.gallery_images import CHARACTER_IMAGES
+
+# Configuration
+PAGES_JSON_DIR = Path("pages")
+OUTPUT_DIR = Path("output")
+PANELS_DIR = OUTPUT_DIR / "panels"
+PAGES_DIR = OUTPUT_DIR / "pages"
+SELECTIONS_DB = OUTPUT_DIR / "selections.db"
+SELECTIONS_FILE = OUTPUT_DIR / "selections.json"  # Imported into SELECTIONS_DB once
+SITE_DIR = Path("docs")  # Portraits are CHARACTER_IMAGES paths under it
+
+# Images are analyzed at this width, so metrics compare across source sizes
+ANALYSIS_WIDTH = 512
+
+# generate.py's failure placeholder: light gray with a line of black text
+PLACEHOLDER_COLOR = (211, 211, 211)
+PLACEHOLDER_COVERAGE = 0.85
+
+# Dominant color is found at 16 levels per channel, so noise doesn't split it
+COLOR_BIN = 16
+
+# Blank frame: almost no tonal variation, or one flat color nearly everywhere
+BLANK_STDDEV = 6.0
+BLANK_COVERAGE = 0.90
+
+# Color histogram: levels per RGB channel (6^3 = 216 joint bins)
+HISTOGRAM_LEVELS = 6
+
+# Score = weighted sharpness (relative to the panel's sharpest variant) and portrait similarity
+SHARPNESS_WEIGHT = 0.5
+COLOR_WEIGHT = 0.5
+
+# Minimum lead of the best variant over the runner-up for a confident pick
+MIN_MARGIN = 0.08
+
+
+def color_histogram(img: Image.Image) -> List[float]:
+    """Normalized joint RGB histogram with HISTOGRAM_LEVELS levels per channel."""
+    step = 256 // HISTOGRAM_LEVELS + 1
+    red, green, blue = img.convert('RGB').split()
+    # Bin index = r * levels^2 + g * levels + b (fits an 8-bit band)
+    index = ImageChops.add(
+        ImageChops.add(red.point(lambda v: (v // step) * HISTOGRAM_LEVELS ** 2),
+                       green.point(lambda v: (v // step) * HISTOGRAM_LEVELS)),
+        blue.point(lambda v: v // step)
+    )
+    counts = index.histogram()[:HISTOGRAM_LEVELS ** 3]
+    total = sum(counts) or 1
+    return [count / total for count in counts]
+
+
+def histogram_similarity(a: List[float], b: List[float]) -> float:
+    """Histogram intersection: 1.0 for identical color distributions, 0.0 for disjoint."""
+    return sum(min(x, y) for x, y in zip(a, b))
+
+
+def analysis_image(path: Path) -> Image.Image:
+    """RGB copy of an image scaled to ANALYSIS_WIDTH."""
+    with Image.open(path) as img:
+        img = img.convert('RGB')
+        height = max(1, round(img.height * ANALYSIS_WIDTH / img.width))
+        return img.resize((ANALYSIS_WIDTH, height), Image.Resampling.BILINEAR)
+
+
+def image_metrics(path: Path) -> Dict:
+    """Heuristic measurements of one variant (also the worker pool entry point)."""
+    img = analysis_image(path)
+    gray = img.convert('L')
+    pixel_count = img.width * img.height
+
+    # Most common color (binned)
+    coarse = img.point(lambda v: v // COLOR_BIN)
+    dominant_count, dominant_color = max(coarse.getcolors(pixel_count))
+    dominant_coverage = dominant_count / pixel_count
+
+    stddev = ImageStat.Stat(gray).stddev[0]
+    placeholder = (
+        dominant_coverage >= PLACEHOLDER_COVERAGE
+        and dominant_color == tuple(v // COLOR_BIN for v in PLACEHOLDER_COLOR)
+    )
+    blank = stddev < BLANK_STDDEV or dominant_coverage >= BLANK_COVERAGE
+
+    laplacian = gray.filter(ImageFilter.Kernel((3, 3), [0, 1, 0, 1, -4, 1, 0, 1, 0], scale=1, offset=128))
+    sharpness = ImageStat.Stat(laplacian).var[0]
+
+    return {
+        'placeholder': placeholder,
+        'blank': blank,
+        'stddev': stddev,
+        'dominant_coverage': dominant_coverage,
+        'sharpness': sharpness,
+        'histogram': color_histogram(img),
+    }
+
+
+def load_portrait_histograms() -> Dict[str, List[float]]:
+    """Color histograms of the gallery portraits, keyed by CHARACTER_IMAGES path."""
+    histograms = {}
+    for image in sorted(set(CHARACTER_IMAGES.values())):
+        path = SITE_DIR / image
+        if path.is_file():
+            histograms[image] = color_histogram(analysis_image(path))
+    return histograms
+
+
+def panel_portraits(panel: Dict, portraits: Dict[str, List[float]],
+                    missing: Optional[Counter] = None) -> List[List[float]]:
+    """
+    Portrait histograms of the characters and NPCs a panel shows.
+
+    Names without a portrait are counted in missing.
+    """
+    references = []
+    for name in panel.get('characters', []) + panel.get('npcs', []):
+        image = CHARACTER_IMAGES.get(name)
+        if image in portraits:
+            references.append(portraits[image])
+        elif missing is not None:
+            missing[name] += 1
+    return references
+
+
+def score_panel(variants: Dict[int, Dict], references: List[List[float]]) -> Dict:
+    """
+    Score a panel's variants and decide whether one is a confident pick.
+
+    Returns:
+        {'scores': {variant: score or None if rejected}, 'rejected': {variant: reason},
+         'choice': variant or None, 'reason': why no choice was made}
+    """
+    rejected = {}
+    for variant_num, metrics in variants.items():
+        if metrics['placeholder']:
+            rejected[variant_num] = 'placeholder'
+        elif metrics['blank']:
+            rejected[variant_num] = 'blank'
+
+    usable = [variant_num for variant_num in variants if variant_num not in rejected]
+    max_sharpness = max((variants[v]['sharpness'] for v in usable), default=0) or 1
+
+    scores = {variant_num: None for variant_num in rejected}
+    for variant_num in usable:
+        metrics = variants[variant_num]
+        sharpness = metrics['sharpness'] / max_sharpness
+        if references:
+            color = sum(histogram_similarity(metrics['histogram'], ref) for ref in references) / len(references)
+            scores[variant_num] = SHARPNESS_WEIGHT * sharpness + COLOR_WEIGHT * color
+        else:
+            scores[variant_num] = sharpness
+
+    ranked = sorted(usable, key=lambda v: scores[v], reverse=True)
+    if not ranked:
+        return {'scores': scores, 'rejected': rejected, 'choice': None, 'reason': 'no usable variant'}
+    if len(ranked) > 1 and scores[ranked[0]] - scores[ranked[1]] < MIN_MARGIN:
+        return {'scores': scores, 'rejected': rejected, 'choice': None,
+                'reason': f'v{ranked[0]} and v{ranked[1]} within {MIN_MARGIN}'}
+    return {'scores': scores, 'rejected': rejected, 'choice': ranked[0], 'reason': None}
+
+
+def preselect(store: SelectionStore, picks: List[tuple]):
+    """
+    Make picked variants the panels' selections, recorded with source 'auto'.
+
+    Unlike a choice in review.py, the other variants are kept for the reviewer.
+    """
+    with store.transaction() as conn:
+        for page_num, panel_num, variant_num in picks:
+            source = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}-v{variant_num}.png"
+            dest = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}.png"
+            tmp_file = dest.with_name(f"{dest.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+            shutil.copyfile(source, tmp_file)
+            os.replace(tmp_file, dest)
+        store.select_many(picks, source='auto', conn=conn)
+
+
+def auto_review(page_nums: Optional[List[int]] = None, jobs: int = 1, dry_run: bool = False) -> Dict:
+    """
+    Score all unselected panels and preselect confident picks.
+
+    Returns:
+        {'selected': [(page, panel, variant)], 'review': [(page, panel, reason)]}
+    """
+    index = ProjectIndex(PAGES_JSON_DIR, PANELS_DIR, PAGES_DIR)
+    page_nums = page_nums or index.page_numbers()
+
+    # Panels waiting for a choice
+    panels = []
+    for page_num in page_nums:
+        try:
+            page_data = index.page(page_num)
+        except FileNotFoundError:
+            print(f"✗ Page {page_num}: no page file")
+            continue
+        for panel in page_data['panels']:
+            variant_nums = index.variants(page_num, panel['panel_num'])
+            if variant_nums and not index.is_selected(page_num, panel['panel_num']):
+                panels.append((page_num, panel, variant_nums))
+
+    paths = [
+        PANELS_DIR / f"page-{page_num:03d}-panel-{panel['panel_num']}-v{variant_num}.png"
+        for page_num, panel, variant_nums in panels
+        for variant_num in variant_nums
+    ]
+    print(f"Scoring {len(paths)} variant(s) of {len(panels)} panel(s)...")
+
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            metrics = list(executor.map(image_metrics, paths, chunksize=4))
+    else:
+        metrics = [image_metrics(path) for path in paths]
+    metrics_by_path = dict(zip(paths, metrics))
+
+    portraits = load_portrait_histograms()
+    missing_portraits = Counter()
+    selected, review = [], []
+    for page_num, panel, variant_nums in panels:
+        panel_num = panel['panel_num']
+        variants = {
+            variant_num: metrics_by_path[PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}-v{variant_num}.png"]
+            for variant_num in variant_nums
+        }
+        result = score_panel(variants, panel_portraits(panel, portraits, missing_portraits))
+        summary = ', '.join(
+            f"v{v}={result['scores'][v]:.2f}" if result['scores'][v] is not None else f"v{v}={result['rejected'][v]}"
+            for v in variant_nums
+        )
+        if result['choice'] is not None:
+            selected.append((page_num, panel_num, result['choice']))
+            print(f"  ✓ Page {page_num} panel {panel_num}: v{result['choice']} ({summary})")
+        else:
+            review.append((page_num, panel_num, result['reason']))
+            print(f"  ? Page {page_num} panel {panel_num}: needs review, {result['reason']} ({summary})")
+
+    if missing_portraits:
+        print(f"⚠ No portrait for {len(missing_portraits)} name(s) "
+              f"(add them to CHARACTER_IMAGES in utilities/gallery_images.py):")
+        for name, count in missing_portraits.most_common():
+            print(f"    {name}: {count} panel(s)")
+
+    if selected and not dry_run:
+        preselect(SelectionStore(SELECTIONS_DB, legacy_json=SELECTIONS_FILE), selected)
+
+    return {'selected': selected, 'review': review}
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Score panel variants and preselect confident picks',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python auto_review.py                # All pages
+  python auto_review.py 1-5            # Pages 1-5
+  python auto_review.py --dry-run      # Report scores without selecting
+        """
+    )
+    parser.add_argument(
+        'pages',
+        type=str,
+        nargs='?',
+        help='Page number(s) to review (e.g., 1, 1-5, 1,3,5). Omit for all.'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Print scores and picks without selecting anything'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of worker processes (default: CPU count)'
+    )
+    args = parser.parse_args()
+
+    page_nums = parse_page_range(args.pages) if args.pages else None
+    result = auto_review(page_nums, jobs=max(1, args.jobs), dry_run=args.dry_run)
+
+    verb = 'would be preselected' if args.dry_run else 'preselected'
+    print(f"\n✓ {len(result['selected'])} panel(s) {verb}, "
+          f"{len(result['review'])} left for review (python review.py)")
+
+
+if __name__ == "__main__":
+    main()
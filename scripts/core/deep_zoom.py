@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Deep Zoom tile pyramids for inspecting panel images at full resolution.
+
+Follows the Deep Zoom (DZI) layout: level L is the image scaled by
+2^(L - max_level), where max_level is full resolution and level 0 is a
+single pixel, cut into square tiles that overlap their neighbours by a pixel
+and are named <col>_<row>.<format>. Tiles are built only when first
+requested and cached on disk; a few scaled levels stay in memory, so a
+burst of tile requests decodes and resizes the source once. Each pyramid
+records the files it was built from, so pyramids of removed or replaced
+files can be pruned.
+"""
+
+import os
+import sys
+import math
+import time
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+from PIL import Image
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utilities.image_formats import FORMATS, encode_image
+
+TILE_SIZE = 254
+TILE_OVERLAP = 1
+TILE_FORMAT = 'webp'
+TILE_QUALITY = 85
+
+# Source paths a pyramid was built from, one per line
+SOURCES_NAME = "sources.txt"
+# Pyramids without a sources file this old are left from older builds
+PRUNE_GRACE_SECONDS = 60
+
+
+def max_level(width: int, height: int) -> int:
+    """Full-resolution level number."""
+    return max(0, math.ceil(math.log2(max(width, height))))
+
+
+def level_size(width: int, height: int, level: int) -> Tuple[int, int]:
+    """Image size at a pyramid level."""
+    scale = 2 ** (max_level(width, height) - level)
+    return max(1, math.ceil(width / scale)), max(1, math.ceil(height / scale))
+
+
+def tile_box(level_width: int, level_height: int, col: int, row: int,
+             tile_size: int = TILE_SIZE, overlap: int = TILE_OVERLAP) -> Tuple[int, int, int, int]:
+    """Crop box of a tile within its level, including the overlap."""
+    left = col * tile_size - (overlap if col else 0)
+    upper = row * tile_size - (overlap if row else 0)
+    right = min((col + 1) * tile_size + overlap, level_width)
+    lower = min((row + 1) * tile_size + overlap, level_height)
+    return left, upper, right, lower
+
+
+def dzi_descriptor(width: int, height: int, fmt: str = TILE_FORMAT,
+                   tile_size: int = TILE_SIZE, overlap: int = TILE_OVERLAP) -> str:
+    """Deep Zoom image descriptor (.dzi XML)."""
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" Format="{FORMATS[fmt]["ext"]}" '
+        f'Overlap="{overlap}" TileSize="{tile_size}">\n'
+        f'  <Size Width="{width}" Height="{height}"/>\n'
+        '</Image>\n'
+    )
+
+
+class TilePyramid:
+    """
+    Lazily built, disk-cached tile pyramids.
+
+    Args:
+        cache_dir: Tiles go in cache_dir/<key>/<level>/<col>_<row>.<ext>
+        fmt: Tile format (see image_formats.FORMATS)
+        quality: Tile encoding quality
+        levels_in_memory: Scaled levels kept for cutting further tiles
+    """
+
+    def __init__(self, cache_dir: Path, fmt: str = TILE_FORMAT, quality: int = TILE_QUALITY,
+                 tile_size: int = TILE_SIZE, overlap: int = TILE_OVERLAP, levels_in_memory: int = 6):
+        self.cache_dir = cache_dir
+        self.fmt = fmt
+        self.quality = quality
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.levels_in_memory = levels_in_memory
+
+        self.levels = OrderedDict()  # (key, level) -> scaled image, most recently used last
+        self.recorded = set()  # (key, source) pairs already in a sources file
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def image_size(source: Path) -> Tuple[int, int]:
+        """Source dimensions (reads only the header)."""
+        with Image.open(source) as img:
+            return img.size
+
+    def descriptor(self, source: Path) -> str:
+        """.dzi descriptor for a source image."""
+        width, height = self.image_size(source)
+        return dzi_descriptor(width, height, self.fmt, self.tile_size, self.overlap)
+
+    def level_image(self, source: Path, key: str, level: int) -> Image.Image:
+        """A source image scaled to a pyramid level (memoized)."""
+        with self.lock:
+            if (key, level) in self.levels:
+                self.levels.move_to_end((key, level))
+                return self.levels[(key, level)]
+
+        with Image.open(source) as img:
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+            img.load()
+            size = level_size(img.width, img.height, level)
+            scaled = img if size == img.size else img.resize(size, Image.Resampling.LANCZOS)
+
+        with self.lock:
+            self.levels[(key, level)] = scaled
+            while len(self.levels) > self.levels_in_memory:
+                self.levels.popitem(last=False)
+        return scaled
+
+    def tile(self, source: Path, key: str, level: int, col: int, row: int) -> Path:
+        """
+        Cached tile file, built on first request.
+
+        Args:
+            key: Cache key for the source's current content (e.g. its hash)
+
+        Raises:
+            ValueError: level, column or row outside the pyramid
+        """
+        tile_file = self.cache_dir / key / str(level) / f"{col}_{row}.{FORMATS[self.fmt]['ext']}"
+        if tile_file.exists():
+            self.record_source(key, source)
+            return tile_file
+
+        width, height = self.image_size(source)
+        if not 0 <= level <= max_level(width, height):
+            raise ValueError(f"No level {level} in a {width}x{height} pyramid")
+        level_width, level_height = level_size(width, height, level)
+        if not (0 <= col < math.ceil(level_width / self.tile_size)
+                and 0 <= row < math.ceil(level_height / self.tile_size)):
+            raise ValueError(f"No tile {col}_{row} at level {level}")
+
+        scaled = self.level_image(source, key, level)
+        box = tile_box(level_width, level_height, col, row, self.tile_size, self.overlap)
+        data = encode_image(scaled.crop(box), self.fmt, self.quality)
+
+        # Concurrent requests may build the same tile; the rename keeps it whole
+        tile_file.parent.mkdir(parents=True, exist_ok=True)
+        self.record_source(key, source)
+        tmp_file = tile_file.with_name(f"{tile_file.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, tile_file)
+        return tile_file
+
+    def record_source(self, key: str, source: Path):
+        """Note that a pyramid was built from a source file (for prune)."""
+        source = str(Path(source).resolve())
+        with self.lock:
+            if (key, source) in self.recorded:
+                return
+            self.recorded.add((key, source))
+            sources_file = self.cache_dir / key / SOURCES_NAME
+            try:
+                known = sources_file.read_text(encoding='utf-8').splitlines()
+            except FileNotFoundError:
+                known = []
+            if source not in known:
+                with open(sources_file, 'a', encoding='utf-8') as f:
+                    f.write(source + '\n')
+
+    def remove(self, key: str):
+        """Delete a pyramid's tiles and scaled levels."""
+        with self.lock:
+            for cached in [cached for cached in self.levels if cached[0] == key]:
+                del self.levels[cached]
+            self.recorded = {pair for pair in self.recorded if pair[0] != key}
+        shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+
+    def prune(self, current_key: Callable[[Path], Optional[str]]) -> int:
+        """
+        Delete pyramids none of whose source files still have their content.
+
+        Args:
+            current_key: Cache key of a file's current content (None if removed)
+
+        Returns:
+            Number of pyramids removed
+        """
+        if not self.cache_dir.is_dir():
+            return 0
+
+        removed = 0
+        for key_dir in self.cache_dir.iterdir():
+            if not key_dir.is_dir():
+                continue
+            try:
+                sources = (key_dir / SOURCES_NAME).read_text(encoding='utf-8').splitlines()
+            except FileNotFoundError:
+                # Being created right now, or left from before sources were recorded
+                if time.time() - key_dir.stat().st_mtime < PRUNE_GRACE_SECONDS:
+                    continue
+                sources = []
+
+            if any(current_key(Path(source)) == key_dir.name for source in sources if source):
+                continue
+            self.remove(key_dir.name)
+            removed += 1
+        return removed
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Live in-memory index of a comic project for the review server.
+
+Holds page scripts, panel variants and selected panels, and finalized
+pages, built once at startup. With watchdog installed (inotify on
+Linux) each filesystem event updates only the entry it concerns, so lookups
+never touch the disk. Without it, a lookup re-checks one mtime and rescans
+a source only when it changed.
+
+Changes found either way are reported to listeners as variant-created,
+selection-changed and page-finalized events.
+"""
+
+import os
+import re
+import json
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# page-001.json / cover.json (page 0)
+PAGE_FILE_RE = re.compile(r'^page-(\d+)\.json$')
+COVER_FILE = "cover.json"
+
+# page-001-panel-2.png (selection) or page-001-panel-2-v3.png (variant)
+PANEL_FILE_RE = re.compile(r'^page-(\d{3})-panel-(\d+)(?:-v(\d+))?\.png$')
+
+# page-001.png (finalized page)
+FINALIZED_FILE_RE = re.compile(r'^page-(\d{3})\.png$')
+
+
+def page_file_number(name: str) -> Optional[int]:
+    """Page number for a page script file name (cover.json is page 0)."""
+    if name == COVER_FILE:
+        return 0
+    match = PAGE_FILE_RE.match(name)
+    return int(match.group(1)) if match else None
+
+
+def panel_file_key(name: str) -> Optional[Tuple[Tuple[int, int], Optional[int]]]:
+    """((page, panel), variant number or None for the selection) for a panel file name."""
+    match = PANEL_FILE_RE.match(name)
+    if not match:
+        return None
+    page_num, panel_num, variant_num = match.groups()
+    return (int(page_num), int(panel_num)), (int(variant_num) if variant_num else None)
+
+
+def panel_events(key: Tuple[int, int], before: Dict, after: Dict) -> List[Tuple[str, Dict]]:
+    """Events for a panel entry changing from before to after."""
+    page_num, panel_num = key
+    events = [
+        ('variant-created', {'page_num': page_num, 'panel_num': panel_num, 'variant_num': variant_num})
+        for variant_num in sorted(set(after['variants']) - set(before['variants']))
+    ]
+    if after['selected'] != before['selected']:
+        events.append(('selection-changed',
+                       {'page_num': page_num, 'panel_num': panel_num, 'selected': after['selected']}))
+    return events
+
+
+def mtime_ns(path: Path) -> int:
+    """mtime of a file or directory (0 if missing)."""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+class ProjectIndex:
+    """
+    Pages, panels and finalized pages of a project.
+
+    Args:
+        pages_json_dir: Page scripts (pages/)
+        panels_dir: Panel variants and selected panels (output/panels/)
+        pages_dir: Finalized pages (output/pages/)
+    """
+
+    def __init__(self, pages_json_dir: Path, panels_dir: Path, pages_dir: Path):
+        self.pages_json_dir = pages_json_dir
+        self.panels_dir = panels_dir
+        self.pages_dir = pages_dir
+
+        self.lock = threading.RLock()
+        self.pages = {}         # page number -> page data
+        self.page_mtimes = {}   # page number -> page file mtime (polling mode)
+        self.panels = {}        # (page, panel) -> {'variants': [...], 'selected': bool}
+        self.finalized = set()  # finalized page numbers
+        self.mtimes = {}        # source -> mtime at the last scan (polling mode)
+        self.observer = None
+        self.listeners = []     # callables taking (event type, data)
+
+        self.scan()
+
+    # Full scans
+
+    def scan(self):
+        """Build every part of the index from disk."""
+        self.scan_pages()
+        self.scan_panels()
+        self.scan_finalized()
+
+    def scan_pages(self):
+        """Load every page script."""
+        with self.lock:
+            self.mtimes['pages'] = mtime_ns(self.pages_json_dir)
+            pages, page_mtimes = {}, {}
+            if self.pages_json_dir.is_dir():
+                for entry in os.scandir(self.pages_json_dir):
+                    page_num = page_file_number(entry.name)
+                    if page_num is None:
+                        continue
+                    data = self.read_json(Path(entry.path))
+                    if data is not None:
+                        pages[page_num] = data
+                        page_mtimes[page_num] = entry.stat().st_mtime_ns
+            self.pages, self.page_mtimes = pages, page_mtimes
+
+    def scan_panels(self):
+        """List panel variants and selections."""
+        with self.lock:
+            self.mtimes['panels'] = mtime_ns(self.panels_dir)
+            panels = {}
+            if self.panels_dir.is_dir():
+                for entry in os.scandir(self.panels_dir):
+                    parsed = panel_file_key(entry.name)
+                    if parsed:
+                        self.apply_panel_file(panels, *parsed, exists=True)
+
+            empty = {'variants': [], 'selected': False}
+            events = [
+                event
+                for key in sorted(set(self.panels) | set(panels))
+                for event in panel_events(key, self.panels.get(key, empty), panels.get(key, empty))
+            ]
+            self.panels = panels
+        self.emit(events)
+
+    def scan_finalized(self):
+        """List finalized pages."""
+        with self.lock:
+            self.mtimes['finalized'] = mtime_ns(self.pages_dir)
+            finalized = set()
+            if self.pages_dir.is_dir():
+                for entry in os.scandir(self.pages_dir):
+                    match = FINALIZED_FILE_RE.match(entry.name)
+                    if match:
+                        finalized.add(int(match.group(1)))
+
+            events = [
+                ('page-finalized', {'page_num': page_num, 'finalized': page_num in finalized})
+                for page_num in sorted(finalized ^ self.finalized)
+            ]
+            self.finalized = finalized
+        self.emit(events)
+
+    # Incremental updates
+
+    @staticmethod
+    def read_json(path: Path):
+        """Parsed JSON file, or None if missing or mid-write."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def apply_panel_file(panels: Dict, key: Tuple[int, int], variant_num: Optional[int], exists: bool):
+        """Add or remove one panel file in a panels mapping."""
+        entry = panels.setdefault(key, {'variants': [], 'selected': False})
+        if variant_num is None:
+            entry['selected'] = exists
+        else:
+            variants = set(entry['variants'])
+            if exists:
+                variants.add(variant_num)
+            else:
+                variants.discard(variant_num)
+            entry['variants'] = sorted(variants)
+
+    def update_panel(self, name: str, exists: bool):
+        """Add or remove one panel file from the index."""
+        parsed = panel_file_key(name)
+        if parsed is None:
+            return
+        key, variant_num = parsed
+        with self.lock:
+            entry = self.panels.get(key, {'variants': [], 'selected': False})
+            before = {'variants': list(entry['variants']), 'selected': entry['selected']}
+            self.apply_panel_file(self.panels, key, variant_num, exists)
+            events = panel_events(key, before, self.panels[key])
+        self.emit(events)
+
+    def update_file(self, path: Path):
+        """Apply a created, modified or deleted file to the index."""
+        path = Path(path)
+        exists = path.is_file()
+        parent = path.parent.resolve()
+
+        if parent == self.panels_dir.resolve():
+            self.update_panel(path.name, exists)
+        elif parent == self.pages_dir.resolve():
+            match = FINALIZED_FILE_RE.match(path.name)
+            if match:
+                page_num = int(match.group(1))
+                with self.lock:
+                    changed = (page_num in self.finalized) != exists
+                    (self.finalized.add if exists else self.finalized.discard)(page_num)
+                if changed:
+                    self.emit([('page-finalized', {'page_num': page_num, 'finalized': exists})])
+        elif parent == self.pages_json_dir.resolve():
+            page_num = page_file_number(path.name)
+            if page_num is not None:
+                data = self.read_json(path) if exists else None
+                with self.lock:
+                    if data is not None:
+                        self.pages[page_num] = data
+                    elif not exists:
+                        self.pages.pop(page_num, None)
+
+    # Change events
+
+    def subscribe(self, listener: Callable[[str, Dict], None]):
+        """Call listener(event type, data) for every change the index sees."""
+        self.listeners.append(listener)
+
+    def emit(self, events: List[Tuple[str, Dict]]):
+        """Report changes to listeners."""
+        for event_type, data in events:
+            for listener in list(self.listeners):
+                listener(event_type, data)
+
+    # Change detection
+
+    def start_watching(self) -> bool:
+        """Follow filesystem events (returns False without watchdog)."""
+        if Observer is None:
+            return False
+        for directory in (self.panels_dir, self.pages_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        handler = IndexEventHandler(self)
+        self.observer = Observer()
+        for directory in (self.pages_json_dir, self.panels_dir, self.pages_dir):
+            if directory.is_dir():
+                self.observer.schedule(handler, str(directory), recursive=False)
+        self.observer.daemon = True
+        self.observer.start()
+        # Catch anything written between the initial scan and the watch starting
+        self.scan()
+        return True
+
+    def refresh(self, source: str):
+        """Without a watcher: rescan a source if its directory changed."""
+        if self.observer is not None:
+            return
+        paths = {
+            'pages': self.pages_json_dir,
+            'panels': self.panels_dir,
+            'finalized': self.pages_dir,
+        }
+        if mtime_ns(paths[source]) != self.mtimes.get(source):
+            getattr(self, f"scan_{source}")()
+
+    def poll(self):
+        """Without a watcher: pick up changes made by other processes (reported as events)."""
+        for source in ('pages', 'panels', 'finalized'):
+            self.refresh(source)
+
+    def invalidate(self, source: str):
+        """Rescan a source now (after the server itself wrote to it)."""
+        getattr(self, f"scan_{source}")()
+
+    # Lookups
+
+    def page(self, page_num: int) -> Dict:
+        """Page script data (raises FileNotFoundError for unknown pages)."""
+        self.refresh('pages')
+        if self.observer is None and page_num in self.page_mtimes:
+            # Edits in place don't change the directory mtime; check the one file
+            page_file = self.page_file(page_num)
+            if mtime_ns(page_file) != self.page_mtimes[page_num]:
+                self.update_file(page_file)
+                self.page_mtimes[page_num] = mtime_ns(page_file)
+        with self.lock:
+            if page_num not in self.pages:
+                raise FileNotFoundError(f"Page file not found: {self.page_file(page_num)}")
+            return self.pages[page_num]
+
+    def page_file(self, page_num: int) -> Path:
+        """Page script path for a page number."""
+        if page_num == 0:
+            return self.pages_json_dir / COVER_FILE
+        return self.pages_json_dir / f"page-{page_num:03d}.json"
+
+    def page_numbers(self) -> List[int]:
+        """Numbers of all page scripts (excluding the cover), ascending."""
+        self.refresh('pages')
+        with self.lock:
+            return sorted(page_num for page_num in self.pages if page_num > 0)
+
+    def total_pages(self) -> int:
+        """Number of page scripts (excluding the cover)."""
+        return len(self.page_numbers())
+
+    def variants(self, page_num: int, panel_num: int) -> List[int]:
+        """Variant numbers on disk for a panel, ascending."""
+        self.refresh('panels')
+        with self.lock:
+            return list(self.panels.get((page_num, panel_num), {}).get('variants', []))
+
+    def is_selected(self, page_num: int, panel_num: int) -> bool:
+        """True if the panel has a selected (final) image."""
+        self.refresh('panels')
+        with self.lock:
+            return self.panels.get((page_num, panel_num), {}).get('selected', False)
+
+    def page_summaries(self) -> List[Dict]:
+        """Variant, selection and finalized counts for every page, in one pass over the index."""
+        self.refresh('pages')
+        self.refresh('panels')
+        self.refresh('finalized')
+        with self.lock:
+            variant_counts, selected_counts, unreviewed_counts = {}, {}, {}
+            for (page_num, _), entry in self.panels.items():
+                variant_counts[page_num] = variant_counts.get(page_num, 0) + len(entry['variants'])
+                selected_counts[page_num] = selected_counts.get(page_num, 0) + entry['selected']
+                # Variants waiting for a choice
+                if entry['variants'] and not entry['selected']:
+                    unreviewed_counts[page_num] = unreviewed_counts.get(page_num, 0) + 1
+
+            return [
+                {
+                    'page_num': page_num,
+                    'title': self.pages[page_num].get('title', ''),
+                    'panel_count': len(self.pages[page_num].get('panels', [])),
+                    'variants': variant_counts.get(page_num, 0),
+                    'selected': selected_counts.get(page_num, 0),
+                    'unreviewed': unreviewed_counts.get(page_num, 0),
+                    'finalized': page_num in self.finalized,
+                }
+                for page_num in sorted(page_num for page_num in self.pages if page_num > 0)
+            ]
+
+    def is_finalized(self, page_num: int) -> bool:
+        """True if the page has been assembled into output/pages/."""
+        self.refresh('finalized')
+        with self.lock:
+            return page_num in self.finalized
+
+
+class IndexEventHandler(FileSystemEventHandler):
+    """Forward watchdog events to the index."""
+
+    def __init__(self, index: ProjectIndex):
+        self.index = index
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        self.index.update_file(Path(event.src_path))
+        if getattr(event, 'dest_path', None):
+            self.index.update_file(Path(event.dest_path))
@@ -8,21 +8,83 @@ import os
 import json
 import sys
 import shutil
+import time
+import queue
+import asyncio
+import hashlib
+import itertools
+import threading
 import subprocess
+import multiprocessing
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from flask import Flask, render_template_string, request, jsonify, redirect, url_for, send_file
+from urllib.parse import parse_qs
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, send_file
+from markupsafe import Markup
 from PIL import Image
 import io
-from layout_engine import assemble_page_with_layout
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utilities.layout_engine import layout_rects
+from utilities.image_formats import encode_image, resize_to_width
+from assemble import render_panel_files, write_page_layout
+from project_index import ProjectIndex
+from selections_store import SelectionStore
+from deep_zoom import TilePyramid
+
+try:
+    # Async server: uvicorn, with the Flask app behind a WSGI-to-ASGI thread pool
+    import uvicorn
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    uvicorn = None
 
 # Configuration
 PAGES_JSON_DIR = Path("pages")
 OUTPUT_DIR = Path("output")
 PANELS_DIR = OUTPUT_DIR / "panels"
 PAGES_DIR = OUTPUT_DIR / "pages"
-SELECTIONS_FILE = OUTPUT_DIR / "selections.json"
+SELECTIONS_DB = OUTPUT_DIR / "selections.db"
+SELECTIONS_FILE = OUTPUT_DIR / "selections.json"  # Imported into SELECTIONS_DB once
+REVIEW_CACHE_DIR = OUTPUT_DIR / "review-cache"
 VARIANTS_PER_PANEL = 3
 
+# Downscaled WebP sizes served for panel images (full PNG only on request)
+IMAGE_SIZES = {
+    'thumb': 480,     # Variant cards
+    'preview': 960,   # Variant cards on high-DPI screens
+}
+IMAGE_QUALITY = 80
+IMAGE_CARD_SIZES = "(max-width: 700px) 100vw, 400px"
+
+# Image URLs carry the source hash, so a matching response never changes
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Assembled page renders: WebP previews plus the lossless page /finalize promotes
+PREVIEW_QUALITY = 85
+PAGE_RENDERS_IN_MEMORY = 4
+# Bump when page composition changes in a way the layout parameters don't capture
+PAGE_RENDER_VERSION = 1
+
+# Deep Zoom tiles for the zoom viewer, cut on demand
+ZOOM_TILES_DIR = REVIEW_CACHE_DIR / "tiles"
+ZOOM_TILE_QUALITY = 90
+
+# Server-sent events: per-client backlog, and how often a stream checks for
+# changes (without a watcher) and sends a keepalive; browser reconnect delay
+EVENT_QUEUE_SIZE = 256
+EVENT_POLL_INTERVAL = 1.0
+EVENT_KEEPALIVE = 15.0
+EVENT_RETRY_MS = 3000
+EVENT_STREAM_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+# Request threads for the async server (/events streams run on its event loop
+# instead) and page render processes
+REQUEST_THREADS = 32
+RENDER_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+
 # Layout settings (from assemble.py)
 PAGE_WIDTH = 1600
 PAGE_HEIGHT = 2400
@@ -34,123 +96,521 @@ app = Flask(__name__)
 current_page_data = None
 current_page_num = None
 
+# Panel file -> ((mtime_ns, size), content hash)
+_source_hashes = {}
+_source_hashes_lock = threading.Lock()
+
+# Render key -> (page image, panel rects), most recently used last
+_page_renders = OrderedDict()
+_page_renders_lock = threading.Lock()
+
+# Render key -> future of a render running in the worker pool
+_renders_in_flight = {}
+_render_pool = None
+
+# Project state, built by init_project_state() on first use rather than at
+# import: spawned render workers import this module too
+_project_state_lock = threading.Lock()
+
+# Pages, panels and finalized pages, kept current by filesystem events
+project_index = None
+
+# Selected variant numbers (SQLite, safe for concurrent reviewers)
+selection_store = None
+
+# Tile pyramids of panel images (zoom viewer)
+tile_pyramid = None
+
+# Variant generation in progress: (page, panel) -> {'started': time, 'count': variants, 'done': variants}
+generation_jobs = {}
+generation_jobs_lock = threading.Lock()
+
+# Server-sent event subscribers (a queue per open /events stream)
+event_subscribers = set()
+event_subscribers_lock = threading.Lock()
+_event_ids = itertools.count(1)
+
+
+def publish_event(event_type, data):
+    """Send an event to every open /events stream."""
+    event = (next(_event_ids), event_type, data)
+    with event_subscribers_lock:
+        subscribers = list(event_subscribers)
+    for subscriber in subscribers:
+        try:
+            subscriber.put_nowait(event)
+        except queue.Full:
+            pass  # Stalled client; it resynchronizes when it reconnects
+
+
+def init_project_state():
+    """Scan the project and open the selections store (once per server process)."""
+    global project_index, selection_store, tile_pyramid
+    with _project_state_lock:
+        if project_index is not None:
+            return
+        index = ProjectIndex(PAGES_JSON_DIR, PANELS_DIR, PAGES_DIR)
+        # Variants, selections and finalized pages the index notices
+        index.subscribe(publish_event)
+        selection_store = SelectionStore(SELECTIONS_DB, legacy_json=SELECTIONS_FILE)
+        tile_pyramid = TilePyramid(ZOOM_TILES_DIR, quality=ZOOM_TILE_QUALITY)
+        project_index = index
+
+
+@app.before_request
+def ensure_project_state():
+    init_project_state()
+
+
+def publish_job_progress(job_key, state, done, total, error=None):
+    """Send a job-progress event for a variant generation job."""
+    page_num, panel_num = job_key
+    data = {'page_num': page_num, 'panel_num': panel_num, 'state': state, 'done': done, 'total': total}
+    if error:
+        data['error'] = error
+    publish_event('job-progress', data)
+
+
+def start_job(job_key, count):
+    """
+    Register a variant generation job (shown on the dashboard and streamed as events).
+
+    Returns:
+        False if the panel already has a job running
+    """
+    with generation_jobs_lock:
+        if job_key in generation_jobs:
+            return False
+        generation_jobs[job_key] = {'started': time.time(), 'count': count, 'done': 0}
+    publish_job_progress(job_key, 'running', 0, count)
+    return True
+
+
+def advance_job(job_key):
+    """Count one finished variant of a job."""
+    with generation_jobs_lock:
+        job = generation_jobs.get(job_key)
+        if job is None:
+            return
+        job['done'] += 1
+        done, count = job['done'], job['count']
+    publish_job_progress(job_key, 'running', done, count)
+
+
+def finish_job(job_key, error=None):
+    """Remove a job, reporting whether it finished or failed."""
+    with generation_jobs_lock:
+        job = generation_jobs.pop(job_key, None)
+    if job is not None:
+        publish_job_progress(job_key, 'failed' if error else 'finished', job['done'], job['count'], error)
+
+
+def pending_variants(page_num, panel_num):
+    """Variants still being generated for a panel."""
+    with generation_jobs_lock:
+        job = generation_jobs.get((page_num, panel_num))
+        return job['count'] - job['done'] if job else 0
+
 
 def load_page_data(page_num):
-    """Load page data from JSON file."""
-    # Handle cover page (page 0)
-    if page_num == 0:
-        page_file = PAGES_JSON_DIR / "cover.json"
+    """Load page data (from the project index)."""
+    return project_index.page(page_num)
+
+
+def apply_selections(page_num, choices):
+    """
+    Make chosen variants the selected panels of a page.
+
+    Args:
+        choices: {panel_num: variant_num}
+
+    Runs inside one store transaction, which also serializes the panel file
+    changes against other reviewers.
+    """
+    with selection_store.transaction() as conn:
+        for panel_num, variant_num in choices.items():
+            source = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}-v{variant_num}.png"
+            if not source.exists():
+                raise FileNotFoundError(f"Variant file not found: {source.name}")
+
+        for panel_num, variant_num in choices.items():
+            source = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}-v{variant_num}.png"
+            dest = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}.png"
+
+            # Copy selected variant to final filename (never leaving a partial file)
+            tmp_file = dest.with_name(f"{dest.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+            shutil.copyfile(source, tmp_file)
+            os.replace(tmp_file, dest)
+
+        selection_store.select_many(
+            [(page_num, panel_num, variant_num) for panel_num, variant_num in choices.items()],
+            conn=conn
+        )
+
+        # Delete unchosen variants (clean as you go)
+        for panel_num, variant_num in choices.items():
+            for other_num in project_index.variants(page_num, panel_num):
+                if other_num != variant_num:
+                    variant_path = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}-v{other_num}.png"
+                    variant_path.unlink(missing_ok=True)
+
+    project_index.invalidate('panels')
+    prune_tiles()
+    for panel_num, variant_num in choices.items():
+        publish_event('selection-changed', {'page_num': page_num, 'panel_num': panel_num,
+                                            'selected': True, 'variant_num': variant_num})
+
+
+def source_hash(path):
+    """Content hash of a panel file, recomputed only when its mtime or size changes."""
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _source_hashes_lock:
+        cached = _source_hashes.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+    with _source_hashes_lock:
+        _source_hashes[path] = (key, digest)
+    return digest
+
+
+def current_source_hash(path):
+    """source_hash of a panel file, or None if it no longer exists."""
+    try:
+        return source_hash(path)
+    except FileNotFoundError:
+        return None
+
+
+def prune_tiles():
+    """Drop zoom tiles of panel files that were removed or replaced."""
+    return tile_pyramid.prune(current_source_hash)
+
+
+def image_urls(filename):
+    """Versioned thumbnail, preview and full-size URLs for a panel image."""
+    path = PANELS_DIR / filename
+    version = source_hash(path) if path.exists() else '0'
+    urls = {size: f"/image/{filename}?size={size}&v={version}" for size in IMAGE_SIZES}
+    urls['full'] = f"/image/{filename}?size=full&v={version}"
+    urls['srcset'] = ', '.join(f"{urls[size]} {width}w" for size, width in IMAGE_SIZES.items())
+    return urls
+
+
+def cached_rendition(path, size):
+    """Downscaled WebP of a panel image, generated once per source hash."""
+    cache_file = REVIEW_CACHE_DIR / f"{source_hash(path)}-{size}.webp"
+    if cache_file.exists():
+        return cache_file
+
+    with Image.open(path) as img:
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+        data = encode_image(resize_to_width(img, IMAGE_SIZES[size]), 'webp', IMAGE_QUALITY)
+
+    # Concurrent requests may render the same file; the rename keeps it whole
+    write_atomic(cache_file, data)
+    return cache_file
+
+
+def write_atomic(path, data):
+    """Write bytes via a temporary file, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    tmp_file.write_bytes(data)
+    os.replace(tmp_file, path)
+
+
+def panel_image_path(filename):
+    """Absolute path of a panel image, or None if missing or outside the panels directory."""
+    # Absolute: send_file resolves relative paths against the app, not the project
+    image_path = (PANELS_DIR / filename).resolve()
+    if image_path.parent != PANELS_DIR.resolve() or not image_path.is_file():
+        return None
+    return image_path
+
+
+def set_image_cache_headers(response, digest):
+    """Cache forever when the URL's ?v= matches the source hash, else revalidate."""
+    if request.args.get('v') == digest:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
     else:
-        page_file = PAGES_JSON_DIR / f"page-{page_num:03d}.json"
+        # Unversioned URL: the file can change, so revalidate (a 304 via the ETag)
+        response.cache_control.max_age = None
+        response.cache_control.no_cache = True
+    return response
+
+
+def selected_panel_files(page_num, panels):
+    """Selected panel files for a page, and the panel numbers still unselected."""
+    files = [PANELS_DIR / f"page-{page_num:03d}-panel-{panel['panel_num']}.png" for panel in panels]
+    missing = [panel['panel_num'] for panel, path in zip(panels, files) if not path.exists()]
+    return files, missing
+
+
+def page_render_key(page_num, panel_files):
+    """Cache key for an assembled page: its selected panels' hashes and the layout parameters."""
+    key_data = {
+        'version': PAGE_RENDER_VERSION,
+        'page': page_num,
+        'panels': [source_hash(path) for path in panel_files],
+        'layout': [PAGE_WIDTH, PAGE_HEIGHT, GUTTER],
+    }
+    return hashlib.sha256(json.dumps(key_data).encode('utf-8')).hexdigest()[:16]
+
+
+def page_render_files(page_num, key):
+    """Cached WebP preview and lossless PNG for a render key."""
+    stem = REVIEW_CACHE_DIR / "pages" / f"page-{page_num:03d}-{key}"
+    return stem.with_suffix('.webp'), stem.with_suffix('.png')
+
+
+def render_pool():
+    """Worker processes for page compositing (started on first use)."""
+    global _render_pool
+    with _page_renders_lock:
+        if _render_pool is None:
+            # Spawned, not forked: the server process has live threads
+            _render_pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS,
+                                               mp_context=multiprocessing.get_context('spawn'))
+        return _render_pool
 
-    if not page_file.exists():
-        raise FileNotFoundError(f"Page file not found: {page_file}")
 
-    with open(page_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def render_page(key, panel_files):
+    """
+    Assembled page image and panel rects for a render key (kept in memory for recent pages).
+
+    Compositing is pure-Python pixel work, so it runs in a worker process
+    where it can't hold the GIL against other requests. Concurrent requests
+    for the same render wait on one job.
+    """
+    with _page_renders_lock:
+        if key in _page_renders:
+            _page_renders.move_to_end(key)
+            return _page_renders[key]
+        future = _renders_in_flight.get(key)
+
+    if future is None:
+        pool = render_pool()
+        with _page_renders_lock:
+            future = _renders_in_flight.get(key)
+            if future is None:
+                future = pool.submit(render_panel_files, [str(path) for path in panel_files])
+                _renders_in_flight[key] = future
+
+    try:
+        render = future.result()
+    finally:
+        with _page_renders_lock:
+            if _renders_in_flight.get(key) is future:
+                del _renders_in_flight[key]
+
+    with _page_renders_lock:
+        _page_renders[key] = render
+        while len(_page_renders) > PAGE_RENDERS_IN_MEMORY:
+            _page_renders.popitem(last=False)
+    return render
 
 
-def load_selections():
-    """Load previous selections."""
-    if SELECTIONS_FILE.exists():
-        with open(SELECTIONS_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+def remove_stale_renders(page_num, key):
+    """Drop cached renders of a page other than the current one."""
+    for path in (REVIEW_CACHE_DIR / "pages").glob(f"page-{page_num:03d}-*"):
+        if not path.name.startswith(f"page-{page_num:03d}-{key}."):
+            path.unlink(missing_ok=True)
 
 
-def save_selections(selections):
-    """Save selections to JSON file."""
-    SELECTIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(SELECTIONS_FILE, 'w') as f:
-        json.dump(selections, f, indent=2)
+def save_lossless_render(page_num, key, page_img):
+    """Write the lossless render /finalize promotes (off the request path)."""
+    _, png_file = page_render_files(page_num, key)
+    if png_file.exists():
+        return
+    buffer = io.BytesIO()
+    page_img.save(buffer, 'PNG')
+    write_atomic(png_file, buffer.getvalue())
 
 
 def get_panel_variants(page_num, panel_num):
     """Get all available variants for a panel."""
     variants = []
-    variant_num = 1
 
-    while True:
-        variant_path = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}-v{variant_num}.png"
-        if not variant_path.exists():
-            break
+    for variant_num in project_index.variants(page_num, panel_num):
+        filename = f"page-{page_num:03d}-panel-{panel_num}-v{variant_num}.png"
+        variant_path = PANELS_DIR / filename
+        urls = image_urls(filename)
         variants.append({
             'num': variant_num,
             'path': variant_path,
-            'url': f"/image/page-{page_num:03d}-panel-{panel_num}-v{variant_num}.png"
+            'url': urls['thumb'],
+            'preview_url': urls['preview'],
+            'srcset': urls['srcset'],
+            'full_url': urls['full']
         })
-        variant_num += 1
 
     return variants
 
 
 def get_panel_selection(page_num, panel_num):
     """Check if a panel has been selected."""
-    final_path = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}.png"
-    return final_path.exists()
+    return project_index.is_selected(page_num, panel_num)
 
 
 def get_total_pages():
     """Get total number of pages available."""
-    page_files = list(PAGES_JSON_DIR.glob("page-*.json"))
-    return len(page_files)
+    return project_index.total_pages()
 
 
 def is_page_finalized(page_num):
     """Check if a page has been finalized (assembled)."""
-    page_file = PAGES_DIR / f"page-{page_num:03d}.png"
-    return page_file.exists()
+    return project_index.is_finalized(page_num)
 
 
-@app.route('/image/<path:filename>')
-def serve_image(filename):
-    """Serve panel images."""
-    from flask import send_file
-    image_path = PANELS_DIR / filename
-    if image_path.exists():
-        return send_file(image_path, mimetype='image/png')
-    return "Image not found", 404
+# Review page header and panel sections, also served on their own so live
+# updates can swap in just the parts that changed
+REVIEW_HEADER_TEMPLATE = app.jinja_env.from_string("""
+    <div class="header">
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <h1>Page {{ page_num }}: {{ page_data.title }}</h1>
+            <div class="page-info">
+                Page {{ page_num }} of {{ total_pages }} |
+                <a href="/rapid/{{ page_num }}" style="color: #4a9eff; text-decoration: none;">Rapid review (keyboard)</a> |
+                <a href="/dashboard" style="color: #4a9eff; text-decoration: none;">Dashboard</a>
+            </div>
+        </div>
+        <div class="subtitle">{{ page_data.panel_count }} panels | Select your favorite variant for each panel</div>
+        <div class="progress">
+            <div class="progress-bar" style="width: {{ (selected_count / page_data.panel_count * 100) }}%"></div>
+        </div>
+        <div class="subtitle" style="margin-top: 8px;">
+            Progress: {{ selected_count }}/{{ page_data.panel_count }} panels selected
+            {% if selected_count >= page_data.panel_count %}
+            <button class="preview-btn" onclick="previewPage({{ page_num }})">
+                Preview Final Page
+            </button>
+            {% else %}
+            <button class="preview-btn" disabled title="Select all panels to enable preview">
+                Preview Final Page ({{ page_data.panel_count - selected_count }} remaining)
+            </button>
+            {% endif %}
+        </div>
+        <div class="navigation-bar">
+            <button class="nav-button" onclick="navigatePage({{ page_num - 1 }})"
+                    {% if page_num <= 1 %}disabled{% endif %}>
+                ← Previous Page
+            </button>
+
+            {% if is_finalized %}
+            <button class="finalize-button finalized" disabled>
+                ✓ Page Finalized
+            </button>
+            {% elif selected_count >= page_data.panel_count %}
+            <button class="finalize-button" onclick="finalizePage({{ page_num }})">
+                Finalize Page & Add to Comic
+            </button>
+            {% else %}
+            <button class="finalize-button" disabled title="Select all panels to finalize">
+                Finalize Page ({{ page_data.panel_count - selected_count }} remaining)
+            </button>
+            {% endif %}
 
+            <button class="nav-button" onclick="navigatePage({{ page_num + 1 }})"
+                    {% if page_num >= total_pages %}disabled{% endif %}>
+                Next Page →
+            </button>
+        </div>
+    </div>
+""")
 
-@app.route('/')
-def index():
-    """Redirect to page review."""
-    if current_page_num:
-        return redirect(url_for('review_page', page_num=current_page_num))
-    return "No page specified. Run with: python review.py <page_num>", 400
+REVIEW_PANEL_TEMPLATE = app.jinja_env.from_string("""
+    {% macro variant_card(item, variant) %}
+            <div class="variant-card" onclick="selectVariant({{ page_num }}, {{ item.panel.panel_num }}, {{ variant.num }})">
+                <img src="{{ variant.url }}" srcset="{{ variant.srcset }}" sizes="{{ image_sizes }}"
+                     class="variant-image" alt="Variant {{ variant.num }}" loading="lazy" decoding="async">
+                <div class="variant-footer">
+                    <div class="variant-number">Variant {{ variant.num }}</div>
+                    <a class="full-size-link" href="{{ variant.full_url }}" target="_blank"
+                       onclick="event.stopPropagation()">View full size</a>
+                    <a class="full-size-link" href="/zoom/{{ page_num }}/{{ item.panel.panel_num }}" target="_blank"
+                       onclick="event.stopPropagation()">Compare zoomed</a>
+                    <button class="select-btn">Select This</button>
+                </div>
+            </div>
+    {% endmacro %}
 
+    <div class="panel-section {% if item.is_selected %}selected{% endif %}" id="panel-{{ item.panel.panel_num }}">
+        <div class="panel-header">
+            <div class="panel-title">Panel {{ item.panel.panel_num }}</div>
+            {% if item.is_selected %}
+            <div class="selected-badge">✓ SELECTED (Variant {{ item.selected_variant }})</div>
+            {% endif %}
+        </div>
 
-@app.route('/page/<int:page_num>')
-def review_page(page_num):
-    """Main review interface for a page."""
-    try:
-        page_data = load_page_data(page_num)
-    except FileNotFoundError as e:
-        return f"Error: {e}", 404
+        <div class="panel-info">
+            <h3>Scene Description</h3>
+            <p>{{ item.panel.visual }}</p>
+        </div>
 
-    selections = load_selections()
-    total_pages = get_total_pages()
-    is_finalized = is_page_finalized(page_num)
+        {% if item.panel.dialogue %}
+        <div class="panel-info">
+            <h3>Dialogue</h3>
+            <p>{{ item.panel.dialogue }}</p>
+        </div>
+        {% endif %}
 
-    # Prepare panel data with variants
-    panels_with_variants = []
-    for panel in page_data['panels']:
-        panel_num = panel['panel_num']
-        variants = get_panel_variants(page_num, panel_num)
-        is_selected = get_panel_selection(page_num, panel_num)
+        {% if item.is_selected %}
+        <div class="variants-grid">
+            <div class="variant-card" style="border: 3px solid #4a9eff;">
+                <img src="{{ item.selected_image.thumb }}" srcset="{{ item.selected_image.srcset }}" sizes="{{ image_sizes }}"
+                     class="variant-image" alt="Selected" decoding="async">
+                <div class="variant-footer">
+                    <div class="variant-number">✓ Selected (Variant {{ item.selected_variant }})</div>
+                    <a class="full-size-link" href="{{ item.selected_image.full }}" target="_blank">View full size</a>
+                    <a class="full-size-link" href="/zoom/{{ page_num }}/{{ item.panel.panel_num }}" target="_blank">Zoom</a>
+                </div>
+            </div>
+            {# Variants kept after an automatic preselection (auto_review.py) #}
+            {% for variant in item.variants if variant.num != item.selected_variant %}
+            {{ variant_card(item, variant) }}
+            {% endfor %}
+        </div>
+
+        <div class="actions">
+            <button class="generate-more-btn" onclick="generateMore({{ page_num }}, {{ item.panel.panel_num }})">
+                Generate 3 More Variants to Re-select
+            </button>
+        </div>
+        {% elif item.variants or item.pending_variants %}
+        <div class="variants-grid">
+            {% for variant in item.variants %}
+            {{ variant_card(item, variant) }}
+            {% endfor %}
+            {% for _ in range(item.pending_variants) %}
+            <div class="loading-placeholder"></div>
+            {% endfor %}
+        </div>
 
-        selected_variant = selections.get(f"{page_num}-{panel_num}")
+        <div class="actions">
+            <button class="generate-more-btn" onclick="generateMore({{ page_num }}, {{ item.panel.panel_num }})"
+                    {% if item.pending_variants %}disabled{% endif %}>
+                {% if item.pending_variants %}Generating {{ item.pending_variants }} more...{% else %}Generate 3 More Variants{% endif %}
+            </button>
+        </div>
+        {% else %}
+        <div class="loading">
+            <div class="spinner"></div>
+            <p>No variants generated yet. Run: python generate.py {{ page_num }}</p>
+        </div>
+        {% endif %}
+    </div>
+""")
 
-        panels_with_variants.append({
-            'panel': panel,
-            'variants': variants,
-            'is_selected': is_selected,
-            'selected_variant': selected_variant,
-            'total_variants': len(variants)
-        })
 
-    # HTML template
-    template = """
+# Review page template, compiled once at startup
+REVIEW_PAGE_TEMPLATE = app.jinja_env.from_string("""
 <!DOCTYPE html>
 <html>
 <head>
@@ -302,6 +762,18 @@ def review_page(page_num):
             margin-bottom: 8px;
         }
 
+        .full-size-link {
+            display: inline-block;
+            font-size: 12px;
+            color: #4a9eff;
+            margin-bottom: 8px;
+            text-decoration: none;
+        }
+
+        .full-size-link:hover {
+            text-decoration: underline;
+        }
+
         .select-btn {
             background: #4a9eff;
             color: white;
@@ -615,53 +1087,7 @@ def review_page(page_num):
     </style>
 </head>
 <body>
-    <div class="header">
-        <div style="display: flex; justify-content: space-between; align-items: center;">
-            <h1>Page {{ page_num }}: {{ page_data.title }}</h1>
-            <div class="page-info">Page {{ page_num }} of {{ total_pages }}</div>
-        </div>
-        <div class="subtitle">{{ page_data.panel_count }} panels | Select your favorite variant for each panel</div>
-        <div class="progress">
-            <div class="progress-bar" style="width: {{ (selected_count / page_data.panel_count * 100) }}%"></div>
-        </div>
-        <div class="subtitle" style="margin-top: 8px;">
-            Progress: {{ selected_count }}/{{ page_data.panel_count }} panels selected
-            {% if selected_count >= page_data.panel_count %}
-            <button class="preview-btn" onclick="previewPage({{ page_num }})">
-                Preview Final Page
-            </button>
-            {% else %}
-            <button class="preview-btn" disabled title="Select all panels to enable preview">
-                Preview Final Page ({{ page_data.panel_count - selected_count }} remaining)
-            </button>
-            {% endif %}
-        </div>
-        <div class="navigation-bar">
-            <button class="nav-button" onclick="navigatePage({{ page_num - 1 }})"
-                    {% if page_num <= 1 %}disabled{% endif %}>
-                ← Previous Page
-            </button>
-
-            {% if is_finalized %}
-            <button class="finalize-button finalized" disabled>
-                ✓ Page Finalized
-            </button>
-            {% elif selected_count >= page_data.panel_count %}
-            <button class="finalize-button" onclick="finalizePage({{ page_num }})">
-                Finalize Page & Add to Comic
-            </button>
-            {% else %}
-            <button class="finalize-button" disabled title="Select all panels to finalize">
-                Finalize Page ({{ page_data.panel_count - selected_count }} remaining)
-            </button>
-            {% endif %}
-
-            <button class="nav-button" onclick="navigatePage({{ page_num + 1 }})"
-                    {% if page_num >= total_pages %}disabled{% endif %}>
-                Next Page →
-            </button>
-        </div>
-    </div>
+    {{ header_html }}
 
     <div class="preview-modal" id="preview-modal">
         <div class="preview-content">
@@ -687,316 +1113,1698 @@ def review_page(page_num):
         </div>
     </div>
 
-    {% for item in panels_with_variants %}
-    <div class="panel-section {% if item.is_selected %}selected{% endif %}" id="panel-{{ item.panel.panel_num }}">
-        <div class="panel-header">
-            <div class="panel-title">Panel {{ item.panel.panel_num }}</div>
-            {% if item.is_selected %}
-            <div class="selected-badge">✓ SELECTED (Variant {{ item.selected_variant }})</div>
-            {% endif %}
-        </div>
-
-        <div class="panel-info">
-            <h3>Scene Description</h3>
-            <p>{{ item.panel.visual }}</p>
-        </div>
-
-        {% if item.panel.dialogue %}
-        <div class="panel-info">
-            <h3>Dialogue</h3>
-            <p>{{ item.panel.dialogue }}</p>
-        </div>
-        {% endif %}
+    {% for section in panel_sections %}
+    {{ section }}
+    {% endfor %}
 
-        {% if item.is_selected %}
-        <div class="variants-grid">
-            <div class="variant-card" style="border: 3px solid #4a9eff;">
-                <img src="/image/page-{{ '%03d' % page_num }}-panel-{{ item.panel.panel_num }}.png" class="variant-image" alt="Selected">
-                <div class="variant-footer">
-                    <div class="variant-number">✓ Selected (Variant {{ item.selected_variant }})</div>
-                </div>
-            </div>
+    <script>
+        function selectVariant(pageNum, panelNum, variantNum) {
+            fetch('/select/' + pageNum + '/' + panelNum + '/' + variantNum, {
+                method: 'POST'
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    showMessage('Panel ' + panelNum + ' - Variant ' + variantNum + ' selected!');
+                    refreshPanels([panelNum]);
+                } else {
+                    alert('Error: ' + data.error);
+                }
+            })
+            .catch(error => {
+                alert('Error selecting variant: ' + error);
+            });
+        }
+
+        function generateMore(pageNum, panelNum, skipConfirm = false) {
+            if (!skipConfirm && !confirm('Generate 3 more variants for panel ' + panelNum + '? This will call the OpenAI API (~50 seconds per variant).')) {
+                return;
+            }
+
+            // Placeholders, new variants and completion arrive as job-progress and variant-created events
+            fetch('/more/' + pageNum + '/' + panelNum, {
+                method: 'POST'
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    showMessage('Generating ' + data.started + ' more variants for panel ' + panelNum + '...');
+                } else {
+                    alert('Error: ' + data.error);
+                }
+                refreshPanels([panelNum]);
+            })
+            .catch(error => {
+                alert('Error generating variants: ' + error);
+                refreshPanels([panelNum]);
+            });
+        }
+
+        function previewPage(pageNum) {
+            const modal = document.getElementById('preview-modal');
+            const container = document.getElementById('preview-image-container');
+            const actions = document.getElementById('preview-actions');
+
+            modal.classList.add('active');
+            container.innerHTML = '<div class="loading"><div class="spinner"></div><p>Assembling page preview...</p></div>';
+            actions.style.display = 'none';
+
+            fetch('/preview/' + pageNum)
+                .then(response => response.blob())
+                .then(blob => {
+                    const url = URL.createObjectURL(blob);
+                    container.innerHTML = '<img src="' + url + '" alt="Page Preview">';
+                    actions.style.display = 'flex';
+                })
+                .catch(error => {
+                    container.innerHTML = '<p style="color: #ff6b6b;">Error generating preview: ' + error + '</p>';
+                });
+        }
+
+        function regeneratePanel(pageNum, panelNum) {
+            if (!confirm('Generate 3 more variants for Panel ' + panelNum + '?\\n\\n~50 seconds per variant (~2.5 minutes total)\\n\\nThis will close the preview and scroll to that panel.')) {
+                return;
+            }
+
+            closePreview();
+
+            // Scroll to the panel section
+            setTimeout(() => {
+                const panelSection = document.getElementById('panel-' + panelNum);
+                if (panelSection) {
+                    panelSection.scrollIntoView({ behavior: 'smooth', block: 'center' });
+                }
+            }, 300);
+
+            // Trigger generation (skip the second confirm since we already confirmed)
+            generateMore(pageNum, panelNum, true);
+        }
+
+        function closePreview() {
+            const modal = document.getElementById('preview-modal');
+            modal.classList.remove('active');
+        }
+
+        function showMessage(text) {
+            const existing = document.querySelector('.message');
+            if (existing) existing.remove();
+
+            const msg = document.createElement('div');
+            msg.className = 'message';
+            msg.textContent = text;
+            document.body.appendChild(msg);
+
+            setTimeout(() => {
+                msg.style.opacity = '0';
+                msg.style.transform = 'translateX(400px)';
+                setTimeout(() => msg.remove(), 300);
+            }, 3000);
+        }
+
+        function navigatePage(pageNum) {
+            window.location.href = '/page/' + pageNum;
+        }
+
+        function finalizePage(pageNum) {
+            if (!confirm('Finalize page ' + pageNum + '? This will assemble the page and add it to the final comic.')) {
+                return;
+            }
+
+            showMessage('Finalizing page ' + pageNum + '...');
+
+            fetch('/finalize/' + pageNum, {
+                method: 'POST'
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    showMessage('✓ Page ' + pageNum + ' finalized and saved!');
+                    refreshPanels([]);
+                } else {
+                    alert('Error finalizing page: ' + data.error);
+                }
+            })
+            .catch(error => {
+                alert('Error finalizing page: ' + error);
+            });
+        }
+
+        // Live updates: swap in freshly rendered sections for the changed panels and the header
+        const PAGE_NUM = {{ page_num }};
+        const stalePanels = new Set();
+        let refreshTimer = null;
+
+        function htmlElement(html) {
+            const template = document.createElement('template');
+            template.innerHTML = html.trim();
+            return template.content.firstElementChild;
+        }
+
+        function refreshPanels(panelNums) {
+            panelNums.forEach(panelNum => stalePanels.add(panelNum));
+            // Events tend to come in bursts; one fetch covers them
+            clearTimeout(refreshTimer);
+            refreshTimer = setTimeout(() => {
+                const panels = Array.from(stalePanels);
+                stalePanels.clear();
+                fetch('/page/' + PAGE_NUM + '/fragments?panels=' + panels.join(','))
+                    .then(response => response.json())
+                    .then(data => {
+                        if (!data.success) return;
+                        document.querySelector('.header').replaceWith(htmlElement(data.header));
+                        panels.forEach(panelNum => {
+                            const current = document.getElementById('panel-' + panelNum);
+                            if (current && data.panels[panelNum]) current.replaceWith(htmlElement(data.panels[panelNum]));
+                        });
+                    })
+                    .catch(() => {});
+            }, 150);
+        }
+
+        const events = new EventSource('/events?page=' + PAGE_NUM);
+        ['variant-created', 'selection-changed'].forEach(type => events.addEventListener(type, event => {
+            refreshPanels([JSON.parse(event.data).panel_num]);
+        }));
+        events.addEventListener('page-finalized', () => refreshPanels([]));
+        events.addEventListener('job-progress', event => {
+            const job = JSON.parse(event.data);
+            refreshPanels([job.panel_num]);
+            if (job.state === 'running' && job.done) {
+                showMessage('Panel ' + job.panel_num + ': ' + job.done + ' of ' + job.total + ' new variants ready');
+            } else if (job.state === 'finished') {
+                showMessage('Generated ' + job.done + ' new variants for panel ' + job.panel_num + '!');
+            } else if (job.state === 'failed') {
+                showMessage('Panel ' + job.panel_num + ': generation failed (' + job.error + ')');
+            }
+        });
+
+        // After a dropped connection, catch up on anything missed
+        let disconnected = false;
+        events.onerror = () => { disconnected = true; };
+        events.onopen = () => {
+            if (!disconnected) return;
+            disconnected = false;
+            refreshPanels(Array.from(document.querySelectorAll('.panel-section'))
+                .map(section => Number(section.id.replace('panel-', ''))));
+        };
+    </script>
+</body>
+</html>
+""")
+
+
+# Rapid review template, compiled once at startup
+RAPID_REVIEW_TEMPLATE = app.jinja_env.from_string("""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Comic Panel Review - Rapid Review</title>
+    <style>
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+            background: #1a1a1a;
+            color: #e0e0e0;
+            padding: 20px;
+            line-height: 1.6;
+        }
+
+        .header {
+            background: #2a2a2a;
+            padding: 16px 20px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+            border-left: 4px solid #4a9eff;
+        }
+
+        .header h1 {
+            font-size: 22px;
+            color: #fff;
+        }
+
+        .header a {
+            color: #4a9eff;
+            text-decoration: none;
+        }
+
+        .status-line {
+            color: #999;
+            font-size: 13px;
+            display: flex;
+            justify-content: space-between;
+            gap: 20px;
+            flex-wrap: wrap;
+        }
+
+        .keys {
+            color: #777;
+            font-size: 12px;
+            margin-top: 6px;
+        }
+
+        kbd {
+            background: #333;
+            border: 1px solid #555;
+            border-radius: 3px;
+            padding: 0 5px;
+            font-family: inherit;
+            color: #e0e0e0;
+        }
+
+        .panel-info {
+            background: #2a2a2a;
+            padding: 14px 18px;
+            border-radius: 8px;
+            margin-bottom: 16px;
+            font-size: 14px;
+        }
+
+        .panel-info h3 {
+            color: #4a9eff;
+            font-size: 12px;
+            text-transform: uppercase;
+            margin-bottom: 4px;
+        }
+
+        .variants-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(320px, 1fr));
+            gap: 16px;
+        }
+
+        .variant-card {
+            position: relative;
+            background: #2a2a2a;
+            border: 3px solid #333;
+            border-radius: 8px;
+            overflow: hidden;
+            cursor: pointer;
+        }
+
+        .variant-card.chosen {
+            border-color: #4a9eff;
+        }
+
+        .variant-card img {
+            width: 100%;
+            display: block;
+        }
+
+        .variant-key {
+            position: absolute;
+            top: 10px;
+            left: 10px;
+            background: rgba(0, 0, 0, 0.75);
+            color: #fff;
+            font-size: 22px;
+            font-weight: 700;
+            width: 40px;
+            height: 40px;
+            border-radius: 6px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }
+
+        .empty {
+            text-align: center;
+            color: #999;
+            padding: 60px 20px;
+        }
+
+        .message {
+            position: fixed;
+            top: 20px;
+            right: 20px;
+            background: #4a9eff;
+            color: white;
+            padding: 12px 20px;
+            border-radius: 6px;
+            font-weight: 600;
+            transition: opacity 0.3s;
+        }
+
+        .message.error {
+            background: #ef4444;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1 id="title"></h1>
+        <div class="status-line">
+            <span id="position"></span>
+            <span>
+                <a id="page-link" href="#">Full page review</a> |
+                <a href="/dashboard">Dashboard</a>
+            </span>
+        </div>
+        <div class="keys">
+            <kbd>1</kbd>-<kbd>9</kbd> choose variant &nbsp;
+            <kbd>→</kbd>/<kbd>Space</kbd> skip &nbsp;
+            <kbd>←</kbd>/<kbd>Backspace</kbd> back &nbsp;
+            <kbd>Enter</kbd> save now &nbsp;
+            <kbd>Esc</kbd> full page review
         </div>
+    </div>
+
+    <div id="panel"></div>
+
+    <script>
+        // Page being reviewed (from /api/page) and its panels still waiting for a choice
+        let page = {{ page | tojson }};
+        let queue = [];
+        let position = 0;
+
+        // Choices not yet saved: {panel_num: variant_num}, written in one batch per page
+        let pending = {};
+        let saving = null;
+
+        // Decoded preview images by URL, and the next page's data once fetched
+        const images = new Map();
+        let nextPage = null;
+
+        function reviewQueue(data) {
+            return data.panels.filter(panel => !panel.is_selected && panel.variants.length);
+        }
+
+        function preload(url) {
+            // Fetch and decode off the main thread, so showing the image later is instant
+            if (!images.has(url)) {
+                const img = new Image();
+                img.decoding = 'async';
+                img.src = url;
+                img.decode().catch(() => {});
+                images.set(url, img);
+            }
+            return images.get(url);
+        }
+
+        function prefetchPanel(panel) {
+            if (panel) panel.variants.slice(0, 9).forEach(variant => preload(variant.preview_url));
+        }
+
+        function prefetchNextPage() {
+            if (!page.next_review_page || (nextPage && nextPage.page_num === page.next_review_page)) return;
+            const pageNum = page.next_review_page;
+            fetch('/api/page/' + pageNum)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success && pageNum === page.next_review_page) {
+                        nextPage = data;
+                        prefetchPanel(reviewQueue(data)[0]);
+                    }
+                })
+                .catch(() => {});
+        }
+
+        function showPage(data) {
+            page = data;
+            queue = reviewQueue(data);
+            position = 0;
+            pending = {};
+            history.replaceState(null, '', '/rapid/' + page.page_num);
+            document.title = 'Comic Panel Review - Rapid Review - Page ' + page.page_num;
+            document.getElementById('title').textContent = 'Page ' + page.page_num + ': ' + page.title;
+            document.getElementById('page-link').href = '/page/' + page.page_num;
+            render();
+            prefetchNextPage();
+        }
+
+        function render() {
+            const container = document.getElementById('panel');
+            const positionText = document.getElementById('position');
+            container.replaceChildren();
+
+            if (position >= queue.length) {
+                positionText.textContent = 'Page ' + page.page_num + ' of ' + page.total_pages;
+                const empty = document.createElement('div');
+                empty.className = 'empty';
+                empty.textContent = page.next_review_page
+                    ? 'Nothing left to choose on this page. Press → for page ' + page.next_review_page + '.'
+                    : 'Nothing left to choose. All generated variants have been reviewed.';
+                container.appendChild(empty);
+                return;
+            }
+
+            const panel = queue[position];
+            const unsaved = Object.keys(pending).length;
+            positionText.textContent = 'Panel ' + panel.panel_num + ' (' + (position + 1) + ' of ' + queue.length +
+                ' to review) | ' + unsaved + ' unsaved choice' + (unsaved === 1 ? '' : 's');
+
+            [['Scene Description', panel.visual], ['Dialogue', panel.dialogue]].forEach(([heading, text]) => {
+                if (!text) return;
+                const info = document.createElement('div');
+                info.className = 'panel-info';
+                const h3 = document.createElement('h3');
+                h3.textContent = heading;
+                const p = document.createElement('p');
+                p.textContent = text;
+                info.append(h3, p);
+                container.appendChild(info);
+            });
+
+            const grid = document.createElement('div');
+            grid.className = 'variants-grid';
+            panel.variants.slice(0, 9).forEach((variant, index) => {
+                const card = document.createElement('div');
+                card.className = 'variant-card' + (pending[panel.panel_num] === variant.num ? ' chosen' : '');
+                card.onclick = () => choose(index);
+                const key = document.createElement('div');
+                key.className = 'variant-key';
+                key.textContent = index + 1;
+                const img = preload(variant.preview_url);
+                img.alt = 'Variant ' + variant.num;
+                card.append(img, key);
+                grid.appendChild(card);
+            });
+            container.appendChild(grid);
+
+            prefetchPanel(queue[position + 1]);
+        }
+
+        function choose(index) {
+            const panel = queue[position];
+            if (!panel || index >= Math.min(panel.variants.length, 9)) return;
+            pending[panel.panel_num] = panel.variants[index].num;
+            advance();
+        }
+
+        function advance() {
+            if (position < queue.length) position++;
+            if (position >= queue.length && Object.keys(pending).length) {
+                save().then(ok => { if (ok) nextPageOrRender(); });
+            } else {
+                render();
+            }
+        }
+
+        function nextPageOrRender() {
+            if (nextPage && nextPage.page_num === page.next_review_page) {
+                showPage(nextPage);
+            } else if (page.next_review_page) {
+                window.location.href = '/rapid/' + page.next_review_page;
+            } else {
+                render();
+            }
+        }
+
+        function save() {
+            // One request for every choice made on this page
+            const choices = Object.entries(pending).map(([panel, variant]) => ({
+                panel_num: Number(panel), variant_num: variant
+            }));
+            if (!choices.length) return Promise.resolve(true);
+            if (saving) return saving;
+
+            saving = fetch('/select/' + page.page_num, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ selections: choices }),
+                keepalive: true
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (!data.success) {
+                    if (data.missing) {
+                        // Variants deleted since they were shown: drop those choices so the rest can save
+                        data.missing.forEach(panelNum => delete pending[panelNum]);
+                        return reloadPage().then(() => { throw new Error(data.error); });
+                    }
+                    throw new Error(data.error);
+                }
+                choices.forEach(choice => delete pending[choice.panel_num]);
+                dropPanels(new Set(choices.map(choice => choice.panel_num)));
+                showMessage('Saved ' + data.selected + ' selection' + (data.selected === 1 ? '' : 's') + ' on page ' + page.page_num);
+                return true;
+            })
+            .catch(error => {
+                showMessage('Error saving selections: ' + error.message, true);
+                render();
+                return false;
+            })
+            .finally(() => { saving = null; });
+            return saving;
+        }
+
+        function dropPanels(panelNums) {
+            // Saved panels leave the queue; their unchosen variants no longer exist
+            position = queue.slice(0, position).filter(panel => !panelNums.has(panel.panel_num)).length;
+            queue = queue.filter(panel => !panelNums.has(panel.panel_num));
+        }
+
+        function reloadPage() {
+            // Re-read the page, keeping the current panel and the choices that still exist
+            return fetch('/api/page/' + page.page_num)
+                .then(response => response.json())
+                .then(data => {
+                    if (!data.success) return;
+                    const current = queue[position];
+                    page = data;
+                    queue = reviewQueue(data);
+                    Object.keys(pending).forEach(panelNum => {
+                        const panel = queue.find(each => each.panel_num === Number(panelNum));
+                        if (!panel || !panel.variants.some(variant => variant.num === pending[panelNum])) {
+                            delete pending[panelNum];
+                        }
+                    });
+                    const index = current ? queue.findIndex(panel => panel.panel_num === current.panel_num) : -1;
+                    position = index >= 0 ? index : Math.min(position, queue.length);
+                })
+                .catch(() => {});
+        }
 
-        <div class="actions">
-            <button class="generate-more-btn" onclick="generateMore({{ page_num }}, {{ item.panel.panel_num }})">
-                Generate 3 More Variants to Re-select
-            </button>
-        </div>
-        {% elif item.variants %}
-        <div class="variants-grid">
-            {% for variant in item.variants %}
-            <div class="variant-card" onclick="selectVariant({{ page_num }}, {{ item.panel.panel_num }}, {{ variant.num }})">
-                <img src="{{ variant.url }}" class="variant-image" alt="Variant {{ variant.num }}">
-                <div class="variant-footer">
-                    <div class="variant-number">Variant {{ variant.num }}</div>
-                    <button class="select-btn">Select This</button>
-                </div>
+        function showMessage(text, isError = false) {
+            const existing = document.querySelector('.message');
+            if (existing) existing.remove();
+
+            const msg = document.createElement('div');
+            msg.className = 'message' + (isError ? ' error' : '');
+            msg.textContent = text;
+            document.body.appendChild(msg);
+
+            setTimeout(() => {
+                msg.style.opacity = '0';
+                setTimeout(() => msg.remove(), 300);
+            }, 2000);
+        }
+
+        document.addEventListener('keydown', event => {
+            if (event.ctrlKey || event.metaKey || event.altKey) return;
+
+            if (event.key >= '1' && event.key <= '9') {
+                choose(Number(event.key) - 1);
+            } else if (event.key === 'ArrowRight' || event.key === ' ') {
+                if (position >= queue.length) {
+                    save().then(ok => { if (ok) nextPageOrRender(); });
+                } else {
+                    advance();
+                }
+            } else if (event.key === 'ArrowLeft' || event.key === 'Backspace') {
+                if (position > 0) {
+                    position--;
+                    render();
+                }
+            } else if (event.key === 'Enter') {
+                save().then(() => render());
+            } else if (event.key === 'Escape') {
+                save().then(ok => { if (ok) window.location.href = '/page/' + page.page_num; });
+            } else {
+                return;
+            }
+            event.preventDefault();
+        });
+
+        // Don't lose choices made on a page that was left before its last panel
+        window.addEventListener('pagehide', () => { save(); });
+
+        showPage(page);
+    </script>
+</body>
+</html>
+""")
+
+
+# Zoom viewer template, compiled once at startup
+ZOOM_TEMPLATE = app.jinja_env.from_string("""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Comic Panel Review - Page {{ page_num }} Panel {{ panel_num }} Zoom</title>
+    <style>
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+            background: #1a1a1a;
+            color: #e0e0e0;
+            height: 100vh;
+            display: flex;
+            flex-direction: column;
+        }
+
+        .header {
+            background: #2a2a2a;
+            padding: 10px 20px;
+            border-bottom: 1px solid #333;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            gap: 20px;
+            flex-wrap: wrap;
+            font-size: 13px;
+        }
+
+        .header h1 {
+            font-size: 18px;
+            color: #fff;
+        }
+
+        .header a {
+            color: #4a9eff;
+            text-decoration: none;
+        }
+
+        .hint {
+            color: #777;
+        }
+
+        .viewers {
+            flex: 1;
+            display: grid;
+            grid-template-columns: repeat({{ [images | length, 3] | min }}, 1fr);
+            gap: 4px;
+            padding: 4px;
+            min-height: 0;
+        }
+
+        .viewer {
+            position: relative;
+            overflow: hidden;
+            background: #111;
+            cursor: grab;
+            touch-action: none;
+            user-select: none;
+        }
+
+        .viewer.dragging {
+            cursor: grabbing;
+        }
+
+        .tiles .tile {
+            position: absolute;
+            pointer-events: none;
+        }
+
+        .viewer-label {
+            position: absolute;
+            top: 8px;
+            left: 8px;
+            z-index: 100;
+            background: rgba(0, 0, 0, 0.75);
+            padding: 4px 10px;
+            border-radius: 4px;
+            font-size: 13px;
+            font-weight: 600;
+        }
+
+        .viewer-label a {
+            color: #4a9eff;
+            text-decoration: none;
+            font-weight: normal;
+            margin-left: 8px;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>Page {{ page_num }}, Panel {{ panel_num }}</h1>
+        <span class="hint">Scroll or double-click to zoom, drag to pan, <b>0</b> to reset</span>
+        <span>
+            {% if images | length > 1 %}
+            <label><input type="checkbox" id="sync" checked> Synchronize zoom</label> |
+            {% endif %}
+            <a href="/page/{{ page_num }}#panel-{{ panel_num }}">Back to review</a>
+        </span>
+    </div>
+
+    <div class="viewers">
+        {% for image in images %}
+        <div class="viewer">
+            <div class="tiles"></div>
+            <div class="viewer-label">
+                {{ image.label }}
+                <a href="{{ image.full_url }}" target="_blank">Full PNG</a>
             </div>
-            {% endfor %}
         </div>
+        {% endfor %}
+    </div>
 
-        <div class="actions">
-            <button class="generate-more-btn" onclick="generateMore({{ page_num }}, {{ item.panel.panel_num }})">
-                Generate 3 More Variants
-            </button>
-        </div>
-        {% else %}
-        <div class="loading">
-            <div class="spinner"></div>
-            <p>No variants generated yet. Run: python generate.py {{ page_num }}</p>
+    <script>
+        // Screen pixels per image pixel at the deepest zoom
+        const MAX_PIXEL_SCALE = 4;
+        // Tile elements kept per viewer for panning back
+        const MAX_CACHED_TILES = 400;
+
+        class ZoomViewer {
+            constructor(element, image) {
+                this.element = element;
+                this.layer = element.querySelector('.tiles');
+                this.image = image;
+                this.tiles = new Map();  // 'level/col_row' -> img element
+                // Zoom relative to fitting the whole image; center in image fractions
+                this.view = { zoom: 1, cx: 0.5, cy: 0.5 };
+            }
+
+            load() {
+                return fetch('/tiles/' + this.image.name + '.dzi?v=' + this.image.version)
+                    .then(response => response.text())
+                    .then(text => {
+                        const xml = new DOMParser().parseFromString(text, 'application/xml');
+                        const root = xml.documentElement;
+                        const size = root.getElementsByTagName('Size')[0];
+                        this.width = Number(size.getAttribute('Width'));
+                        this.height = Number(size.getAttribute('Height'));
+                        this.tileSize = Number(root.getAttribute('TileSize'));
+                        this.overlap = Number(root.getAttribute('Overlap'));
+                        this.format = root.getAttribute('Format');
+                        this.maxLevel = Math.max(0, Math.ceil(Math.log2(Math.max(this.width, this.height))));
+                        this.render();
+                    });
+            }
+
+            fitScale() {
+                return Math.min(this.element.clientWidth / this.width, this.element.clientHeight / this.height);
+            }
+
+            maxZoom() {
+                return Math.max(1, MAX_PIXEL_SCALE / this.fitScale());
+            }
+
+            clampView() {
+                this.view.zoom = Math.min(Math.max(this.view.zoom, 1), this.maxZoom());
+                this.view.cx = Math.min(Math.max(this.view.cx, 0), 1);
+                this.view.cy = Math.min(Math.max(this.view.cy, 0), 1);
+            }
+
+            // Image rectangle shown: left/top in image pixels, scale in screen px per image px
+            viewport() {
+                const scale = this.fitScale() * this.view.zoom;
+                return {
+                    scale: scale,
+                    left: this.view.cx * this.width - this.element.clientWidth / 2 / scale,
+                    top: this.view.cy * this.height - this.element.clientHeight / 2 / scale
+                };
+            }
+
+            render() {
+                if (!this.width) return;
+                const viewport = this.viewport();
+                const wanted = Math.ceil(Math.log2(viewport.scale * window.devicePixelRatio)) + this.maxLevel;
+                const detailLevel = Math.min(Math.max(wanted, 0), this.maxLevel);
+                // Single-tile level underneath, so panning never shows empty space
+                const baseLevel = Math.min(Math.floor(Math.log2(this.tileSize)), detailLevel);
+
+                const shown = new Set();
+                new Set([baseLevel, detailLevel]).forEach(level => this.placeTiles(level, viewport, shown));
+
+                for (const child of Array.from(this.layer.children)) {
+                    if (!shown.has(child)) child.remove();
+                }
+                if (this.tiles.size > MAX_CACHED_TILES) {
+                    for (const [key, img] of this.tiles) {
+                        if (!shown.has(img)) this.tiles.delete(key);
+                    }
+                }
+            }
+
+            placeTiles(level, viewport, shown) {
+                const factor = Math.pow(2, level - this.maxLevel);  // level px per image px
+                const levelWidth = Math.ceil(this.width * factor);
+                const levelHeight = Math.ceil(this.height * factor);
+                const size = this.tileSize;
+                const right = viewport.left + this.element.clientWidth / viewport.scale;
+                const bottom = viewport.top + this.element.clientHeight / viewport.scale;
+
+                // Only the tiles intersecting the visible rectangle
+                const firstCol = Math.max(0, Math.floor(viewport.left * factor / size));
+                const lastCol = Math.min(Math.ceil(levelWidth / size) - 1, Math.floor(right * factor / size));
+                const firstRow = Math.max(0, Math.floor(viewport.top * factor / size));
+                const lastRow = Math.min(Math.ceil(levelHeight / size) - 1, Math.floor(bottom * factor / size));
+
+                for (let col = firstCol; col <= lastCol; col++) {
+                    for (let row = firstRow; row <= lastRow; row++) {
+                        const key = level + '/' + col + '_' + row;
+                        let img = this.tiles.get(key);
+                        if (!img) {
+                            img = new Image();
+                            img.className = 'tile';
+                            img.decoding = 'async';
+                            img.style.zIndex = level;
+                            img.src = '/tiles/' + this.image.name + '_files/' + key + '.' + this.format +
+                                '?v=' + this.image.version;
+                            this.tiles.set(key, img);
+                        }
+
+                        const x0 = col * size - (col ? this.overlap : 0);
+                        const y0 = row * size - (row ? this.overlap : 0);
+                        const x1 = Math.min((col + 1) * size + this.overlap, levelWidth);
+                        const y1 = Math.min((row + 1) * size + this.overlap, levelHeight);
+                        img.style.left = ((x0 / factor - viewport.left) * viewport.scale) + 'px';
+                        img.style.top = ((y0 / factor - viewport.top) * viewport.scale) + 'px';
+                        img.style.width = ((x1 - x0) / factor * viewport.scale) + 'px';
+                        img.style.height = ((y1 - y0) / factor * viewport.scale) + 'px';
+
+                        if (!img.parentNode) this.layer.appendChild(img);
+                        shown.add(img);
+                    }
+                }
+            }
+
+            // Zoom by a factor, keeping the image point under (x, y) in place
+            zoomAt(x, y, factor) {
+                const before = this.viewport();
+                const imageX = before.left + x / before.scale;
+                const imageY = before.top + y / before.scale;
+                this.view.zoom *= factor;
+                this.clampView();
+                const scale = this.fitScale() * this.view.zoom;
+                this.view.cx = (imageX - (x - this.element.clientWidth / 2) / scale) / this.width;
+                this.view.cy = (imageY - (y - this.element.clientHeight / 2) / scale) / this.height;
+                this.clampView();
+            }
+
+            panBy(dx, dy) {
+                const scale = this.fitScale() * this.view.zoom;
+                this.view.cx -= dx / scale / this.width;
+                this.view.cy -= dy / scale / this.height;
+                this.clampView();
+            }
+        }
+
+        const images = {{ images | tojson }};
+        const viewers = Array.from(document.querySelectorAll('.viewer'))
+            .map((element, index) => new ZoomViewer(element, images[index]));
+        const syncBox = document.getElementById('sync');
+
+        let frame = null;
+        function update(source) {
+            // Variants of a panel share a layout, so the same relative view lines them up
+            if (syncBox && syncBox.checked) {
+                viewers.forEach(viewer => { if (viewer !== source) viewer.view = Object.assign({}, source.view); });
+            }
+            if (frame === null) {
+                frame = requestAnimationFrame(() => {
+                    frame = null;
+                    viewers.forEach(viewer => viewer.render());
+                });
+            }
+        }
+
+        viewers.forEach(viewer => {
+            const element = viewer.element;
+            let drag = null;
+
+            element.addEventListener('wheel', event => {
+                event.preventDefault();
+                const rect = element.getBoundingClientRect();
+                viewer.zoomAt(event.clientX - rect.left, event.clientY - rect.top, Math.exp(-event.deltaY * 0.002));
+                update(viewer);
+            }, { passive: false });
+
+            element.addEventListener('dblclick', event => {
+                const rect = element.getBoundingClientRect();
+                viewer.zoomAt(event.clientX - rect.left, event.clientY - rect.top, 2);
+                update(viewer);
+            });
+
+            element.addEventListener('pointerdown', event => {
+                drag = { x: event.clientX, y: event.clientY };
+                element.setPointerCapture(event.pointerId);
+                element.classList.add('dragging');
+            });
+            element.addEventListener('pointermove', event => {
+                if (!drag) return;
+                viewer.panBy(event.clientX - drag.x, event.clientY - drag.y);
+                drag = { x: event.clientX, y: event.clientY };
+                update(viewer);
+            });
+            ['pointerup', 'pointercancel'].forEach(type => element.addEventListener(type, () => {
+                drag = null;
+                element.classList.remove('dragging');
+            }));
+
+            viewer.load();
+        });
+
+        document.addEventListener('keydown', event => {
+            const viewer = viewers[0];
+            if (event.key === '0') {
+                viewers.forEach(each => { each.view = { zoom: 1, cx: 0.5, cy: 0.5 }; });
+            } else if (event.key === '+' || event.key === '=') {
+                viewer.zoomAt(viewer.element.clientWidth / 2, viewer.element.clientHeight / 2, 1.5);
+            } else if (event.key === '-') {
+                viewer.zoomAt(viewer.element.clientWidth / 2, viewer.element.clientHeight / 2, 1 / 1.5);
+            } else {
+                return;
+            }
+            update(viewer);
+        });
+
+        if (syncBox) syncBox.addEventListener('change', () => update(viewers[0]));
+        window.addEventListener('resize', () => update(viewers[0]));
+    </script>
+</body>
+</html>
+""")
+
+
+# Dashboard template, compiled once at startup
+DASHBOARD_TEMPLATE = app.jinja_env.from_string("""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Comic Panel Review - Dashboard</title>
+    <style>
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+            background: #1a1a1a;
+            color: #e0e0e0;
+            padding: 20px;
+            line-height: 1.6;
+        }
+
+        .header {
+            background: #2a2a2a;
+            padding: 20px;
+            border-radius: 8px;
+            margin-bottom: 30px;
+            border-left: 4px solid #4a9eff;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            gap: 20px;
+            flex-wrap: wrap;
+        }
+
+        .header h1 {
+            font-size: 28px;
+            color: #fff;
+        }
+
+        .totals {
+            color: #999;
+            font-size: 14px;
+        }
+
+        .next-button {
+            background: #4a9eff;
+            color: white;
+            padding: 12px 24px;
+            border-radius: 6px;
+            font-weight: 600;
+            font-size: 14px;
+            text-decoration: none;
+        }
+
+        .next-button:hover {
+            background: #3a8ee5;
+        }
+
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            background: #2a2a2a;
+            border-radius: 8px;
+            overflow: hidden;
+            font-size: 14px;
+        }
+
+        th, td {
+            padding: 10px 14px;
+            text-align: left;
+            border-bottom: 1px solid #333;
+        }
+
+        th {
+            background: #1f1f1f;
+            color: #999;
+            font-size: 12px;
+            text-transform: uppercase;
+        }
+
+        tr.attention {
+            background: #2d3540;
+        }
+
+        td a {
+            color: #4a9eff;
+            text-decoration: none;
+        }
+
+        .progress {
+            background: #333;
+            height: 8px;
+            border-radius: 4px;
+            overflow: hidden;
+            width: 120px;
+            display: inline-block;
+            vertical-align: middle;
+            margin-right: 8px;
+        }
+
+        .progress-bar {
+            background: #4a9eff;
+            height: 100%;
+        }
+
+        .status {
+            padding: 2px 10px;
+            border-radius: 10px;
+            font-size: 12px;
+            font-weight: 600;
+            background: #444;
+        }
+
+        .status-finalized { background: #22c55e; color: white; }
+        .status-ready { background: #4a9eff; color: white; }
+        .status-reviewing { background: #eab308; color: #1a1a1a; }
+        .status-generating { background: #a855f7; color: white; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <div>
+            <h1>Review Dashboard</h1>
+            <div class="totals">
+                {{ totals.finalized }}/{{ totals.pages }} pages finalized |
+                {{ totals.selected }}/{{ totals.panels }} panels selected |
+                {{ totals.variants }} variants awaiting review |
+                {{ totals.pending_jobs }} generation job{{ '' if totals.pending_jobs == 1 else 's' }} running
+            </div>
         </div>
+        {% if next_page %}
+        <a class="next-button" href="/page/{{ next_page.page_num }}">
+            Next: Page {{ next_page.page_num }} ({{ next_page.status }}) →
+        </a>
         {% endif %}
     </div>
-    {% endfor %}
+
+    <table>
+        <thead>
+            <tr>
+                <th>Page</th>
+                <th>Title</th>
+                <th>Variants</th>
+                <th>Selected</th>
+                <th>Jobs</th>
+                <th>Status</th>
+            </tr>
+        </thead>
+        <tbody>
+            {% for page in pages %}
+            <tr class="{% if next_page and page.page_num == next_page.page_num %}attention{% endif %}">
+                <td><a href="/page/{{ page.page_num }}">{{ page.page_num }}</a></td>
+                <td>{{ page.title }}</td>
+                <td>{{ page.variants }}</td>
+                <td>
+                    <div class="progress">
+                        <div class="progress-bar" style="width: {{ (page.selected / page.panel_count * 100) if page.panel_count else 0 }}%"></div>
+                    </div>
+                    {{ page.selected }}/{{ page.panel_count }}
+                </td>
+                <td>{{ page.pending_jobs or '' }}</td>
+                <td><span class="status status-{{ page.status | replace(' ', '-') }}">{{ page.status }}</span></td>
+            </tr>
+            {% endfor %}
+        </tbody>
+    </table>
 
     <script>
-        function selectVariant(pageNum, panelNum, variantNum) {
-            fetch('/select/' + pageNum + '/' + panelNum + '/' + variantNum, {
-                method: 'POST'
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showMessage('Panel ' + panelNum + ' - Variant ' + variantNum + ' selected!');
-                    setTimeout(() => {
-                        location.reload();
-                    }, 800);
-                } else {
-                    alert('Error: ' + data.error);
-                }
-            })
-            .catch(error => {
-                alert('Error selecting variant: ' + error);
-            });
+        // Live updates: re-render the counts when the review state changes
+        let refreshTimer = null;
+        function refreshDashboard() {
+            clearTimeout(refreshTimer);
+            refreshTimer = setTimeout(() => {
+                fetch('/dashboard')
+                    .then(response => response.text())
+                    .then(html => {
+                        const fresh = new DOMParser().parseFromString(html, 'text/html');
+                        document.querySelector('.header').replaceWith(fresh.querySelector('.header'));
+                        document.querySelector('table').replaceWith(fresh.querySelector('table'));
+                    })
+                    .catch(() => {});
+            }, 300);
         }
 
-        function generateMore(pageNum, panelNum, skipConfirm = false) {
-            if (!skipConfirm && !confirm('Generate 3 more variants for panel ' + panelNum + '? This will call the OpenAI API (~50 seconds per variant).')) {
-                return;
-            }
+        const events = new EventSource('/events');
+        ['variant-created', 'selection-changed', 'page-finalized', 'job-progress'].forEach(type => {
+            events.addEventListener(type, refreshDashboard);
+        });
+        events.onopen = refreshDashboard;
+    </script>
+</body>
+</html>
+""")
 
-            // Add loading placeholders to the grid
-            const panelSection = document.getElementById('panel-' + panelNum);
-            const grid = panelSection.querySelector('.variants-grid');
 
-            // Add 3 loading placeholders
-            for (let i = 0; i < 3; i++) {
-                const placeholder = document.createElement('div');
-                placeholder.className = 'loading-placeholder';
-                grid.appendChild(placeholder);
-            }
+@app.route('/image/<path:filename>')
+def serve_image(filename):
+    """
+    Serve panel images.
 
-            showMessage('Generating 3 more variants for panel ' + panelNum + '...');
+    ?size=thumb or ?size=preview serves a cached WebP; ?size=full (the
+    default) the original PNG. Responses carry an ETag, and URLs whose ?v=
+    matches the current source hash are cacheable forever.
+    """
+    image_path = panel_image_path(filename)
+    if image_path is None:
+        return "Image not found", 404
 
-            fetch('/more/' + pageNum + '/' + panelNum, {
-                method: 'POST'
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showMessage('Generated ' + data.new_variants + ' new variants!');
-                    setTimeout(() => {
-                        location.reload();
-                    }, 1500);
-                } else {
-                    alert('Error: ' + data.error);
-                }
-            })
-            .catch(error => {
-                alert('Error generating variants: ' + error);
-                location.reload(); // Reload to remove placeholders
-            });
-        }
+    size = request.args.get('size', 'full')
+    if size != 'full' and size not in IMAGE_SIZES:
+        return f"Unknown size: {size}", 400
 
-        function previewPage(pageNum) {
-            const modal = document.getElementById('preview-modal');
-            const container = document.getElementById('preview-image-container');
-            const actions = document.getElementById('preview-actions');
+    digest = source_hash(image_path)
+    if size == 'full':
+        response = send_file(image_path, mimetype='image/png', conditional=True, etag=digest)
+    else:
+        response = send_file(cached_rendition(image_path, size).resolve(), mimetype='image/webp',
+                             conditional=True, etag=f"{digest}-{size}")
+    return set_image_cache_headers(response, digest)
 
-            modal.classList.add('active');
-            container.innerHTML = '<div class="loading"><div class="spinner"></div><p>Assembling page preview...</p></div>';
-            actions.style.display = 'none';
 
-            fetch('/preview/' + pageNum)
-                .then(response => response.blob())
-                .then(blob => {
-                    const url = URL.createObjectURL(blob);
-                    container.innerHTML = '<img src="' + url + '" alt="Page Preview">';
-                    actions.style.display = 'flex';
-                })
-                .catch(error => {
-                    container.innerHTML = '<p style="color: #ff6b6b;">Error generating preview: ' + error + '</p>';
-                });
-        }
+@app.route('/tiles/<name>.dzi')
+def zoom_descriptor(name):
+    """Deep Zoom descriptor of a panel image."""
+    image_path = panel_image_path(f"{name}.png")
+    if image_path is None:
+        return "Image not found", 404
 
-        function regeneratePanel(pageNum, panelNum) {
-            if (!confirm('Generate 3 more variants for Panel ' + panelNum + '?\\n\\n~50 seconds per variant (~2.5 minutes total)\\n\\nThis will close the preview and scroll to that panel.')) {
-                return;
-            }
+    digest = source_hash(image_path)
+    response = app.response_class(tile_pyramid.descriptor(image_path), mimetype='application/xml')
+    response.set_etag(digest)
+    return set_image_cache_headers(response.make_conditional(request), digest)
 
-            closePreview();
 
-            // Scroll to the panel section
-            setTimeout(() => {
-                const panelSection = document.getElementById('panel-' + panelNum);
-                if (panelSection) {
-                    panelSection.scrollIntoView({ behavior: 'smooth', block: 'center' });
-                }
-            }, 300);
+@app.route('/tiles/<name>_files/<int:level>/<int:col>_<int:row>.webp')
+def zoom_tile(name, level, col, row):
+    """One Deep Zoom tile of a panel image, built on first request."""
+    image_path = panel_image_path(f"{name}.png")
+    if image_path is None:
+        return "Image not found", 404
 
-            // Trigger generation (skip the second confirm since we already confirmed)
-            generateMore(pageNum, panelNum, true);
-        }
+    digest = source_hash(image_path)
+    try:
+        tile_file = tile_pyramid.tile(image_path, digest, level, col, row)
+    except ValueError as e:
+        return str(e), 404
+
+    response = send_file(tile_file.resolve(), mimetype='image/webp', conditional=True,
+                         etag=f"{digest}-{level}-{col}-{row}")
+    return set_image_cache_headers(response, digest)
+
+
+@app.route('/zoom/<int:page_num>/<int:panel_num>')
+def zoom_panel(page_num, panel_num):
+    """Zoom viewer for a panel's variants side by side (or its selected image)."""
+    variants = get_panel_variants(page_num, panel_num)
+    images = [
+        {'label': f"Variant {variant['num']}", 'name': variant['path'].stem,
+         'version': source_hash(variant['path']), 'full_url': variant['full_url']}
+        for variant in variants
+    ]
+    selected_path = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}.png"
+    if not images and selected_path.exists():
+        images.append({'label': 'Selected', 'name': selected_path.stem,
+                       'version': source_hash(selected_path),
+                       'full_url': image_urls(selected_path.name)['full']})
+    if not images:
+        return f"Error: No images for page {page_num} panel {panel_num}", 404
+
+    return render_template(ZOOM_TEMPLATE, page_num=page_num, panel_num=panel_num, images=images)
 
-        function closePreview() {
-            const modal = document.getElementById('preview-modal');
-            modal.classList.remove('active');
-        }
 
-        function showMessage(text) {
-            const existing = document.querySelector('.message');
-            if (existing) existing.remove();
+@app.route('/')
+def index():
+    """Redirect to page review."""
+    if current_page_num:
+        return redirect(url_for('review_page', page_num=current_page_num))
+    return redirect(url_for('dashboard'))
 
-            const msg = document.createElement('div');
-            msg.className = 'message';
-            msg.textContent = text;
-            document.body.appendChild(msg);
 
-            setTimeout(() => {
-                msg.style.opacity = '0';
-                msg.style.transform = 'translateX(400px)';
-                setTimeout(() => msg.remove(), 300);
-            }, 3000);
-        }
+def page_review_context(page_num, panel_nums=None):
+    """
+    Everything the review page and /api/page show for a page.
 
-        function navigatePage(pageNum) {
-            window.location.href = '/page/' + pageNum;
+    Args:
+        page_num: Page number
+        panel_nums: Only gather these panels (None for all); the counts
+            still cover the whole page
+    """
+    page_data = load_page_data(page_num)
+    selections = selection_store.for_page(page_num)
+
+    # Prepare panel data with variants
+    panels_with_variants = []
+    for panel in page_data['panels']:
+        panel_num = panel['panel_num']
+        if panel_nums is not None and panel_num not in panel_nums:
+            continue
+        variants = get_panel_variants(page_num, panel_num)
+        is_selected = get_panel_selection(page_num, panel_num)
+
+        selected_variant = selections.get(panel_num)
+        selected_image = image_urls(f"page-{page_num:03d}-panel-{panel_num}.png") if is_selected else None
+
+        panels_with_variants.append({
+            'panel': panel,
+            'variants': variants,
+            'is_selected': is_selected,
+            'selected_variant': selected_variant,
+            'selected_image': selected_image,
+            'total_variants': len(variants),
+            'pending_variants': pending_variants(page_num, panel_num)
+        })
+
+    return {
+        'page_num': page_num,
+        'page_data': page_data,
+        'panels_with_variants': panels_with_variants,
+        'selected_count': sum(1 for panel in page_data['panels']
+                              if get_panel_selection(page_num, panel['panel_num'])),
+        'total_pages': get_total_pages(),
+        'is_finalized': is_page_finalized(page_num)
+    }
+
+
+@app.route('/page/<int:page_num>')
+def review_page(page_num):
+    """Main review interface for a page."""
+    try:
+        context = page_review_context(page_num)
+    except FileNotFoundError as e:
+        return f"Error: {e}", 404
+
+    return render_template(
+        REVIEW_PAGE_TEMPLATE,
+        header_html=render_review_header(context),
+        panel_sections=[render_review_panel(context, item) for item in context['panels_with_variants']],
+        **context
+    )
+
+
+def render_review_header(context):
+    """Review page header (progress, preview and finalize buttons) for a page_review_context()."""
+    return Markup(REVIEW_HEADER_TEMPLATE.render(**context))
+
+
+def render_review_panel(context, item):
+    """Review page section for one panel of a page_review_context()."""
+    return Markup(REVIEW_PANEL_TEMPLATE.render(item=item, image_sizes=IMAGE_CARD_SIZES, **context))
+
+
+@app.route('/page/<int:page_num>/fragments')
+def review_page_fragments(page_num):
+    """
+    Header and panel sections of the review page as HTML, for live updates.
+
+    ?panels=1,3 limits the panels rendered (empty for just the header).
+    """
+    panels_arg = request.args.get('panels')
+    try:
+        panel_nums = None if panels_arg is None else {int(n) for n in panels_arg.split(',') if n}
+    except ValueError:
+        return jsonify({'success': False, 'error': f"Invalid panel list: {panels_arg}"}), 400
+
+    try:
+        context = page_review_context(page_num, panel_nums)
+    except FileNotFoundError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+
+    return jsonify({
+        'success': True,
+        'header': render_review_header(context),
+        'panels': {
+            item['panel']['panel_num']: render_review_panel(context, item)
+            for item in context['panels_with_variants']
         }
+    })
 
-        function finalizePage(pageNum) {
-            if (!confirm('Finalize page ' + pageNum + '? This will assemble the page and add it to the final comic.')) {
-                return;
+
+def next_review_page(page_num):
+    """First page after page_num with panels waiting for a choice (None if there is none)."""
+    return next(
+        (summary['page_num'] for summary in project_index.page_summaries()
+         if summary['page_num'] > page_num and summary['unreviewed']),
+        None
+    )
+
+
+def page_api_payload(context):
+    """/api/page response body for a page_review_context()."""
+    page_num = context['page_num']
+    page_data = context['page_data']
+    return {
+        'success': True,
+        'page_num': page_num,
+        'title': page_data.get('title', ''),
+        'panel_count': page_data['panel_count'],
+        'total_pages': context['total_pages'],
+        'selected_count': context['selected_count'],
+        'is_finalized': context['is_finalized'],
+        'next_review_page': next_review_page(page_num),
+        'panels': [
+            {
+                'panel_num': item['panel']['panel_num'],
+                'visual': item['panel'].get('visual', ''),
+                'dialogue': item['panel'].get('dialogue', ''),
+                'is_selected': item['is_selected'],
+                'selected_variant': item['selected_variant'],
+                'selected_image': item['selected_image'],
+                'pending_variants': item['pending_variants'],
+                'variants': [
+                    {key: variant[key] for key in ('num', 'url', 'preview_url', 'srcset', 'full_url')}
+                    for variant in item['variants']
+                ]
             }
+            for item in context['panels_with_variants']
+        ]
+    }
 
-            showMessage('Finalizing page ' + pageNum + '...');
 
-            fetch('/finalize/' + pageNum, {
-                method: 'POST'
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showMessage('✓ Page ' + pageNum + ' finalized and saved!');
-                    setTimeout(() => {
-                        location.reload();
-                    }, 1500);
-                } else {
-                    alert('Error finalizing page: ' + data.error);
-                }
-            })
-            .catch(error => {
-                alert('Error finalizing page: ' + error);
-            });
-        }
-    </script>
-</body>
-</html>
+@app.route('/api/page/<int:page_num>')
+def api_page(page_num):
+    """Review state of a page as JSON: panels, variant image URLs and selections."""
+    try:
+        context = page_review_context(page_num)
+    except FileNotFoundError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+
+    return jsonify(page_api_payload(context))
+
+
+@app.route('/rapid/<int:page_num>')
+def rapid_review(page_num):
+    """Keyboard review: one panel at a time, selections saved per page in one batch."""
+    try:
+        context = page_review_context(page_num)
+    except FileNotFoundError as e:
+        return f"Error: {e}", 404
+
+    return render_template(RAPID_REVIEW_TEMPLATE, page=page_api_payload(context))
+
+
+def page_status(summary):
+    """Where a page stands in the review workflow."""
+    if summary['finalized']:
+        return 'finalized'
+    if summary['pending_jobs']:
+        return 'generating'
+    if summary['panel_count'] and summary['selected'] >= summary['panel_count']:
+        return 'ready'
+    if summary['variants'] or summary['selected']:
+        return 'reviewing'
+    return 'not started'
+
+
+def dashboard_context():
+    """Progress of every page, from the project index (no per-panel filesystem probes)."""
+    with generation_jobs_lock:
+        pending = Counter(page_num for page_num, _ in generation_jobs)
+
+    pages = project_index.page_summaries()
+    for summary in pages:
+        summary['pending_jobs'] = pending.get(summary['page_num'], 0)
+        summary['status'] = page_status(summary)
+
+    # Pages waiting on the reviewer: variants to choose from, or ready to finalize
+    next_page = next((summary for summary in pages if summary['status'] in ('reviewing', 'ready')),
+                     next((summary for summary in pages if summary['status'] != 'finalized'), None))
+
+    totals = {
+        'pages': len(pages),
+        'panels': sum(summary['panel_count'] for summary in pages),
+        'variants': sum(summary['variants'] for summary in pages),
+        'selected': sum(summary['selected'] for summary in pages),
+        'finalized': sum(1 for summary in pages if summary['finalized']),
+        'pending_jobs': sum(pending.values()),
+    }
+    return {'pages': pages, 'totals': totals, 'next_page': next_page}
+
+
+@app.route('/dashboard')
+def dashboard():
+    """Review progress across the whole comic."""
+    return render_template(DASHBOARD_TEMPLATE, **dashboard_context())
+
+
+@app.route('/api/dashboard')
+def api_dashboard():
+    """Review progress across the whole comic as JSON."""
+    return jsonify({'success': True, **dashboard_context()})
+
+
+@app.route('/events')
+def events():
+    """
+    Server-sent event stream of review state changes.
+
+    Events: variant-created, selection-changed, page-finalized and
+    job-progress, each with a JSON body carrying page_num. ?page=N limits
+    the stream to one page.
     """
+    page_filter = request.args.get('page', type=int)
+    subscriber = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+    with event_subscribers_lock:
+        event_subscribers.add(subscriber)
+
+    def stream():
+        try:
+            yield f"retry: {EVENT_RETRY_MS}\n\n"
+            last_sent = time.monotonic()
+            while True:
+                try:
+                    event = subscriber.get(timeout=EVENT_POLL_INTERVAL)
+                except queue.Empty:
+                    # Without a watcher, notice files other processes wrote
+                    project_index.poll()
+                    if time.monotonic() - last_sent >= EVENT_KEEPALIVE:
+                        last_sent = time.monotonic()
+                        yield ": keepalive\n\n"
+                    continue
+
+                message = format_event(event, page_filter)
+                if message:
+                    last_sent = time.monotonic()
+                    yield message
+        finally:
+            with event_subscribers_lock:
+                event_subscribers.discard(subscriber)
+
+    return Response(stream(), mimetype='text/event-stream', headers=EVENT_STREAM_HEADERS)
+
+
+def format_event(event, page_filter=None):
+    """An event as a text/event-stream message ('' if filtered out)."""
+    event_id, event_type, data = event
+    if page_filter is not None and data.get('page_num') != page_filter:
+        return ''
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+class AsyncSubscriber:
+    """Event queue of an /events stream served on the async server's event loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+    def put_nowait(self, event):
+        # publish_event runs on request and watcher threads
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass  # Stalled client; it resynchronizes when it reconnects
+
+
+_event_poller = None
+
+
+async def poll_project_files():
+    """
+    One poller for every /events stream on the async server.
 
-    selected_count = sum(1 for item in panels_with_variants if item['is_selected'])
+    Without a watcher, notices files other processes wrote (reported as
+    events). The rescans read files, so they run on a worker thread and
+    never stall the event loop.
+    """
+    while True:
+        await asyncio.sleep(EVENT_POLL_INTERVAL)
+        with event_subscribers_lock:
+            listening = bool(event_subscribers)
+        if not listening:
+            continue
+        try:
+            await asyncio.to_thread(project_index.poll)
+        except Exception as e:
+            print(f"⚠ Warning: checking project files failed: {e}")
 
-    return render_template_string(
-        template,
-        page_num=page_num,
-        page_data=page_data,
-        panels_with_variants=panels_with_variants,
-        selected_count=selected_count,
-        total_pages=total_pages,
-        is_finalized=is_finalized
-    )
+
+def ensure_event_poller():
+    """Start the shared poller on the running event loop (once)."""
+    global _event_poller
+    if _event_poller is None or _event_poller.done():
+        _event_poller = asyncio.get_running_loop().create_task(poll_project_files())
+
+
+async def asgi_events(scope, receive, send):
+    """
+    /events on the async server.
+
+    Streams from the event loop, so open review tabs don't hold request
+    threads the way a WSGI generator would.
+    """
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    page_values = query.get('page', [])
+    page_filter = int(page_values[0]) if page_values and page_values[0].isdigit() else None
+
+    loop = asyncio.get_running_loop()
+    subscriber = AsyncSubscriber(loop)
+    with event_subscribers_lock:
+        event_subscribers.add(subscriber)
+    ensure_event_poller()
+
+    async def wait_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    disconnect = asyncio.ensure_future(wait_disconnect())
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', b'text/event-stream; charset=utf-8')] + [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in EVENT_STREAM_HEADERS.items()
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': f"retry: {EVENT_RETRY_MS}\n\n".encode(),
+                    'more_body': True})
+
+        last_sent = loop.time()
+        while True:
+            get = asyncio.ensure_future(subscriber.queue.get())
+            keepalive_due = last_sent + EVENT_KEEPALIVE - loop.time()
+            done, _ = await asyncio.wait({get, disconnect}, timeout=max(0, keepalive_due),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if get not in done:
+                get.cancel()
+                if disconnect in done:
+                    break
+                last_sent = loop.time()
+                await send({'type': 'http.response.body', 'body': b": keepalive\n\n", 'more_body': True})
+                continue
+
+            message = format_event(get.result(), page_filter)
+            if message:
+                last_sent = loop.time()
+                await send({'type': 'http.response.body', 'body': message.encode('utf-8'), 'more_body': True})
+    finally:
+        disconnect.cancel()
+        with event_subscribers_lock:
+            event_subscribers.discard(subscriber)
+
+
+def asgi_application():
+    """ASGI app for uvicorn: /events on the event loop, every other route on the Flask thread pool."""
+    wsgi = WSGIMiddleware(app, workers=REQUEST_THREADS)
+
+    async def application(scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == '/events':
+            await asgi_events(scope, receive, send)
+        else:
+            await wsgi(scope, receive, send)
+
+    return application
 
 
 @app.route('/select/<int:page_num>/<int:panel_num>/<int:variant_num>', methods=['POST'])
 def select_variant(page_num, panel_num, variant_num):
     """Select a variant and make it the final version."""
     try:
-        # Load selections
-        selections = load_selections()
+        apply_selections(page_num, {panel_num: variant_num})
+        return jsonify({'success': True})
 
-        # Source and destination paths
-        source = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}-v{variant_num}.png"
-        dest = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}.png"
+    except FileNotFoundError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-        if not source.exists():
-            return jsonify({'success': False, 'error': 'Variant file not found'}), 404
 
-        # Copy selected variant to final filename
-        shutil.copy(source, dest)
+@app.route('/select/<int:page_num>', methods=['POST'])
+def select_variants(page_num):
+    """
+    Select variants for several panels of a page at once.
 
-        # Delete unchosen variants (clean as you go)
-        variant_num_check = 1
-        while True:
-            variant_path = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}-v{variant_num_check}.png"
-            if not variant_path.exists():
-                break
-            if variant_num_check != variant_num:
-                variant_path.unlink()
-            variant_num_check += 1
+    Body: {"selections": [{"panel_num": 1, "variant_num": 2}, ...]}
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        choices = {
+            int(item['panel_num']): int(item['variant_num'])
+            for item in body.get('selections', [])
+        }
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Expected {"selections": [{"panel_num", "variant_num"}]}'}), 400
 
-        # Save selection
-        selections[f"{page_num}-{panel_num}"] = variant_num
-        save_selections(selections)
+    if not choices:
+        return jsonify({'success': False, 'error': 'No selections given'}), 400
 
-        return jsonify({'success': True})
+    try:
+        apply_selections(page_num, choices)
+        return jsonify({'success': True, 'selected': len(choices)})
 
+    except FileNotFoundError as e:
+        # Nothing was applied; name the panels whose variant is gone so clients can drop those choices
+        missing = [
+            panel_num for panel_num, variant_num in choices.items()
+            if not (PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}-v{variant_num}.png").exists()
+        ]
+        return jsonify({'success': False, 'error': str(e), 'missing': missing}), 404
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/preview/<int:page_num>')
 def preview_page(page_num):
-    """Generate a preview of the assembled page using simplified layout system."""
+    """
+    Preview of the assembled page as WebP.
+
+    Renders are cached by the hashes of the selected panels, so unchanged
+    pages are served from disk; the lossless render is kept for /finalize.
+    """
     try:
         # Load page data
         page_data = load_page_data(page_num)
-        panels = page_data['panels']
-
-        # Check if all panels have been selected
-        missing_panels = []
-        for panel in panels:
-            panel_file = PANELS_DIR / f"page-{page_num:03d}-panel-{panel['panel_num']}.png"
-            if not panel_file.exists():
-                missing_panels.append(panel['panel_num'])
+        panel_files, missing_panels = selected_panel_files(page_num, page_data['panels'])
 
         if missing_panels:
             return f"Error: Missing selected panels: {missing_panels}", 400
 
-        # Load panel images (all 1024x1536 portrait)
-        panel_images = []
-        for panel in panels:
-            panel_file = PANELS_DIR / f"page-{page_num:03d}-panel-{panel['panel_num']}.png"
-            if panel_file.exists():
-                panel_images.append(Image.open(panel_file))
-            else:
-                # Create placeholder if missing
-                placeholder = Image.new('RGB', (1024, 1536), 'gray')
-                panel_images.append(placeholder)
-
-        # Use simplified layout engine (same as assemble.py)
-        page_img = assemble_page_with_layout(
-            panels_data=panels,
-            panel_images=panel_images,
-            page_width=PAGE_WIDTH,
-            page_height=PAGE_HEIGHT
-        )
+        key = page_render_key(page_num, panel_files)
+        webp_file, png_file = page_render_files(page_num, key)
 
-        # Return image as response
-        img_io = io.BytesIO()
-        page_img.save(img_io, 'PNG')
-        img_io.seek(0)
+        if not webp_file.exists():
+            page_img, _ = render_page(key, panel_files)
+            write_atomic(webp_file, encode_image(page_img, 'webp', PREVIEW_QUALITY))
+            remove_stale_renders(page_num, key)
+            if not png_file.exists():
+                threading.Thread(target=save_lossless_render, args=(page_num, key, page_img),
+                                 daemon=True).start()
 
-        return send_file(img_io, mimetype='image/png')
+        response = send_file(webp_file.resolve(), mimetype='image/webp', conditional=True, etag=key)
+        response.cache_control.max_age = None
+        response.cache_control.no_cache = True
+        return response
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1004,7 +2812,14 @@ def preview_page(page_num):
 
 @app.route('/more/<int:page_num>/<int:panel_num>', methods=['POST'])
 def generate_more(page_num, panel_num):
-    """Generate 3 more variants for a panel."""
+    """
+    Start generating 3 more variants for a panel.
+
+    Returns 202 straight away; the generation runs on a background thread and
+    reports progress as job-progress events on /events.
+    """
+    job_key = (page_num, panel_num)
+    started = False
     try:
         # Load page data to get panel info
         page_data = load_page_data(page_num)
@@ -1013,20 +2828,23 @@ def generate_more(page_num, panel_num):
         if not panel_data:
             return jsonify({'success': False, 'error': 'Panel not found'}), 404
 
+        started = start_job(job_key, 3)
+        if not started:
+            return jsonify({'success': False, 'error': 'Variants are already being generated for this panel'}), 409
+
         # Delete the final selection if it exists (so user can re-select from new variants)
         final_file = PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}.png"
         if final_file.exists():
             final_file.unlink()
+            project_index.invalidate('panels')
+            prune_tiles()
 
         # Find the next available variant number
-        next_variant_num = 1
-        while (PANELS_DIR / f"page-{page_num:03d}-panel-{panel_num}-v{next_variant_num}.png").exists():
-            next_variant_num += 1
+        next_variant_num = max(project_index.variants(page_num, panel_num), default=0) + 1
 
         # Call generate.py to create more variants
         # This is a simplified approach - you could also import and call the async function directly
         # For now, we'll generate 3 more by manually running the generation
-        import asyncio
         from openai import AsyncOpenAI
         import base64
         import aiofiles
@@ -1058,16 +2876,31 @@ def generate_more(page_num, panel_num):
                     await f.write(image_bytes)
 
                 new_variants.append(variant_num)
+                project_index.update_file(filename)
+                advance_job(job_key)
 
             await client.close()
             return new_variants
 
-        # Run the async generation
-        new_variants = asyncio.run(generate_additional_variants())
+        def run_job():
+            error = None
+            try:
+                asyncio.run(generate_additional_variants())
+            except Exception as e:
+                error = str(e)
+            finally:
+                project_index.invalidate('panels')
+                finish_job(job_key, error)
 
-        return jsonify({'success': True, 'new_variants': len(new_variants)})
+        # Run the async generation off the request thread (a job on the dashboard,
+        # progress streamed to /events)
+        threading.Thread(target=run_job, name=f"generate-{page_num}-{panel_num}", daemon=True).start()
+
+        return jsonify({'success': True, 'started': 3}), 202
 
     except Exception as e:
+        if started:
+            finish_job(job_key, str(e))
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -1078,13 +2911,7 @@ def finalize_page(page_num):
         # Load page data
         page_data = load_page_data(page_num)
         panels = page_data['panels']
-
-        # Check if all panels have been selected
-        missing_panels = []
-        for panel in panels:
-            panel_file = PANELS_DIR / f"page-{page_num:03d}-panel-{panel['panel_num']}.png"
-            if not panel_file.exists():
-                missing_panels.append(panel['panel_num'])
+        panel_files, missing_panels = selected_panel_files(page_num, panels)
 
         if missing_panels:
             return jsonify({
@@ -1092,33 +2919,27 @@ def finalize_page(page_num):
                 'error': f'Missing selected panels: {missing_panels}'
             }), 400
 
-        # Load panel images
-        panel_images = []
-        for panel in panels:
-            panel_file = PANELS_DIR / f"page-{page_num:03d}-panel-{panel['panel_num']}.png"
-            if panel_file.exists():
-                panel_images.append(Image.open(panel_file))
-            else:
-                # Create placeholder if missing (shouldn't happen after check above)
-                placeholder = Image.new('RGB', (1024, 1536), 'gray')
-                panel_images.append(placeholder)
-
-        # Assemble page using layout engine
-        page_img = assemble_page_with_layout(
-            panels_data=panels,
-            panel_images=panel_images,
-            page_width=PAGE_WIDTH,
-            page_height=PAGE_HEIGHT
-        )
-
-        # Save assembled page
         PAGES_DIR.mkdir(parents=True, exist_ok=True)
         output_file = PAGES_DIR / f"page-{page_num:03d}.png"
-        page_img.save(output_file)
+
+        # Promote the render the reviewer previewed when the selections match
+        key = page_render_key(page_num, panel_files)
+        _, png_file = page_render_files(page_num, key)
+        promoted = png_file.exists()
+        if promoted:
+            shutil.copyfile(png_file, output_file)
+            rects = layout_rects(len(panels))
+        else:
+            page_img, rects = render_page(key, panel_files)
+            page_img.save(output_file)
+
+        write_page_layout(page_num, panels, rects)
+        project_index.invalidate('finalized')
 
         return jsonify({
             'success': True,
             'output_file': str(output_file),
+            'promoted': promoted,
             'message': f'Page {page_num} finalized and saved to {output_file.name}'
         })
 
@@ -1128,25 +2949,31 @@ def finalize_page(page_num):
 
 def main():
     """Main entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: python review.py <page_num>")
-        print("Example: python review.py 1")
-        sys.exit(1)
-
-    try:
-        page_num = int(sys.argv[1])
-    except ValueError:
-        print("Error: Page number must be an integer")
-        sys.exit(1)
+    # Without a page number, open the dashboard
+    page_num = None
+    if len(sys.argv) >= 2:
+        try:
+            page_num = int(sys.argv[1])
+        except ValueError:
+            print("Usage: python review.py [page_num]")
+            print("Error: Page number must be an integer")
+            sys.exit(1)
 
     global current_page_num
     current_page_num = page_num
+    init_project_state()
+    pruned = prune_tiles()
 
     # Check if page exists
-    try:
-        load_page_data(page_num)
-    except FileNotFoundError as e:
-        print(f"Error: {e}")
+    if page_num is not None:
+        try:
+            load_page_data(page_num)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            print("Run parse_script.py first to generate page JSON files")
+            sys.exit(1)
+    elif not project_index.page_numbers():
+        print("Error: No page files found")
         print("Run parse_script.py first to generate page JSON files")
         sys.exit(1)
 
@@ -1154,9 +2981,21 @@ def main():
     port = int(os.getenv('FLASK_PORT', 5001))
 
     print(f"\n{'='*60}")
-    print(f"COMIC PANEL REVIEW - PAGE {page_num}")
+    print(f"COMIC PANEL REVIEW - {f'PAGE {page_num}' if page_num is not None else 'DASHBOARD'}")
     print(f"{'='*60}")
-    print(f"\nOpening review interface at http://127.0.0.1:{port}")
+    if project_index.start_watching():
+        print("\n✓ Watching project files for changes")
+    else:
+        print("\n✓ Checking project files on each request (install 'watchdog' for inotify)")
+    if pruned:
+        print(f"✓ Removed zoom tiles of {pruned} deleted or replaced panel file(s)")
+    if uvicorn is not None:
+        print(f"✓ Async server (uvicorn), {REQUEST_THREADS} request threads, "
+              f"{RENDER_WORKERS} render worker(s)")
+    else:
+        print(f"✓ Threaded development server, {RENDER_WORKERS} render worker(s) "
+              "(install 'uvicorn' and 'a2wsgi' for the async server)")
+    print(f"Opening review interface at http://127.0.0.1:{port}")
     print("Press Ctrl+C to stop the server\n")
 
     # Open browser
@@ -1165,12 +3004,17 @@ def main():
     def open_browser():
         import time
         time.sleep(1)
-        webbrowser.open(f'http://127.0.0.1:{port}/page/{page_num}')
+        path = f'/page/{page_num}' if page_num is not None else '/dashboard'
+        webbrowser.open(f'http://127.0.0.1:{port}{path}')
 
     threading.Thread(target=open_browser, daemon=True).start()
 
     # Run Flask app
-    app.run(debug=False, port=port, host='127.0.0.1')
+    if uvicorn is not None:
+        uvicorn.run(asgi_application(), host='127.0.0.1', port=port,
+                    log_level='warning', timeout_graceful_shutdown=1)
+    else:
+        app.run(debug=False, port=port, host='127.0.0.1', threaded=True)
 
 
 if __name__ == "__main__":
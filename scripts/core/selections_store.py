@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Transactional store for selected panel variants.
+
+Selections live in SQLite (output/selections.db) in WAL mode, so concurrent
+reviewers (tabs, processes) never lose each other's writes and a crash can't
+leave a half-written file. A batch of selections commits as one
+transaction. The old output/selections.json is imported once.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS selections (
+    page_num INTEGER NOT NULL,
+    panel_num INTEGER NOT NULL,
+    variant_num INTEGER NOT NULL,
+    source TEXT NOT NULL DEFAULT 'review',
+    selected_at REAL NOT NULL,
+    PRIMARY KEY (page_num, panel_num)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Wait this long for another writer before failing
+BUSY_TIMEOUT_MS = 5000
+
+
+class SelectionStore:
+    """
+    Selected variant number per (page, panel).
+
+    Args:
+        db_path: SQLite database file
+        legacy_json: selections.json to import on first use (optional)
+    """
+
+    def __init__(self, db_path: Path, legacy_json: Optional[Path] = None):
+        self.db_path = db_path
+        self.local = threading.local()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        if legacy_json is not None:
+            self.import_json(legacy_json)
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection (sqlite3 connections aren't shared across threads)."""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000,
+                                   isolation_level=None)
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Write transaction, taken up front (BEGIN IMMEDIATE).
+
+        Holds the database write lock, so it also serializes whatever the
+        caller does inside it against other writers in any process.
+        """
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def import_json(self, json_path: Path) -> int:
+        """
+        Import a selections.json ({"page-panel": variant}) once; returns rows imported.
+
+        A truncated or corrupt file imports nothing and malformed entries are
+        skipped, with a warning, so a damaged legacy file never blocks startup.
+        """
+        with self.transaction() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'imported_json'").fetchone():
+                return 0
+            imported = 0
+            legacy = {}
+            if json_path.exists():
+                try:
+                    with open(json_path, 'r', encoding='utf-8') as f:
+                        legacy = json.load(f)
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    print(f"⚠ Warning: {json_path} is corrupt, not importing it ({e})")
+                if not isinstance(legacy, dict):
+                    print(f"⚠ Warning: {json_path} is not a selections object, not importing it")
+                    legacy = {}
+
+            now = time.time()
+            skipped = []
+            for key, variant_num in legacy.items():
+                try:
+                    page_num, panel_num = (int(part) for part in key.split('-'))
+                    variant_num = int(variant_num)
+                except (TypeError, ValueError):
+                    skipped.append(key)
+                    continue
+                # Keep anything already selected through the store
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO selections VALUES (?, ?, ?, 'import', ?)",
+                    (page_num, panel_num, variant_num, now)
+                )
+                imported += cursor.rowcount
+            if skipped:
+                print(f"⚠ Warning: skipped {len(skipped)} malformed entries in {json_path}: "
+                      f"{', '.join(map(str, skipped[:5]))}{'...' if len(skipped) > 5 else ''}")
+            conn.execute("INSERT INTO meta VALUES ('imported_json', ?)", (str(json_path),))
+            return imported
+
+    def select_many(self, items: Iterable[Tuple[int, int, int]], source: str = 'review',
+                    conn: Optional[sqlite3.Connection] = None):
+        """Record (page, panel, variant) selections atomically."""
+        rows = [(page, panel, variant, source, time.time()) for page, panel, variant in items]
+        sql = ("INSERT INTO selections VALUES (?, ?, ?, ?, ?) "
+               "ON CONFLICT (page_num, panel_num) DO UPDATE SET "
+               "variant_num = excluded.variant_num, source = excluded.source, "
+               "selected_at = excluded.selected_at")
+        if conn is not None:
+            conn.executemany(sql, rows)
+        else:
+            with self.transaction() as conn:
+                conn.executemany(sql, rows)
+
+    def for_page(self, page_num: int) -> Dict[int, int]:
+        """Selected variants of a page: {panel: variant}."""
+        rows = self.connection().execute(
+            "SELECT panel_num, variant_num FROM selections WHERE page_num = ?", (page_num,)
+        )
+        return dict(rows.fetchall())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Content-hashed asset names and the site's build manifest.
+
+Build steps write assets as name.<hash>.ext and record logical -> hashed
+paths (both relative to the site root) in data/asset-manifest.json, so the
+published files can be cached as immutable.
+"""
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict
+
+MANIFEST_NAME = "data/asset-manifest.json"
+HEADERS_NAME = "_headers"
+HASH_LENGTH = 10
+
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{%d}$' % HASH_LENGTH)
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "public, max-age=0, must-revalidate"
+
+
+def content_hash(data: bytes) -> str:
+    """Short SHA-256 digest used in file names."""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def is_hashed_name(path: Path) -> bool:
+    """True for files already named name.<hash>.ext."""
+    return bool(HASHED_NAME_RE.search(path.stem))
+
+
+def hashed_path(path: Path, data: bytes) -> Path:
+    """page-001.webp -> page-001.<hash>.webp"""
+    return path.with_name(f"{path.stem}.{content_hash(data)}{path.suffix}")
+
+
+def write_hashed(path: Path, data: bytes) -> Path:
+    """Write data under its content-hashed name and return that path."""
+    target = hashed_path(path, data)
+    if not target.exists():
+        target.write_bytes(data)
+    return target
+
+
+def load_asset_manifest(site_dir: Path) -> Dict[str, str]:
+    """Load the logical -> hashed path map (empty if not built yet)."""
+    manifest_file = site_dir / MANIFEST_NAME
+    if not manifest_file.exists():
+        return {}
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def update_asset_manifest(site_dir: Path, entries: Dict[str, str], prefixes=()) -> Dict[str, str]:
+    """
+    Merge entries into the manifest and write it atomically.
+
+    Existing entries under any of the given logical-path prefixes are
+    replaced wholesale, so assets a build step no longer produces drop out.
+    """
+    manifest = {
+        logical: hashed
+        for logical, hashed in load_asset_manifest(site_dir).items()
+        if not any(logical.startswith(prefix) for prefix in prefixes)
+    }
+    manifest.update(entries)
+
+    manifest_file = site_dir / MANIFEST_NAME
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = manifest_file.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, manifest_file)
+    return manifest
+
+
+def write_cache_headers(site_dir: Path, manifest: Dict[str, str]) -> Path:
+    """
+    Write a _headers file (Netlify / Cloudflare Pages format).
+
+    Hashed assets are immutable for a year; data files and the service
+    worker must revalidate.
+    """
+    lines = [
+        "/data/*",
+        f"  Cache-Control: {REVALIDATE_CACHE}",
+        "",
+        "/sw.js",
+        f"  Cache-Control: {REVALIDATE_CACHE}",
+        "",
+    ]
+    for hashed in sorted(set(manifest.values())):
+        lines.append(f"/{hashed}")
+        lines.append(f"  Cache-Control: {IMMUTABLE_CACHE}")
+
+    headers_file = site_dir / HEADERS_NAME
+    headers_file.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return headers_file
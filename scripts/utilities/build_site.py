@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Incremental builder for the docs/ detail pages.
+
+Renders character, NPC, monster and location pages through their compiled
+templates. Each output file depends on its entity's data, its kind's
+template and context code, the shared renderer and its gallery image's
+manifest record; those dependency hashes are kept in output/site-build-state.json
+so an edit only re-renders the pages it affects. Large rebuilds are rendered
+in a process pool.
+
+Usage:
+    python scripts/utilities/build_site.py              # Rebuild changed pages
+    python scripts/utilities/build_site.py --only npcs  # One kind
+    python scripts/utilities/build_site.py --force      # Rebuild everything
+"""
+
+import os
+import json
+import time
+import hashlib
+import inspect
+import argparse
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from optimize_gallery import load_gallery_manifest
+
+# Page kinds -> generator module (page_sources(), page_context() and a compiled *_PAGE template)
+PAGE_KINDS = {
+    'characters': ('generate_detail_pages', 'CHARACTER_PAGE'),
+    'npcs': ('generate_npc_pages', 'NPC_PAGE'),
+    'monsters': ('generate_monster_pages', 'MONSTER_PAGE'),
+    'locations': ('generate_location_pages', 'LOCATION_PAGE'),
+}
+
+BUILD_STATE = Path("output/site-build-state.json")
+
+# Bump when the builder changes in a way dependency hashes don't capture
+BUILDER_VERSION = 1
+
+# Below this many dirty pages, rendering in-process beats starting workers
+PARALLEL_THRESHOLD = 16
+
+RENDERER_FILES = ['site_templates.py', 'optimize_gallery.py']
+
+
+def generator(kind):
+    """Generator module for a page kind."""
+    return importlib.import_module(PAGE_KINDS[kind][0])
+
+
+def template(kind):
+    """Compiled template for a page kind."""
+    return getattr(generator(kind), PAGE_KINDS[kind][1])
+
+
+def content_hash(data) -> str:
+    """Short hash of JSON-serializable data or bytes."""
+    if not isinstance(data, bytes):
+        data = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def renderer_hash() -> str:
+    """Hash of the shared rendering code (markdown renderer, picture markup)."""
+    here = Path(__file__).parent
+    return content_hash(
+        [BUILDER_VERSION] + [(here / name).read_text(encoding='utf-8') for name in RENDERER_FILES]
+    )
+
+
+def kind_hash(kind) -> str:
+    """Hash of a kind's template and the code that fills it."""
+    return content_hash([template(kind).source, inspect.getsource(generator(kind).page_context)])
+
+
+def gallery_key(image_src: str) -> str:
+    """Gallery manifest key for an image referenced as '../images/...'."""
+    return image_src[image_src.index('images/'):] if 'images/' in image_src else image_src
+
+
+def dependency_graph(kinds: Iterable[str], gallery_manifest: Dict) -> Dict[str, Dict]:
+    """
+    Output file -> its page source and dependency hashes.
+
+    Returns:
+        {output path: {'kind', 'source', 'deps': {dependency: hash}}}
+    """
+    shared = renderer_hash()
+    graph = {}
+    for kind in kinds:
+        template_key = kind_hash(kind)
+        for source in generator(kind).page_sources():
+            deps = {
+                'renderer': shared,
+                f'template:{kind}': template_key,
+                f'entity:{kind}/{source.entity_id}': content_hash(source.data),
+            }
+            if source.image:
+                key = gallery_key(source.image)
+                deps[f'image:{key}'] = content_hash(gallery_manifest.get(key))
+            graph[source.output.as_posix()] = {'kind': kind, 'source': source, 'deps': deps}
+    return graph
+
+
+def load_state() -> Dict:
+    """Dependency hashes from the last build (empty if none)."""
+    if not BUILD_STATE.exists():
+        return {}
+    try:
+        with open(BUILD_STATE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return state.get('pages', {}) if state.get('version') == BUILDER_VERSION else {}
+
+
+def save_state(pages: Dict):
+    """Write dependency hashes atomically."""
+    BUILD_STATE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = BUILD_STATE.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'version': BUILDER_VERSION, 'pages': pages}, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, BUILD_STATE)
+
+
+@lru_cache(maxsize=1)
+def _worker_gallery_manifest():
+    return load_gallery_manifest()
+
+
+def render_page(kind, entity_id, data, gallery_manifest=None) -> str:
+    """Render one page to HTML (also the process pool entry point)."""
+    if gallery_manifest is None:
+        gallery_manifest = _worker_gallery_manifest()
+    return template(kind).render(generator(kind).page_context(entity_id, data, gallery_manifest))
+
+
+def write_page(output: Path, html: str) -> bool:
+    """Write a page unless it is byte-identical; returns whether it changed."""
+    if output.exists() and output.read_text(encoding='utf-8') == html:
+        return False
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(html, encoding='utf-8')
+    return True
+
+
+def build(kinds: Optional[List[str]] = None, force: bool = False, jobs: Optional[int] = None,
+          verbose: bool = True) -> Dict:
+    """
+    Rebuild the pages whose dependencies changed since the last build.
+
+    Args:
+        kinds: Page kinds to build (default: all)
+        force: Rebuild every page
+        jobs: Worker processes for large rebuilds (default: CPU count)
+        verbose: Print each rebuilt page and a summary
+
+    Returns:
+        {'built': [paths], 'unchanged': count, 'removed': [paths], 'seconds': float}
+    """
+    start = time.perf_counter()
+    kinds = list(kinds or PAGE_KINDS)
+    jobs = jobs or os.cpu_count() or 1
+
+    gallery_manifest = load_gallery_manifest()
+    graph = dependency_graph(kinds, gallery_manifest)
+    previous = load_state()
+
+    dirty = [
+        output for output, node in graph.items()
+        if force or previous.get(output) != node['deps'] or not Path(output).exists()
+    ]
+
+    jobs_args = [
+        (graph[output]['kind'], graph[output]['source'].entity_id, graph[output]['source'].data)
+        for output in dirty
+    ]
+    if len(dirty) >= PARALLEL_THRESHOLD and jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            rendered = list(executor.map(render_page, *zip(*jobs_args), chunksize=4))
+    else:
+        rendered = [render_page(*args, gallery_manifest) for args in jobs_args]
+
+    built = []
+    for output, html in zip(dirty, rendered):
+        write_page(Path(output), html)
+        built.append(output)
+        if verbose:
+            print(f"✓ Generated {output}")
+
+    # Pages this builder wrote before whose entity is gone
+    removed = []
+    for output, deps in previous.items():
+        kind = next((dep.split(':', 1)[1] for dep in deps if dep.startswith('template:')), None)
+        if kind in kinds and output not in graph:
+            Path(output).unlink(missing_ok=True)
+            removed.append(output)
+            if verbose:
+                print(f"✗ Removed {output}")
+
+    pages = {output: deps for output, deps in previous.items()
+             if output not in removed and output not in graph}
+    pages.update({output: node['deps'] for output, node in graph.items()})
+    save_state(pages)
+
+    result = {
+        'built': built,
+        'unchanged': len(graph) - len(dirty),
+        'removed': removed,
+        'seconds': time.perf_counter() - start,
+    }
+    if verbose:
+        print(f"\n✓ {len(built)} page(s) built, {result['unchanged']} unchanged "
+              f"({', '.join(kinds)}) in {result['seconds'] * 1000:.0f} ms")
+    return result
+
+
+def main():
+    """Build detail pages incrementally."""
+    parser = argparse.ArgumentParser(description='Build detail pages incrementally')
+    parser.add_argument('--only', action='append', choices=sorted(PAGE_KINDS),
+                        help='Page kind to build (repeatable; default: all)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every page even if unchanged since the last build')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    build(args.only, force=args.force, jobs=max(1, args.jobs))
+
+
+if __name__ == "__main__":
+    main()
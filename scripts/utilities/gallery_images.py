@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Gallery images of characters and locations.
+
+The one name -> portrait table for the site: generate_site_data.py writes
+each entry's image into characters.json/locations.json (which the gallery
+reads), and auto_review.py compares panels against the same portraits.
+Paths are site-relative (under docs/) and unhashed.
+"""
+
+# Character/NPC/monster name -> gallery image (site-relative, unhashed)
+CHARACTER_IMAGES = {
+    # Main party characters
+    'Val': 'images/characters/val-portrait.png',
+    'Prismor': 'images/characters/prismor-portrait.png',
+    'Apocalypse Winter': 'images/characters/apocalypse-winter-portrait.png',
+    'Lunara': 'images/characters/lunara-portrait.png',
+    'Malrik': 'images/characters/malrik-portrait.png',
+
+    # NPCs
+    'Sorrel - Halfling': 'images/npcs/sorrel-halfling-portrait.png',
+    'Sorrel (halfling disguise)': 'images/npcs/sorrel-halfling-portrait.png',
+    'Sorrel - Dragon Form': 'images/npcs/sorrel-dragon-portrait.png',
+    'Marge': 'images/npcs/marge-portrait.png',
+    'Barth': 'images/npcs/barth-portrait.png',
+    'Marivielle Greenbough': 'images/npcs/marivielle-portrait.png',
+    'Lord Alric': 'images/npcs/lord-alric-portrait.png',
+
+    # Monsters/Creatures
+    'Verdant Mephit': 'images/monsters/verdant-mephit.png',
+    'Gear Mephit': 'images/monsters/gear-mephit.png',
+    'Starlight Mephit': 'images/monsters/starlight-mephit.png',
+    'Blink Mephit': 'images/monsters/blink-mephit.png',
+    'Melody Mephit': 'images/monsters/melody-mephit.png',
+
+    # Background NPCs
+    'Fantasy Crowd': 'images/npcs/fantasy-crowd.png',
+    'Festival crowd': 'images/npcs/festival-crowd.png',
+    'Halfling courier': 'images/npcs/halfling-courier.png',
+    'Gambler': 'images/npcs/gambler.png',
+    'Well-dressed gambler': 'images/npcs/gambler.png',
+    'Race contestants': 'images/npcs/race-contestants.png',
+
+    # Other names the page scripts use
+    'Alric': 'images/npcs/lord-alric-portrait.png',
+    'Gear Mephit manifestations': 'images/monsters/gear-mephit.png'
+}
+
+
+def location_image(location_name):
+    """Gallery image for a location (same naming as generate_location_pages.py)."""
+    filename = location_name.lower().replace(' ', '_').replace("'", '')
+    return f"images/locations/{filename}.png"
@@ -4,9 +4,10 @@ Generate detailed HTML pages for characters, NPCs, and monsters
 with stats, backstories, and generated images.
 """
 
-import json
-import re
 from pathlib import Path
+from build_site import build
+from optimize_gallery import picture_html, PORTRAIT_SIZES
+from site_templates import PageSource, compile_template, markdown_to_html
 
 DOCS_DIR = Path("docs")
 CHAR_DIR = DOCS_DIR / "characters"
@@ -18,55 +19,6 @@ for dir_path in [CHAR_DIR, NPC_DIR, MONSTER_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
 
-def markdown_to_html(text):
-    """Convert simple markdown to HTML."""
-    if not text:
-        return ""
-
-    # Convert **bold** to <strong>
-    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-
-    # Split into lines
-    lines = text.split('\n')
-    html_lines = []
-    in_list = False
-    list_items = []
-
-    for line in lines:
-        stripped = line.strip()
-
-        # Handle list items
-        if stripped.startswith('- '):
-            if not in_list:
-                in_list = True
-                list_items = []
-            list_items.append(stripped[2:])  # Remove '- '
-        else:
-            # Close any open list
-            if in_list:
-                html_lines.append('<ul>')
-                for item in list_items:
-                    html_lines.append(f'<li>{item}</li>')
-                html_lines.append('</ul>')
-                in_list = False
-                list_items = []
-
-            # Add regular line
-            if stripped:
-                html_lines.append(stripped)
-            elif html_lines:  # Add line breaks for paragraph separation
-                html_lines.append('<br><br>')
-
-    # Close any remaining list
-    if in_list:
-        html_lines.append('<ul>')
-        for item in list_items:
-            html_lines.append(f'<li>{item}</li>')
-        html_lines.append('</ul>')
-
-    return '\n'.join(html_lines)
-
-
 # Character data from everpeak-complete-module
 CHARACTERS = {
     "val": {
@@ -254,14 +206,12 @@ He arrived hoping for acceptance away from the old prejudices of his homeland. N
 }
 
 
-def generate_character_page(char_id, char_data):
-    """Generate detailed character page HTML."""
-    html = f"""<!DOCTYPE html>
+CHARACTER_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{char_data['name']} - {char_data['title']}</title>
+    <title>{name} - {title}</title>
     <link rel="stylesheet" href="../css/main.css">
     <link rel="stylesheet" href="../css/detail-page.css">
 </head>
@@ -286,15 +236,15 @@ def generate_character_page(char_id, char_data):
 
         <div class="detail-header">
             <div class="portrait">
-                <img src="{char_data['image']}" alt="{char_data['name']}" onerror="this.src='../images/placeholder.png'">
+                {portrait}
             </div>
             <div class="header-info">
-                <h1>{char_data['name']}</h1>
-                <h2 class="subtitle">{char_data['title']}</h2>
+                <h1>{name}</h1>
+                <h2 class="subtitle">{title}</h2>
                 <div class="quick-stats">
-                    <span class="stat"><strong>Class:</strong> {char_data['class']}</span>
-                    <span class="stat"><strong>Race:</strong> {char_data['race']}</span>
-                    <span class="stat"><strong>Age:</strong> {char_data['age']}</span>
+                    <span class="stat"><strong>Class:</strong> {char_class}</span>
+                    <span class="stat"><strong>Race:</strong> {race}</span>
+                    <span class="stat"><strong>Age:</strong> {age}</span>
                 </div>
             </div>
         </div>
@@ -303,42 +253,42 @@ def generate_character_page(char_id, char_data):
             <section class="detail-section">
                 <h3>Background</h3>
                 <div class="section-content">
-                    <p>{char_data['background'].replace(chr(10) + chr(10), '</p><p>')}</p>
+                    <p>{background}</p>
                 </div>
             </section>
 
             <section class="detail-section">
                 <h3>Personality</h3>
                 <div class="section-content">
-                    <p>{char_data['personality']}</p>
+                    <p>{personality}</p>
                 </div>
             </section>
 
             <section class="detail-section">
                 <h3>Physical Appearance</h3>
                 <div class="section-content">
-                    <p>{char_data['physical']}</p>
+                    <p>{physical}</p>
                 </div>
             </section>
 
             <section class="detail-section">
                 <h3>Abilities & Traits</h3>
                 <div class="section-content abilities">
-                    {markdown_to_html(char_data['abilities'])}
+                    {abilities}
                 </div>
             </section>
 
             <section class="detail-section">
                 <h3>Equipment</h3>
                 <div class="section-content equipment">
-                    {markdown_to_html(char_data['equipment'])}
+                    {equipment}
                 </div>
             </section>
 
             <section class="detail-section player-info">
                 <h3>Player Information</h3>
                 <div class="section-content">
-                    {markdown_to_html(char_data['player_notes'])}
+                    {player_notes}
                 </div>
             </section>
         </div>
@@ -355,23 +305,47 @@ def generate_character_page(char_id, char_data):
 </body>
 </html>
 """
-    return html
 
+CHARACTER_PAGE = compile_template(CHARACTER_TEMPLATE)
+
+
+def page_context(char_id, char_data, manifest=None):
+    """Template fields for a character page."""
+    return {
+        'name': char_data['name'],
+        'title': char_data['title'],
+        'char_class': char_data['class'],
+        'race': char_data['race'],
+        'age': char_data['age'],
+        'background': char_data['background'].replace('\n\n', '</p><p>'),
+        'personality': char_data['personality'],
+        'physical': char_data['physical'],
+        'abilities': markdown_to_html(char_data['abilities']),
+        'equipment': markdown_to_html(char_data['equipment']),
+        'player_notes': markdown_to_html(char_data['player_notes']),
+        'portrait': picture_html(char_data['image'], char_data['name'], PORTRAIT_SIZES,
+                                 loading='eager', manifest=manifest),
+    }
 
-def main():
-    """Generate all detail pages."""
-    print("Generating character detail pages...")
 
-    for char_id, char_data in CHARACTERS.items():
-        output_file = CHAR_DIR / f"{char_id}.html"
-        html = generate_character_page(char_id, char_data)
+def page_sources():
+    """Every character page with its data, output file and portrait."""
+    return [
+        PageSource(char_id, char_data, CHAR_DIR / f"{char_id}.html", char_data['image'])
+        for char_id, char_data in CHARACTERS.items()
+    ]
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
 
-        print(f"✓ Generated {output_file}")
+def generate_character_page(char_id, char_data):
+    """Generate detailed character page HTML."""
+    return CHARACTER_PAGE.render(page_context(char_id, char_data))
+
+
+def main():
+    """Generate all character pages."""
+    print("Generating character detail pages...")
 
-    print(f"\n✓ Generated {len(CHARACTERS)} character pages")
+    build(['characters'])
 
 if __name__ == "__main__":
     main()
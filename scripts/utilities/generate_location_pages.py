@@ -5,6 +5,9 @@ Generate detailed HTML pages for locations with descriptions and scene images.
 
 import json
 from pathlib import Path
+from build_site import build
+from optimize_gallery import picture_html, LOCATION_SIZES
+from site_templates import PageSource, compile_template
 
 # Input and output paths
 LOCATIONS_JSON = Path("locations.json")
@@ -133,7 +136,7 @@ LOCATION_TEMPLATE = """<!DOCTYPE html>
             <h2 class="subtitle">{mood}</h2>
         </div>
 
-        <img src="{image}" alt="{name}" class="location-image" onerror="this.src='../images/placeholder.png'">
+        {image_html}
 
         <div class="detail-content">
             <section class="detail-section">
@@ -179,28 +182,49 @@ def get_filename(location_name):
     return location_name.lower().replace(' ', '_').replace("'", '')
 
 
-def generate_location_page(location_name, location_data, context):
-    """Generate HTML page for a location."""
+LOCATION_PAGE = compile_template(LOCATION_TEMPLATE)
+
+
+def location_image(location_name):
+    """Scene image for a location, as referenced from its page."""
+    return f"../images/locations/{get_filename(location_name)}.png"
+
+
+def page_context(location_name, data, manifest=None):
+    """Template fields for a location page (data: {'location': ..., 'context': ...})."""
+    context = data['context']
     features_html = "\n".join([f"<li>{feature}</li>" for feature in context['features']])
 
-    image_filename = get_filename(location_name)
+    return {
+        'name': location_name,
+        'mood': context['mood'],
+        'description': data['location']['full_description'],
+        'significance': context['significance'],
+        'features_html': features_html,
+        'image_html': picture_html(location_image(location_name), location_name, LOCATION_SIZES,
+                                   css_class="location-image", loading='eager', manifest=manifest),
+    }
 
-    html = LOCATION_TEMPLATE.format(
-        name=location_name,
-        mood=context['mood'],
-        description=location_data['full_description'],
-        significance=context['significance'],
-        features_html=features_html,
-        image=f"../images/locations/{image_filename}.png"
-    )
 
-    output_filename = f"{image_filename}.html"
-    output_path = OUTPUT_DIR / output_filename
+def page_sources():
+    """Every location page (locations with context only) with its data, output file and image."""
+    return [
+        PageSource(
+            location_name,
+            {'location': location_data, 'context': LOCATION_CONTEXT[location_name]},
+            OUTPUT_DIR / f"{get_filename(location_name)}.html",
+            location_image(location_name),
+        )
+        for location_name, location_data in LOCATIONS.items()
+        if location_name in LOCATION_CONTEXT
+    ]
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
 
-    print(f"✓ Generated {output_path}")
+def generate_location_page(location_name, location_data, context):
+    """Generate HTML page for a location."""
+    return LOCATION_PAGE.render(
+        page_context(location_name, {'location': location_data, 'context': context})
+    )
 
 
 def main():
@@ -208,16 +232,11 @@ def main():
     print("Generating Location Detail Pages")
     print("=" * 60)
 
-    for location_name, location_data in LOCATIONS.items():
-        if location_name in LOCATION_CONTEXT:
-            context = LOCATION_CONTEXT[location_name]
-            generate_location_page(location_name, location_data, context)
-        else:
+    for location_name in LOCATIONS:
+        if location_name not in LOCATION_CONTEXT:
             print(f"⚠ Skipping {location_name} - no context data")
 
-    print("\n" + "=" * 60)
-    print(f"✓ Generated {len(LOCATION_CONTEXT)} location pages")
-    print(f"Output: {OUTPUT_DIR}/")
+    build(['locations'])
 
 
 if __name__ == "__main__":
@@ -3,65 +3,16 @@
 Generate detailed HTML pages for monsters with D&D 5e stat blocks.
 """
 
-import re
 from pathlib import Path
+from build_site import build
+from optimize_gallery import picture_html, PORTRAIT_SIZES
+from site_templates import PageSource, compile_template, markdown_to_html
 
 # Output directory
 OUTPUT_DIR = Path("docs/monsters")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def markdown_to_html(text):
-    """Convert simple markdown to HTML."""
-    if not text:
-        return ""
-
-    # Convert **bold** to <strong>
-    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-
-    # Replace <br> tags with newlines for processing
-    text = text.replace('<br>', '\n')
-
-    # Split into lines
-    lines = text.split('\n')
-    html_lines = []
-    in_list = False
-    list_items = []
-
-    for line in lines:
-        stripped = line.strip()
-
-        # Handle list items
-        if stripped.startswith('- '):
-            if not in_list:
-                in_list = True
-                list_items = []
-            list_items.append(stripped[2:])  # Remove '- '
-        else:
-            # Close any open list
-            if in_list:
-                html_lines.append('<ul>')
-                for item in list_items:
-                    html_lines.append(f'<li>{item}</li>')
-                html_lines.append('</ul>')
-                in_list = False
-                list_items = []
-
-            # Add regular line
-            if stripped:
-                html_lines.append(stripped)
-            elif html_lines:  # Add line breaks for paragraph separation
-                html_lines.append('<br><br>')
-
-    # Close any remaining list
-    if in_list:
-        html_lines.append('<ul>')
-        for item in list_items:
-            html_lines.append(f'<li>{item}</li>')
-        html_lines.append('</ul>')
-
-    return '\n'.join(html_lines)
-
 # Monster data extracted from everpeak-complete-module.md
 MONSTERS = {
     "verdant_mephit": {
@@ -331,7 +282,7 @@ MONSTER_TEMPLATE = """<!DOCTYPE html>
 
         <div class="detail-header">
             <div class="portrait">
-                <img src="{image}" alt="{name}" onerror="this.src='../images/placeholder.png'">
+                {portrait}
             </div>
             <div class="header-info">
                 <h1>{name}</h1>
@@ -402,34 +353,46 @@ MONSTER_TEMPLATE = """<!DOCTYPE html>
 """
 
 
+MONSTER_PAGE = compile_template(MONSTER_TEMPLATE)
+
+
+def page_context(monster_id, monster_data, manifest=None):
+    """Template fields for a monster page."""
+    stats = monster_data['stats']
+    return {
+        'name': monster_data['name'],
+        'title': monster_data['title'],
+        'type_str': monster_data['type'],
+        'cr': monster_data['cr'],
+        'ac': stats['AC'],
+        'hp': stats['HP'],
+        'speed': stats['Speed'],
+        'str': stats['STR'],
+        'dex': stats['DEX'],
+        'con': stats['CON'],
+        'int': stats['INT'],
+        'wis': stats['WIS'],
+        'cha': stats['CHA'],
+        'features': monster_data['features'],
+        'description': monster_data['description'],
+        'abilities': markdown_to_html(monster_data['abilities']),
+        'tactics': monster_data['tactics'],
+        'portrait': picture_html(monster_data['image'], monster_data['name'], PORTRAIT_SIZES,
+                                 loading='eager', manifest=manifest),
+    }
+
+
+def page_sources():
+    """Every monster page with its data, output file and portrait."""
+    return [
+        PageSource(monster_id, monster_data, OUTPUT_DIR / f"{monster_id}.html", monster_data['image'])
+        for monster_id, monster_data in MONSTERS.items()
+    ]
+
+
 def generate_monster_page(monster_id, monster_data):
     """Generate HTML page for a monster."""
-    html = MONSTER_TEMPLATE.format(
-        name=monster_data['name'],
-        title=monster_data['title'],
-        type_str=monster_data['type'],
-        cr=monster_data['cr'],
-        ac=monster_data['stats']['AC'],
-        hp=monster_data['stats']['HP'],
-        speed=monster_data['stats']['Speed'],
-        str=monster_data['stats']['STR'],
-        dex=monster_data['stats']['DEX'],
-        con=monster_data['stats']['CON'],
-        int=monster_data['stats']['INT'],
-        wis=monster_data['stats']['WIS'],
-        cha=monster_data['stats']['CHA'],
-        features=monster_data['features'],
-        description=monster_data['description'],
-        abilities=markdown_to_html(monster_data['abilities']),
-        tactics=monster_data['tactics'],
-        image=monster_data['image']
-    )
-
-    output_path = OUTPUT_DIR / f"{monster_id}.html"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
-
-    print(f"✓ Generated {output_path}")
+    return MONSTER_PAGE.render(page_context(monster_id, monster_data))
 
 
 def main():
@@ -437,12 +400,7 @@ def main():
     print("Generating Monster Stat Pages")
     print("=" * 60)
 
-    for monster_id, monster_data in MONSTERS.items():
-        generate_monster_page(monster_id, monster_data)
-
-    print("\n" + "=" * 60)
-    print(f"✓ Generated {len(MONSTERS)} monster pages")
-    print(f"Output: {OUTPUT_DIR}/")
+    build(['monsters'])
 
 
 if __name__ == "__main__":
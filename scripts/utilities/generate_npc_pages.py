@@ -3,66 +3,16 @@
 Generate detailed HTML pages for NPCs with backgrounds and stats.
 """
 
-import re
 from pathlib import Path
+from build_site import build
+from optimize_gallery import picture_html, PORTRAIT_SIZES
+from site_templates import PageSource, compile_template, markdown_to_html
 
 # Output directory
 OUTPUT_DIR = Path("docs/npcs")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def markdown_to_html(text):
-    """Convert simple markdown to HTML."""
-    if not text:
-        return ""
-
-    # Convert **bold** to <strong>
-    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-
-    # Replace <br> tags with newlines for processing
-    text = text.replace('<br>', '\n')
-
-    # Split into lines
-    lines = text.split('\n')
-    html_lines = []
-    in_list = False
-    list_items = []
-
-    for line in lines:
-        stripped = line.strip()
-
-        # Handle list items
-        if stripped.startswith('- '):
-            if not in_list:
-                in_list = True
-                list_items = []
-            list_items.append(stripped[2:])  # Remove '- '
-        else:
-            # Close any open list
-            if in_list:
-                html_lines.append('<ul>')
-                for item in list_items:
-                    html_lines.append(f'<li>{item}</li>')
-                html_lines.append('</ul>')
-                in_list = False
-                list_items = []
-
-            # Add regular line
-            if stripped:
-                html_lines.append(stripped)
-            elif html_lines:  # Add line breaks for paragraph separation
-                html_lines.append('<br><br>')
-
-    # Close any remaining list
-    if in_list:
-        html_lines.append('<ul>')
-        for item in list_items:
-            html_lines.append(f'<li>{item}</li>')
-        html_lines.append('</ul>')
-
-    return '\n'.join(html_lines)
-
-
 # NPC data extracted from everpeak-complete-module.md
 NPCS = {
     "sorrel_halfling": {
@@ -170,7 +120,7 @@ NPC_TEMPLATE = """<!DOCTYPE html>
 
         <div class="detail-header">
             <div class="portrait">
-                <img src="{image}" alt="{name}" onerror="this.src='../images/placeholder.png'">
+                {portrait}
             </div>
             <div class="header-info">
                 <h1>{name}</h1>
@@ -233,26 +183,37 @@ NPC_TEMPLATE = """<!DOCTYPE html>
 """
 
 
-def generate_npc_page(npc_id, npc_data):
-    """Generate HTML page for an NPC."""
-    html = NPC_TEMPLATE.format(
-        name=npc_data['name'],
-        title=npc_data['title'],
-        race=npc_data['race'],
-        age=npc_data['age'],
-        background=npc_data['background'],
-        personality=npc_data['personality'],
-        appearance=npc_data['appearance'],
-        role_abilities=markdown_to_html(npc_data['role_abilities']),
-        equipment=markdown_to_html(npc_data['equipment']),
-        image=npc_data['image']
-    )
+NPC_PAGE = compile_template(NPC_TEMPLATE)
+
+
+def page_context(npc_id, npc_data, manifest=None):
+    """Template fields for an NPC page."""
+    return {
+        'name': npc_data['name'],
+        'title': npc_data['title'],
+        'race': npc_data['race'],
+        'age': npc_data['age'],
+        'background': npc_data['background'],
+        'personality': npc_data['personality'],
+        'appearance': npc_data['appearance'],
+        'role_abilities': markdown_to_html(npc_data['role_abilities']),
+        'equipment': markdown_to_html(npc_data['equipment']),
+        'portrait': picture_html(npc_data['image'], npc_data['name'], PORTRAIT_SIZES,
+                                 loading='eager', manifest=manifest),
+    }
 
-    output_path = OUTPUT_DIR / f"{npc_id}.html"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
 
-    print(f"✓ Generated {output_path}")
+def page_sources():
+    """Every NPC page with its data, output file and portrait."""
+    return [
+        PageSource(npc_id, npc_data, OUTPUT_DIR / f"{npc_id}.html", npc_data['image'])
+        for npc_id, npc_data in NPCS.items()
+    ]
+
+
+def generate_npc_page(npc_id, npc_data):
+    """Generate HTML page for an NPC."""
+    return NPC_PAGE.render(page_context(npc_id, npc_data))
 
 
 def main():
@@ -260,12 +221,7 @@ def main():
     print("Generating NPC Detail Pages")
     print("=" * 60)
 
-    for npc_id, npc_data in NPCS.items():
-        generate_npc_page(npc_id, npc_data)
-
-    print("\n" + "=" * 60)
-    print(f"✓ Generated {len(NPCS)} NPC pages")
-    print(f"Output: {OUTPUT_DIR}/")
+    build(['npcs'])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Generate the reader's service worker (docs/sw.js).
+
+The precache list (site shell and data files) and its version are computed
+at build time, so any change to a precached file produces a new sw.js and a
+clean cache swap. Content-hashed images are cached at runtime in reading
+order under an LRU byte budget; on activation, images no longer in the
+asset manifest are dropped. Other HTML pages visited are kept for offline
+reading in a cache that is cleared with each new version; other
+unhashed files are not cached.
+
+The top-level pages get their js/sw-register.js tag here too, so a site
+published without a generated sw.js never requests one.
+
+Run after optimize_for_web.py, optimize_gallery.py and generate_site_data.py.
+"""
+
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from image_formats import format_size, parse_size
+from asset_manifest import HASH_LENGTH, MANIFEST_NAME
+
+# Configuration
+SITE_DIR = Path("docs")
+SERVICE_WORKER = SITE_DIR / "sw.js"
+
+# Site-relative globs precached on install (the shell and its data)
+PRECACHE_PATTERNS = [
+    "*.html",
+    "css/*.css",
+    "js/*.js",
+    "data/pages.json",
+    "data/characters.json",
+    "data/locations.json",
+    "data/site-data.json",
+    MANIFEST_NAME,
+    "data/search/*.json",
+    "images/placeholder.png",
+]
+
+# Top-level pages that register the service worker
+REGISTER_PATTERN = "*.html"
+REGISTER_TAG = '<script src="js/sw-register.js"></script>'
+
+# Runtime image cache limit (evicts least recently used images beyond it)
+DEFAULT_IMAGE_BUDGET = "80MB"
+
+
+SERVICE_WORKER_TEMPLATE = """/**
+ * Everpeak Citadel service worker.
+ * Generated by scripts/utilities/generate_service_worker.py - do not edit.
+ */
+
+const VERSION = '__VERSION__';
+const PRECACHE = __PRECACHE__;
+const IMAGE_BUDGET = __IMAGE_BUDGET__;
+const ASSET_MANIFEST = '__ASSET_MANIFEST__';
+
+const SHELL_CACHE = `shell-${VERSION}`;
+const IMAGE_CACHE = 'images';
+const PAGE_CACHE = `pages-${VERSION}`;
+const LRU_KEY = '__lru__';
+
+// name.<hash>.ext - immutable, safe to serve from cache forever
+const HASHED_NAME = /\\.[0-9a-f]{__HASH_LENGTH__}\\.[a-z0-9]+$/;
+
+const scopeURL = new URL(self.registration.scope);
+
+function scopePath(url) {
+    return new URL(url, scopeURL).pathname.slice(scopeURL.pathname.length);
+}
+
+// ---------------------------------------------------------------------------
+// LRU index for the image cache: path -> {bytes, used}
+// Kept as a JSON entry in the cache itself; updates are serialized.
+// ---------------------------------------------------------------------------
+
+let lruQueue = Promise.resolve();
+
+function withLRU(update) {
+    lruQueue = lruQueue.then(async () => {
+        const cache = await caches.open(IMAGE_CACHE);
+        const stored = await cache.match(LRU_KEY);
+        const index = stored ? await stored.json() : {};
+        await update(cache, index);
+        await cache.put(LRU_KEY, new Response(JSON.stringify(index), {
+            headers: { 'Content-Type': 'application/json' }
+        }));
+    }).catch(error => console.warn('Image cache index update failed:', error));
+    return lruQueue;
+}
+
+async function evictOverBudget(cache, index) {
+    let total = Object.values(index).reduce((sum, entry) => sum + entry.bytes, 0);
+    const oldestFirst = Object.keys(index).sort((a, b) => index[a].used - index[b].used);
+    for (const path of oldestFirst) {
+        if (total <= IMAGE_BUDGET) break;
+        await cache.delete(new URL(path, scopeURL));
+        total -= index[path].bytes;
+        delete index[path];
+    }
+}
+
+function recordImage(path, bytes) {
+    return withLRU(async (cache, index) => {
+        index[path] = { bytes, used: Date.now() };
+        await evictOverBudget(cache, index);
+    });
+}
+
+function touchImage(path) {
+    return withLRU(async (cache, index) => {
+        if (index[path]) index[path].used = Date.now();
+    });
+}
+
+async function cacheImage(request) {
+    const response = await fetch(request);
+    if (response.ok && response.type === 'basic') {
+        const body = await response.clone().arrayBuffer();
+        const cache = await caches.open(IMAGE_CACHE);
+        await cache.put(request, response.clone());
+        recordImage(scopePath(request.url), body.byteLength);
+    }
+    return response;
+}
+
+// Drop cached images the current build no longer references
+function pruneImages(manifest) {
+    const live = new Set(Object.values(manifest));
+    return withLRU(async (cache, index) => {
+        for (const request of await cache.keys()) {
+            const path = scopePath(request.url);
+            if (path !== LRU_KEY && !live.has(path)) {
+                await cache.delete(request);
+                delete index[path];
+            }
+        }
+    });
+}
+
+// ---------------------------------------------------------------------------
+// Lifecycle
+// ---------------------------------------------------------------------------
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            .then(cache => cache.addAll(PRECACHE.map(path => new Request(path, { cache: 'reload' }))))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        // Previous versions' shell and visited pages
+        const names = await caches.keys();
+        await Promise.all(names
+            .filter(name => (name.startsWith('shell-') || name.startsWith('pages')) &&
+                name !== SHELL_CACHE && name !== PAGE_CACHE)
+            .map(name => caches.delete(name)));
+
+        const manifest = await caches.match(ASSET_MANIFEST, { cacheName: SHELL_CACHE });
+        if (manifest) {
+            await pruneImages(await manifest.json());
+        }
+        await self.clients.claim();
+    })());
+});
+
+// ---------------------------------------------------------------------------
+// Requests
+// ---------------------------------------------------------------------------
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin || !url.pathname.startsWith(scopeURL.pathname)) return;
+    const path = scopePath(url);
+
+    // Shell and data: precached for this version
+    const shellPath = path || 'index.html';
+    if (PRECACHE.includes(shellPath)) {
+        event.respondWith(
+            caches.match(shellPath, { cacheName: SHELL_CACHE })
+                .then(cached => cached || fetch(request))
+        );
+        return;
+    }
+
+    // Content-hashed images: cache first, fetched ones enter the LRU cache
+    if (HASHED_NAME.test(path)) {
+        event.respondWith(
+            caches.match(request, { cacheName: IMAGE_CACHE }).then(cached => {
+                if (cached) {
+                    touchImage(path);
+                    return cached;
+                }
+                return cacheImage(request);
+            })
+        );
+        return;
+    }
+
+    // Page navigations (detail pages): network first, cached for offline.
+    // Other unhashed files go straight to the network.
+    if (request.mode !== 'navigate') return;
+    event.respondWith(
+        fetch(request).then(response => {
+            if (response.ok && response.type === 'basic') {
+                const copy = response.clone();
+                caches.open(PAGE_CACHE).then(cache => cache.put(request, copy));
+            }
+            return response;
+        }).catch(() => caches.match(request, { cacheName: PAGE_CACHE })
+            .then(cached => cached || Response.error()))
+    );
+});
+
+// The reader sends the next pages' image URLs in reading order
+self.addEventListener('message', event => {
+    const data = event.data || {};
+    if (data.type !== 'warm' || !Array.isArray(data.urls)) return;
+
+    event.waitUntil((async () => {
+        for (const url of data.urls) {
+            const path = scopePath(url);
+            if (!HASHED_NAME.test(path)) continue;
+            if (await caches.match(url, { cacheName: IMAGE_CACHE })) continue;
+            try {
+                await cacheImage(new Request(url));
+            } catch (error) {
+                return; // Offline - stop warming
+            }
+        }
+    })());
+});
+"""
+
+
+def add_register_tags():
+    """Add the sw-register.js tag before </body> of each top-level page (once); returns pages changed."""
+    changed = []
+    for page in sorted(SITE_DIR.glob(REGISTER_PATTERN)):
+        html = page.read_text(encoding='utf-8')
+        if REGISTER_TAG in html or '</body>' not in html:
+            continue
+        head, tail = html.rsplit('</body>', 1)
+        page.write_text(f"{head.rstrip()}\n    {REGISTER_TAG}\n</body>{tail}", encoding='utf-8')
+        changed.append(page)
+    return changed
+
+
+def precache_files():
+    """Site-relative paths of the files to precache, sorted."""
+    files = set()
+    for pattern in PRECACHE_PATTERNS:
+        files.update(
+            path.relative_to(SITE_DIR).as_posix()
+            for path in SITE_DIR.glob(pattern)
+            if path.is_file()
+        )
+    return sorted(files)
+
+
+def precache_version(files, image_budget):
+    """Hash of every precached file's path and contents (plus the budget)."""
+    digest = hashlib.sha256(str(image_budget).encode('utf-8'))
+    for relative in files:
+        digest.update(relative.encode('utf-8'))
+        digest.update((SITE_DIR / relative).read_bytes())
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def render_service_worker(files, version, image_budget):
+    """Fill the service worker template."""
+    return (SERVICE_WORKER_TEMPLATE
+            .replace('__VERSION__', version)
+            .replace('__PRECACHE__', json.dumps(files, indent=4))
+            .replace('__IMAGE_BUDGET__', str(image_budget))
+            .replace('__ASSET_MANIFEST__', MANIFEST_NAME)
+            .replace('__HASH_LENGTH__', str(HASH_LENGTH)))
+
+
+def main():
+    """Write docs/sw.js."""
+    parser = argparse.ArgumentParser(description='Generate the reader service worker')
+    parser.add_argument('--image-budget', default=DEFAULT_IMAGE_BUDGET,
+                        help=f'Runtime image cache limit, e.g. 80MB (default: {DEFAULT_IMAGE_BUDGET})')
+    args = parser.parse_args()
+
+    image_budget = parse_size(args.image_budget)
+    # Before hashing: the tags are part of the precached pages
+    registered = add_register_tags()
+    files = precache_files()
+    version = precache_version(files, image_budget)
+
+    SERVICE_WORKER.write_text(render_service_worker(files, version, image_budget), encoding='utf-8')
+
+    precache_bytes = sum((SITE_DIR / relative).stat().st_size for relative in files)
+    print(f"✓ Wrote {SERVICE_WORKER} (version {version})")
+    print(f"  Precache: {len(files)} files, {format_size(precache_bytes)}")
+    print(f"  Image cache budget: {format_size(image_budget)}")
+    if registered:
+        print(f"  Registration added to: {', '.join(page.name for page in registered)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,53 @@
 #!/usr/bin/env python3
 """
 Generate metadata JSON files for the website.
-Creates pages.json with page navigation data and copies database files.
+Creates pages.json with page navigation data and copies database files,
+pointing every page image at its content-hashed name from the asset manifest
+and every gallery image at its hashed WebP/AVIF renditions, and embedding a tiny placeholder image for each page and gallery image.
+Data files are written minified with .gz/.br siblings, plus a site-data.json
+bundle of all three.
 """
 
 import json
-import shutil
+import argparse
 from pathlib import Path
+from PIL import Image
+from image_formats import make_placeholder
+from layout_engine import layout_rects, normalize_rects
+from search_index import build_search_index, write_search_index
+from precompress import write_compressed, print_size_report
+from gallery_images import CHARACTER_IMAGES, location_image
+from optimize_gallery import GALLERY_DIRS, find_sources, load_gallery_manifest, srcsets, fallback_rendition
+from asset_manifest import (
+    content_hash,
+    is_hashed_name,
+    update_asset_manifest,
+    write_cache_headers
+)
 
 # Configuration
 PAGES_JSON_DIR = Path("pages")
-OUTPUT_DATA_DIR = Path("site/data")
+ASSEMBLED_PAGES_DIR = Path("output/pages")
+SITE_DIR = Path("docs")
+OUTPUT_DATA_DIR = SITE_DIR / "data"
+IMAGE_MANIFEST = OUTPUT_DATA_DIR / "image-manifest.json"
+PLACEHOLDER_CACHE = OUTPUT_DATA_DIR / "placeholders.json"
 CHARACTERS_SOURCE = Path("characters.json")
 LOCATIONS_SOURCE = Path("locations.json")
 
+# Bundle of pages, characters and locations (one request on first load)
+SITE_DATA_BUNDLE = OUTPUT_DATA_DIR / "site-data.json"
+
+# Directories stripped from page paths in the packed pages.json
+PACKED_PAGE_DIRS = {
+    'pages': "images/pages/",
+    'thumbnails': "images/thumbnails/",
+}
+PACKED_PAGES_VERSION = 1
+
+# Fallback <img> width for gallery cards (cards are at most ~400px wide)
+CARD_WIDTH = 640
+
 
 def get_unique_characters(page_data):
     """Extract unique characters from all panels."""
@@ -45,9 +79,77 @@ def get_locations(page_data):
     return sorted(list(locations))
 
 
+def load_image_manifest():
+    """Load the manifest written by optimize_for_web.py (empty if not built yet)."""
+    if not IMAGE_MANIFEST.exists():
+        print(f"⚠ Warning: {IMAGE_MANIFEST} not found, pages will have no responsive renditions")
+        return {'pages': {}}
+    with open(IMAGE_MANIFEST, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def add_image_metadata(entry, page_num, image_manifest):
+    """Add intrinsic size, per-format srcset strings and the thumbnail sprite cell."""
+    record = image_manifest.get('pages', {}).get(f"page-{page_num:03d}")
+    if not record:
+        return entry
+
+    page_output = record['outputs']['page']
+    entry['image'] = page_output['path']
+    entry['thumbnail'] = record['outputs']['thumbnail']['path']
+    entry['width'] = page_output['width']
+    entry['height'] = page_output['height']
+    if record.get('placeholder'):
+        entry['placeholder'] = record['placeholder']
+
+    srcset = {}
+    for rendition in sorted(record.get('renditions', []), key=lambda r: r['width']):
+        srcset.setdefault(rendition['format'], []).append(
+            f"{rendition['path']} {rendition['width']}w"
+        )
+    if srcset:
+        entry['srcset'] = {fmt: ', '.join(candidates) for fmt, candidates in srcset.items()}
+
+    sprites = image_manifest.get('sprites')
+    cell = sprites and sprites['cells'].get(f"page-{page_num:03d}")
+    if cell:
+        sheet = sprites['sheets'][cell['sheet']]
+        entry['sprite'] = {
+            'sheet': sheet['path'],
+            'sheet_width': sheet['width'],
+            'sheet_height': sheet['height'],
+            'x': cell['x'],
+            'y': cell['y'],
+            'width': cell['width'],
+            'height': cell['height'],
+        }
+
+    return entry
+
+
+def panel_geometry(page_num, num_panels):
+    """
+    Panel rectangles as fractions of the page, in reading order.
+
+    Read from the layout file assemble.py writes next to each page; pages
+    assembled before those existed fall back to the layout engine's geometry
+    for their panel count.
+    """
+    layout_file = ASSEMBLED_PAGES_DIR / f"page-{page_num:03d}.layout.json"
+    if layout_file.exists():
+        with open(layout_file, 'r', encoding='utf-8') as f:
+            layout = json.load(f)
+        return normalize_rects(layout['panels'], layout['width'], layout['height'])
+
+    if not num_panels:
+        return []
+    return normalize_rects(layout_rects(num_panels))
+
+
 def generate_pages_metadata():
     """Generate pages.json with navigation metadata."""
     pages = []
+    image_manifest = load_image_manifest()
 
     # Check for cover.json first
     cover_file = PAGES_JSON_DIR / "cover.json"
@@ -55,7 +157,7 @@ def generate_pages_metadata():
         with open(cover_file, 'r', encoding='utf-8') as f:
             page_data = json.load(f)
 
-        pages.append({
+        pages.append(add_image_metadata({
             "page": 0,
             "title": page_data.get('title', 'Cover'),
             "panel_count": page_data.get('panel_count', 1),
@@ -64,8 +166,9 @@ def generate_pages_metadata():
             "image": "images/pages/page-000.webp",
             "thumbnail": "images/thumbnails/page-000.webp",
             "characters": get_unique_characters(page_data),
-            "locations": get_locations(page_data)
-        })
+            "locations": get_locations(page_data),
+            "panels": panel_geometry(0, len(page_data.get('panels', [])))
+        }, 0, image_manifest))
 
     # Load all numbered page JSON files
     page_files = sorted(PAGES_JSON_DIR.glob("page-*.json"))
@@ -85,7 +188,7 @@ def generate_pages_metadata():
 
         is_cover = page_data.get('is_cover', False)
 
-        pages.append({
+        pages.append(add_image_metadata({
             "page": page_num,
             "title": page_data.get('title', f'Page {page_num}'),
             "panel_count": page_data.get('panel_count', 0),
@@ -94,8 +197,9 @@ def generate_pages_metadata():
             "image": f"images/pages/page-{page_num:03d}.webp",
             "thumbnail": f"images/thumbnails/page-{page_num:03d}.webp",
             "characters": get_unique_characters(page_data),
-            "locations": get_locations(page_data)
-        })
+            "locations": get_locations(page_data),
+            "panels": panel_geometry(page_num, len(page_data.get('panels', [])))
+        }, page_num, image_manifest))
 
     # Sort by page number
     pages.sort(key=lambda p: p['page'])
@@ -103,33 +207,234 @@ def generate_pages_metadata():
     return pages
 
 
-def copy_database_files():
-    """Copy character and location databases to site/data."""
+def load_page_scripts():
+    """Page script JSON for every page (cover.json stands in for a missing page 0)."""
+    scripts = {}
+    for page_file in sorted(PAGES_JSON_DIR.glob("page-*.json")):
+        with open(page_file, 'r', encoding='utf-8') as f:
+            page_data = json.load(f)
+        if page_data.get('page_num') is None:
+            try:
+                page_data['page_num'] = int(page_file.stem.split('-')[1])
+            except (IndexError, ValueError):
+                continue
+        scripts[page_data['page_num']] = page_data
+
+    cover_file = PAGES_JSON_DIR / "cover.json"
+    if 0 not in scripts and cover_file.exists():
+        with open(cover_file, 'r', encoding='utf-8') as f:
+            scripts[0] = {**json.load(f), 'page_num': 0}
+
+    return [scripts[page_num] for page_num in sorted(scripts)]
+
+
+def record_gallery_renditions(gallery_manifest):
+    """
+    Record the hashed renditions from optimize_gallery.py in the asset manifest.
+
+    The PNG originals are not fingerprinted: gallery data points at the
+    renditions, so hashed PNG copies left by earlier builds are removed.
+
+    Returns the updated asset manifest (logical -> hashed).
+    """
+    entries = {
+        rendition['logical']: rendition['path']
+        for record in gallery_manifest.values()
+        for rendition in record['renditions']
+    }
+    removed = 0
+    for gallery_dir in GALLERY_DIRS:
+        directory = SITE_DIR / gallery_dir
+        if directory.exists():
+            for image_file in directory.glob("*.png"):
+                if is_hashed_name(image_file):
+                    image_file.unlink()
+                    removed += 1
+
+    print(f"✓ Recorded {len(entries)} gallery renditions"
+          + (f" (removed {removed} hashed PNG copies)" if removed else ""))
+    return update_asset_manifest(SITE_DIR, entries, prefixes=tuple(d + "/" for d in GALLERY_DIRS))
+
+
+def gallery_placeholders(gallery_manifest):
+    """
+    Placeholder data URIs for gallery images, keyed by logical path.
+
+    Taken from the gallery manifest where optimize_gallery.py has run;
+    otherwise cached by content hash in placeholders.json so unchanged
+    images are not decoded again.
+    """
+    cache = {}
+    if PLACEHOLDER_CACHE.exists():
+        with open(PLACEHOLDER_CACHE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+
+    placeholders = {}
+    fresh_cache = {}
+    computed = 0
+    for source in find_sources():
+        logical = source.relative_to(SITE_DIR).as_posix()
+        if logical in gallery_manifest:
+            placeholders[logical] = gallery_manifest[logical]['placeholder']
+            continue
+        digest = content_hash(source.read_bytes())
+        if digest not in cache:
+            with Image.open(source) as img:
+                cache[digest] = make_placeholder(img)
+            computed += 1
+        fresh_cache[digest] = cache[digest]
+        placeholders[logical] = cache[digest]
+
+    OUTPUT_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(PLACEHOLDER_CACHE, 'w', encoding='utf-8') as f:
+        json.dump(fresh_cache, f, indent=2, sort_keys=True)
+
+    print(f"✓ Gallery placeholders: {len(placeholders)} ({computed} computed, "
+          f"{len(placeholders) - computed} cached)")
+    return placeholders
+
+
+def write_json(data, output_file):
+    """Write a site data file (minified)."""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+    return output_file
+
+
+def strip_dir(path, directory):
+    """Path relative to directory (paths elsewhere are kept whole)."""
+    return path[len(directory):] if path.startswith(directory) else path
+
+
+def pack_pages(pages):
+    """
+    Compact pages.json: directory prefixes, sprite sheets and defaults written once.
+
+    reader.js (unpackPages) restores the entries generate_pages_metadata builds:
+    - image/srcset paths are relative to base.pages, thumbnail/sprite sheet
+      paths to base.thumbnails
+    - srcset is {format: [[file, width], ...]}
+    - sprite is [sheet index, x, y, width, height] into sheets ([path, width, height])
+    - panels are [x, y, width, height]
+    - is_spread/is_cover are omitted when false
+    """
+    pages_dir = PACKED_PAGE_DIRS['pages']
+    thumbs_dir = PACKED_PAGE_DIRS['thumbnails']
+    sheets = []
+    sheet_index = {}
+    packed = []
+
+    for page in pages:
+        entry = {
+            key: value for key, value in page.items()
+            if key not in ('srcset', 'sprite', 'panels')
+            and not (key in ('is_spread', 'is_cover') and value is False)
+        }
+        entry['image'] = strip_dir(page['image'], pages_dir)
+        entry['thumbnail'] = strip_dir(page['thumbnail'], thumbs_dir)
+
+        if page.get('srcset'):
+            entry['srcset'] = {
+                fmt: [
+                    [strip_dir(path, pages_dir), int(width.rstrip('w'))]
+                    for path, width in (candidate.rsplit(' ', 1) for candidate in srcset.split(', '))
+                ]
+                for fmt, srcset in page['srcset'].items()
+            }
+
+        sprite = page.get('sprite')
+        if sprite:
+            if sprite['sheet'] not in sheet_index:
+                sheet_index[sprite['sheet']] = len(sheets)
+                sheets.append([strip_dir(sprite['sheet'], thumbs_dir), sprite['sheet_width'], sprite['sheet_height']])
+            entry['sprite'] = [sheet_index[sprite['sheet']], sprite['x'], sprite['y'], sprite['width'], sprite['height']]
+
+        if page.get('panels'):
+            entry['panels'] = [[r['x'], r['y'], r['width'], r['height']] for r in page['panels']]
+
+        packed.append(entry)
+
+    return {
+        'v': PACKED_PAGES_VERSION,
+        'base': PACKED_PAGE_DIRS,
+        'sheets': sheets,
+        'pages': packed,
+    }
+
+
+def add_gallery_image(data, logical, placeholders, gallery_manifest):
+    """Point a database entry at its card-sized rendition (or the PNG, until built) and srcsets."""
+    record = gallery_manifest.get(logical)
+    card = record and fallback_rendition(record, max_width=CARD_WIDTH)
+    if card:
+        data['image'] = card['path']
+        data['width'] = record['width']
+        data['height'] = record['height']
+        data['srcset'] = srcsets(record)
+    elif (SITE_DIR / logical).exists():
+        data['image'] = logical
+    else:
+        return data
+    data['placeholder'] = placeholders.get(logical)
+    return data
+
+
+def copy_database_files(placeholders, gallery_manifest):
+    """Copy character and location databases to the site data directory.
+
+    Each entry with a gallery image gets an 'image' field holding its
+    card-sized rendition (or the PNG before optimize_gallery.py has run), per-format 'srcset' strings and a
+    'placeholder' data URI.
+
+    Returns the written databases by name ('characters', 'locations').
+    """
     OUTPUT_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    files_copied = []
+    databases = {}
 
     if CHARACTERS_SOURCE.exists():
-        shutil.copy(CHARACTERS_SOURCE, OUTPUT_DATA_DIR / "characters.json")
-        files_copied.append("characters.json")
+        with open(CHARACTERS_SOURCE, 'r', encoding='utf-8') as f:
+            characters = json.load(f)
+        for name, data in characters.items():
+            if name in CHARACTER_IMAGES:
+                add_gallery_image(data, CHARACTER_IMAGES[name], placeholders, gallery_manifest)
+        write_json(characters, OUTPUT_DATA_DIR / "characters.json")
+        databases['characters'] = characters
         print(f"✓ Copied {CHARACTERS_SOURCE} → {OUTPUT_DATA_DIR / 'characters.json'}")
     else:
         print(f"⚠ Warning: {CHARACTERS_SOURCE} not found")
 
     if LOCATIONS_SOURCE.exists():
-        shutil.copy(LOCATIONS_SOURCE, OUTPUT_DATA_DIR / "locations.json")
-        files_copied.append("locations.json")
+        with open(LOCATIONS_SOURCE, 'r', encoding='utf-8') as f:
+            locations = json.load(f)
+        for name, data in locations.items():
+            add_gallery_image(data, location_image(name), placeholders, gallery_manifest)
+        write_json(locations, OUTPUT_DATA_DIR / "locations.json")
+        databases['locations'] = locations
         print(f"✓ Copied {LOCATIONS_SOURCE} → {OUTPUT_DATA_DIR / 'locations.json'}")
     else:
         print(f"⚠ Warning: {LOCATIONS_SOURCE} not found")
 
-    return files_copied
+    return databases
 
 
 def main():
     """Main data generation process."""
+    parser = argparse.ArgumentParser(description='Generate site data files')
+    parser.add_argument('--no-bundle', action='store_true',
+                        help=f'Skip {SITE_DATA_BUNDLE.name} (pages, characters and locations in one file)')
+    args = parser.parse_args()
+
     print("Generating site metadata...\n")
 
+    # Gallery renditions (pages are fingerprinted by optimize_for_web.py)
+    gallery_manifest = load_gallery_manifest()
+    if not gallery_manifest:
+        print("⚠ Warning: no gallery renditions found, run optimize_gallery.py first")
+    asset_manifest = record_gallery_renditions(gallery_manifest)
+    placeholders = gallery_placeholders(gallery_manifest)
+    print()
+
     # Generate pages metadata
     pages_data = generate_pages_metadata()
 
@@ -138,8 +443,8 @@ def main():
 
     # Write pages.json
     output_file = OUTPUT_DATA_DIR / "pages.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(pages_data, f, indent=2)
+    packed_pages = pack_pages(pages_data)
+    write_json(packed_pages, output_file)
 
     print(f"✓ Generated {output_file}")
     print(f"  Pages: {len(pages_data)}")
@@ -165,12 +470,37 @@ def main():
 
     print()
 
+    # Search index (sharded by first letter, fetched on demand by search.js)
+    search_index = build_search_index(load_page_scripts())
+    shard_files = write_search_index(search_index, SITE_DIR)
+    print(f"✓ Search index: {len(search_index)} terms in {len(shard_files)} shards "
+          f"({sum(f.stat().st_size for f in shard_files) / 1024:.1f} KB)")
+    print()
+
     # Copy database files
-    copied = copy_database_files()
+    databases = copy_database_files(placeholders, gallery_manifest)
+    data_files = [output_file] + [OUTPUT_DATA_DIR / f"{name}.json" for name in databases]
+
+    if not args.no_bundle:
+        data_files.append(write_json({'pages': packed_pages, **databases}, SITE_DATA_BUNDLE))
+        print(f"✓ Bundled pages.json, {', '.join(f'{name}.json' for name in databases)} → {SITE_DATA_BUNDLE}")
+    elif SITE_DATA_BUNDLE.exists():
+        SITE_DATA_BUNDLE.unlink()
+
+    # Precompressed siblings and size report
+    print("\n✓ Precompressed data files:")
+    print_size_report(
+        [(f.relative_to(OUTPUT_DATA_DIR).as_posix(), write_compressed(f)) for f in data_files + shard_files]
+    )
+    print()
+
+    # Cache headers: hashed assets immutable, data files revalidated
+    headers_file = write_cache_headers(SITE_DIR, asset_manifest)
+    print(f"✓ Wrote {headers_file} ({len(set(asset_manifest.values()))} immutable assets)")
 
     print(f"\n✓ Site data generation complete!")
     print(f"  Output directory: {OUTPUT_DATA_DIR}")
-    print(f"  Files created: pages.json, {', '.join(copied)}")
+    print(f"  Files created: {', '.join(f.name for f in data_files)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Shared image encoding helpers.
+Encodes Pillow images to PNG, WebP, AVIF or JPEG with either a fixed quality
+or a per-image byte budget.
+"""
+
+import io
+import base64
+from typing import Optional, Tuple
+from PIL import Image
+
+try:
+    # Pillow < 11.3 needs the plugin package for AVIF support
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+
+# Format table: CLI name -> Pillow settings
+FORMATS = {
+    'png': {'pil': 'PNG', 'ext': 'png', 'mime': 'image/png', 'lossy': False},
+    'webp': {'pil': 'WEBP', 'ext': 'webp', 'mime': 'image/webp', 'lossy': True},
+    'avif': {'pil': 'AVIF', 'ext': 'avif', 'mime': 'image/avif', 'lossy': True},
+    'jpeg': {'pil': 'JPEG', 'ext': 'jpg', 'mime': 'image/jpeg', 'lossy': True},
+}
+
+DEFAULT_QUALITY = {
+    'webp': 88,
+    'avif': 70,
+    'jpeg': 90,
+}
+
+# Low-quality image placeholders (inlined into site data as data: URIs)
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 40
+
+# Quality search bounds for byte-target encoding
+MIN_QUALITY = 30
+MAX_QUALITY = 95
+
+
+def is_format_supported(fmt: str) -> bool:
+    """Check whether the installed Pillow can write the given format."""
+    if fmt not in FORMATS:
+        return False
+    Image.init()
+    return FORMATS[fmt]['pil'] in Image.SAVE
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size like '350000', '400KB' or '1.5MB'."""
+    text = value.strip().upper().replace(' ', '')
+    for suffix, factor in (('MB', 1024 * 1024), ('KB', 1024), ('B', 1)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
+
+
+def format_size(bytes_size: float) -> str:
+    """Format bytes to human-readable size."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if bytes_size < 1024.0:
+            return f"{bytes_size:.1f} {unit}"
+        bytes_size /= 1024.0
+    return f"{bytes_size:.1f} TB"
+
+
+def resize_to_width(img: Image.Image, max_width: Optional[int]) -> Image.Image:
+    """Downscale to max_width (keeping aspect ratio). Never upscales."""
+    if not max_width or img.width <= max_width:
+        return img
+    height = round(img.height * max_width / img.width)
+    return img.resize((max_width, height), Image.Resampling.LANCZOS)
+
+
+def encode_image(img: Image.Image, fmt: str, quality: Optional[int] = None) -> bytes:
+    """Encode an image to bytes in the given format."""
+    spec = FORMATS[fmt]
+    if fmt == 'jpeg' and img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    options = {}
+    if fmt == 'png':
+        options['optimize'] = True
+    elif fmt == 'webp':
+        options['quality'] = quality or DEFAULT_QUALITY['webp']
+        options['method'] = 6  # Best compression
+    elif fmt == 'avif':
+        options['quality'] = quality or DEFAULT_QUALITY['avif']
+        options['speed'] = 6
+    elif fmt == 'jpeg':
+        options['quality'] = quality or DEFAULT_QUALITY['jpeg']
+        options['optimize'] = True
+        options['progressive'] = True
+
+    buffer = io.BytesIO()
+    img.save(buffer, spec['pil'], **options)
+    return buffer.getvalue()
+
+
+def encode_to_target(img: Image.Image, fmt: str, target_bytes: int) -> Tuple[bytes, int]:
+    """
+    Encode at the highest quality that fits within target_bytes.
+
+    Binary-searches the quality setting. If even MIN_QUALITY is over budget,
+    the MIN_QUALITY encoding is returned.
+
+    Returns:
+        (encoded bytes, quality used)
+    """
+    if not FORMATS[fmt]['lossy']:
+        return encode_image(img, fmt), 0
+
+    low, high = MIN_QUALITY, MAX_QUALITY
+    best = None
+    while low <= high:
+        quality = (low + high) // 2
+        data = encode_image(img, fmt, quality)
+        if len(data) <= target_bytes:
+            best = (data, quality)
+            low = quality + 1
+        else:
+            high = quality - 1
+
+    if best is None:
+        best = (encode_image(img, fmt, MIN_QUALITY), MIN_QUALITY)
+    return best
+
+
+def make_placeholder(img: Image.Image, width: int = PLACEHOLDER_WIDTH) -> str:
+    """
+    Tiny WebP of the image as a data: URI, for painting while the real image loads.
+
+    Around 150-300 bytes; browsers smooth it when scaled up, giving a blur.
+    """
+    height = max(1, round(img.height * width / img.width))
+    tiny = img.convert('RGB').resize((width, height), Image.Resampling.BOX)
+    data = encode_image(tiny, 'webp', PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(data).decode('ascii')
@@ -7,7 +7,7 @@ All panels are 1024x1536 (portrait, 2:3 aspect ratio).
 
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFilter
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import random
 
 
@@ -74,17 +74,17 @@ def draw_panel_with_shadow(page_img: Image.Image, panel_img: Image.Image,
     page_img.paste(bordered_panel, (x, y))
 
 
-def layout_splash(page_img: Image.Image, panel_images: List[Image.Image]):
+def panel_rect(x: int, y: int, width: int, height: int) -> Dict:
+    """Pixel rectangle of a placed panel (border included) on the page."""
+    return {'x': x, 'y': y, 'width': width, 'height': height}
+
+
+def splash_rects() -> List[Dict]:
     """
-    Splash layout: Single panel fills entire page.
+    Splash geometry: Single panel fills entire page.
 
     Panel is centered and scaled to fit page while maintaining aspect ratio.
     """
-    if not panel_images:
-        return
-
-    panel = panel_images[0]
-
     # Calculate dimensions to fit panel in page (centered, maintain aspect ratio)
     available_width = PAGE_WIDTH - 2 * GUTTER
     available_height = PAGE_HEIGHT - 2 * GUTTER
@@ -106,12 +106,12 @@ def layout_splash(page_img: Image.Image, panel_images: List[Image.Image]):
     x = (PAGE_WIDTH - panel_width) // 2
     y = (PAGE_HEIGHT - panel_height) // 2
 
-    draw_panel_with_shadow(page_img, panel, x, y, panel_width, panel_height)
+    return [panel_rect(x, y, panel_width, panel_height)]
 
 
-def layout_2x2_grid(page_img: Image.Image, panel_images: List[Image.Image]):
+def grid_rects(count: int = 4) -> List[Dict]:
     """
-    2x2 Grid layout: 4 panels in a grid.
+    2x2 Grid geometry: up to 4 panels in reading order.
 
     Each panel maintains portrait 2:3 aspect ratio.
     Panels are evenly spaced with gutters.
@@ -135,7 +135,6 @@ def layout_2x2_grid(page_img: Image.Image, panel_images: List[Image.Image]):
         # Height is constraining, use it
         panel_width = ideal_width_from_height
 
-    # Draw panels in 2x2 grid
     positions = [
         (0, 0),  # Top-left
         (1, 0),  # Top-right
@@ -143,14 +142,69 @@ def layout_2x2_grid(page_img: Image.Image, panel_images: List[Image.Image]):
         (1, 1),  # Bottom-right
     ]
 
-    for i, panel in enumerate(panel_images[:4]):  # Max 4 panels
-        col, row = positions[i]
-        x = GUTTER + col * (panel_width + GUTTER)
-        y = GUTTER + row * (panel_height + GUTTER)
-        draw_panel_with_shadow(page_img, panel, x, y, panel_width, panel_height)
+    return [
+        panel_rect(GUTTER + col * (panel_width + GUTTER),
+                   GUTTER + row * (panel_height + GUTTER),
+                   panel_width, panel_height)
+        for col, row in positions[:min(count, 4)]  # Max 4 panels
+    ]
 
 
-def assemble_page_simple(panel_images: List[Image.Image], num_panels: int) -> Image.Image:
+def layout_rects(num_panels: int) -> List[Dict]:
+    """Panel rectangles the layout for num_panels places (without drawing)."""
+    return splash_rects() if num_panels == 1 else grid_rects(num_panels)
+
+
+def layout_splash(page_img: Image.Image, panel_images: List[Image.Image]) -> List[Dict]:
+    """
+    Splash layout: Single panel fills entire page.
+
+    Returns:
+        Rectangle of the placed panel (see panel_rect)
+    """
+    if not panel_images:
+        return []
+
+    rects = splash_rects()
+    rect = rects[0]
+    draw_panel_with_shadow(page_img, panel_images[0], rect['x'], rect['y'], rect['width'], rect['height'])
+    return rects
+
+
+def layout_2x2_grid(page_img: Image.Image, panel_images: List[Image.Image]) -> List[Dict]:
+    """
+    2x2 Grid layout: 4 panels in a grid.
+
+    Returns:
+        Rectangles of the placed panels in reading order (see panel_rect)
+    """
+    rects = grid_rects(len(panel_images))
+    for panel, rect in zip(panel_images, rects):
+        draw_panel_with_shadow(page_img, panel, rect['x'], rect['y'], rect['width'], rect['height'])
+    return rects
+
+
+def normalize_rects(rects: List[Dict], page_width: int = PAGE_WIDTH,
+                    page_height: int = PAGE_HEIGHT) -> List[Dict]:
+    """
+    Panel rectangles as fractions of the page size.
+
+    Every web rendition keeps the page's aspect ratio, so the same values
+    locate the panels in any of them.
+    """
+    return [
+        {
+            'x': round(rect['x'] / page_width, 4),
+            'y': round(rect['y'] / page_height, 4),
+            'width': round(rect['width'] / page_width, 4),
+            'height': round(rect['height'] / page_height, 4),
+        }
+        for rect in rects
+    ]
+
+
+def assemble_page_with_rects(panel_images: List[Image.Image],
+                             num_panels: int) -> Tuple[Image.Image, List[Dict]]:
     """
     Assemble a comic page using simplified layout system.
 
@@ -159,17 +213,23 @@ def assemble_page_simple(panel_images: List[Image.Image], num_panels: int) -> Im
         num_panels: Number of panels (1 or 4)
 
     Returns:
-        Assembled page image (1600x2400)
+        (assembled page image (1600x2400), panel rectangles in reading order)
     """
     # Create textured background
     page_img = create_textured_background(PAGE_WIDTH, PAGE_HEIGHT)
 
     # Apply appropriate layout
     if num_panels == 1:
-        layout_splash(page_img, panel_images)
+        rects = layout_splash(page_img, panel_images)
     else:  # 4 panels or fewer (pad with empty if needed)
-        layout_2x2_grid(page_img, panel_images)
+        rects = layout_2x2_grid(page_img, panel_images)
+
+    return page_img, rects
 
+
+def assemble_page_simple(panel_images: List[Image.Image], num_panels: int) -> Image.Image:
+    """Assemble a comic page (see assemble_page_with_rects), image only."""
+    page_img, _ = assemble_page_with_rects(panel_images, num_panels)
     return page_img
 
 
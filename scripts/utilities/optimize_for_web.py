@@ -1,19 +1,37 @@
 #!/usr/bin/env python3
 """
 Optimize comic pages for web delivery.
-Generates WebP versions at reduced resolution with quality optimization.
+Generates WebP versions at reduced resolution with quality optimization,
+plus a ladder of responsive widths in WebP and AVIF for srcset, and packs
+the thumbnails into sprite sheets for the reader's grid view.
+
+All outputs are written under content-hashed names (page-001.<hash>.webp)
+and listed in the site's asset manifest so they can be cached as immutable.
+The default page image and thumbnail are also written under their stable
+names for external links. Each page also gets a tiny inline placeholder.
+
+Each source page is decoded once and every output is derived from that
+decode. Pages are processed in parallel, and pages whose source hash and
+settings match the previous run are skipped.
 """
 
-import subprocess
+import os
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from PIL import Image
-import json
-import sys
+from image_formats import FORMATS, is_format_supported, encode_image, format_size, make_placeholder
+from asset_manifest import write_hashed, is_hashed_name, update_asset_manifest
 
 # Configuration
 SOURCE_DIR = Path("output/pages")
-TARGET_DIR = Path("site/images/pages")
-THUMB_DIR = Path("site/images/thumbnails")
+SITE_DIR = Path("docs")
+TARGET_DIR = SITE_DIR / "images/pages"
+THUMB_DIR = SITE_DIR / "images/thumbnails"
+MANIFEST_FILE = SITE_DIR / "data/image-manifest.json"
 
 # Optimization settings
 PAGE_WIDTH = 1200
@@ -23,67 +41,276 @@ THUMB_HEIGHT = 300
 WEBP_QUALITY = 88
 THUMB_QUALITY = 80
 
+# Responsive renditions (widths above the source width are skipped)
+RENDITION_WIDTHS = [600, 900, 1200, 1800]
+RENDITION_FORMATS = ['webp', 'avif']
+RENDITION_QUALITY = {
+    'webp': WEBP_QUALITY,
+    'avif': 60,
+}
 
-def check_imagemagick():
-    """Check if ImageMagick is available."""
-    try:
-        result = subprocess.run(
-            ["magick", "--version"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        return result.returncode == 0
-    except FileNotFoundError:
-        return False
+# Thumbnail sprite sheets (one request loads the whole grid view)
+SPRITE_COLUMNS = 10
+SPRITE_MAX_PER_SHEET = 60
 
+# Bump when the output pipeline changes in a way settings don't capture
+PIPELINE_VERSION = 5
 
-def optimize_page_imagemagick(source_path, target_path, width, height, quality):
-    """Use ImageMagick to optimize image to WebP."""
-    cmd = [
-        "magick", str(source_path),
-        "-resize", f"{width}x{height}",
-        "-quality", str(quality),
-        "-define", "webp:method=6",  # Best compression
-        str(target_path)
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"ImageMagick failed: {result.stderr}")
 
+def rendition_formats():
+    """Rendition formats this Pillow build can write."""
+    return [fmt for fmt in RENDITION_FORMATS if is_format_supported(fmt)]
 
-def optimize_page_pillow(source_path, target_path, width, height, quality):
-    """Use Pillow to optimize image to WebP (fallback)."""
-    img = Image.open(source_path)
-    # Resize maintaining aspect ratio
-    img.thumbnail((width, height), Image.Resampling.LANCZOS)
-    img.save(target_path, "WEBP", quality=quality, method=6)
 
+def current_settings():
+    """Settings that affect the generated files (part of the skip key)."""
+    return {
+        'pipeline': PIPELINE_VERSION,
+        'page': [PAGE_WIDTH, PAGE_HEIGHT, WEBP_QUALITY],
+        'thumb': [THUMB_WIDTH, THUMB_HEIGHT, THUMB_QUALITY],
+        'renditions': {
+            'widths': RENDITION_WIDTHS,
+            'formats': {fmt: RENDITION_QUALITY[fmt] for fmt in rendition_formats()},
+        },
+    }
 
-def generate_thumbnail(source_path, target_path):
-    """Generate thumbnail using Pillow for precise control."""
-    img = Image.open(source_path)
-    img.thumbnail((THUMB_WIDTH, THUMB_HEIGHT), Image.Resampling.LANCZOS)
-    img.save(target_path, "WEBP", quality=THUMB_QUALITY)
 
+def settings_hash(settings):
+    """Stable hash of the settings dict."""
+    encoded = json.dumps(settings, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
 
-def format_size(bytes_size):
-    """Format bytes to human-readable size."""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if bytes_size < 1024.0:
-            return f"{bytes_size:.1f} {unit}"
-        bytes_size /= 1024.0
-    return f"{bytes_size:.1f} TB"
+
+def file_hash(path):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest():
+    """Load the previous run's manifest (empty if missing or unreadable)."""
+    if not MANIFEST_FILE.exists():
+        return {'pages': {}}
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {'pages': {}}
+    manifest.setdefault('pages', {})
+    return manifest
+
+
+def save_manifest(manifest):
+    """Write the manifest atomically."""
+    MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = MANIFEST_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, MANIFEST_FILE)
+
+
+def is_up_to_date(record, source_hash, settings_key):
+    """Check whether a manifest record still matches its source and settings."""
+    if not record:
+        return False
+    if record.get('source_hash') != source_hash or record.get('settings_hash') != settings_key:
+        return False
+    outputs = list(record.get('outputs', {}).values()) + record.get('renditions', [])
+    return all((SITE_DIR / output['path']).exists() for output in outputs)
+
+
+def save_output(img, target_path, fmt, quality, alias=False):
+    """
+    Save an output under its content-hashed name and describe it for the manifest.
+
+    'logical' is the unhashed site-relative path, 'path' the hashed one.
+    With alias=True the bytes are also written to the unhashed name.
+    """
+    data = encode_image(img, fmt, quality)
+    hashed = write_hashed(target_path, data)
+    if alias:
+        target_path.write_bytes(data)
+    return {
+        'path': hashed.relative_to(SITE_DIR).as_posix(),
+        'logical': target_path.relative_to(SITE_DIR).as_posix(),
+        'format': fmt,
+        'width': img.width,
+        'height': img.height,
+        'bytes': len(data),
+    }
+
+
+def ladder_widths(source_width):
+    """Rendition widths for a source, capped at the source width (no upscaling)."""
+    widths = [w for w in RENDITION_WIDTHS if w < source_width]
+    if len(widths) < len(RENDITION_WIDTHS):
+        widths.append(source_width)
+    return widths
+
+
+def resized(img, width):
+    """Resize to width keeping aspect ratio."""
+    if width == img.width:
+        return img
+    height = round(img.height * width / img.width)
+    return img.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def process_page(source_path, target_path, thumb_path, formats):
+    """
+    Decode a page once and write every web output from that decode.
+
+    Runs in a worker process, so it only takes and returns plain data.
+    """
+    with Image.open(source_path) as src:
+        img = src.convert('RGB')
+
+    # Page: resize maintaining aspect ratio
+    page_img = img.copy()
+    page_img.thumbnail((PAGE_WIDTH, PAGE_HEIGHT), Image.Resampling.LANCZOS)
+
+    # Thumbnail: derived from the already-downscaled page
+    thumb_img = page_img.copy()
+    thumb_img.thumbnail((THUMB_WIDTH, THUMB_HEIGHT), Image.Resampling.LANCZOS)
+
+    outputs = {
+        'page': save_output(page_img, target_path, 'webp', WEBP_QUALITY, alias=True),
+        'thumbnail': save_output(thumb_img, thumb_path, 'webp', THUMB_QUALITY, alias=True),
+    }
+
+    # Responsive ladder: each width resized once, then encoded per format
+    renditions = []
+    stem = target_path.stem
+    for width in ladder_widths(img.width):
+        width_img = resized(img, width)
+        for fmt in formats:
+            if (fmt == 'webp' and width == page_img.width
+                    and RENDITION_QUALITY[fmt] == WEBP_QUALITY):
+                # Identical to the default page image, reuse it
+                renditions.append(outputs['page'])
+                continue
+            rendition_path = target_path.parent / f"{stem}-{width}w.{FORMATS[fmt]['ext']}"
+            renditions.append(save_output(width_img, rendition_path, fmt, RENDITION_QUALITY[fmt]))
+
+    return {
+        'outputs': outputs,
+        'renditions': renditions,
+        'placeholder': make_placeholder(page_img),
+    }
+
+
+def sprite_key(stems, manifest):
+    """Hash of everything that determines the sprite sheets."""
+    parts = [[stem, manifest['pages'][stem]['source_hash']] for stem in stems]
+    parts.append([PIPELINE_VERSION, SPRITE_COLUMNS, SPRITE_MAX_PER_SHEET,
+                  THUMB_WIDTH, THUMB_HEIGHT, THUMB_QUALITY])
+    return settings_hash(parts)
+
+
+def build_sprite_sheets(stems, manifest):
+    """
+    Pack page thumbnails (in page order) into sprite sheets.
+
+    Returns the manifest 'sprites' record: the sheets plus a per-page cell map.
+    """
+    sheets = []
+    cells = {}
+    per_sheet = SPRITE_MAX_PER_SHEET
+
+    for sheet_index, start in enumerate(range(0, len(stems), per_sheet)):
+        chunk = stems[start:start + per_sheet]
+        columns = min(SPRITE_COLUMNS, len(chunk))
+        rows = (len(chunk) + columns - 1) // columns
+        sheet = Image.new('RGB', (columns * THUMB_WIDTH, rows * THUMB_HEIGHT), 'white')
+
+        for i, stem in enumerate(chunk):
+            thumb_output = manifest['pages'][stem]['outputs']['thumbnail']
+            x = (i % columns) * THUMB_WIDTH
+            y = (i // columns) * THUMB_HEIGHT
+            with Image.open(SITE_DIR / thumb_output['path']) as thumb:
+                sheet.paste(thumb.convert('RGB'), (x, y))
+            cells[stem] = {
+                'sheet': sheet_index,
+                'x': x,
+                'y': y,
+                'width': thumb_output['width'],
+                'height': thumb_output['height'],
+            }
+
+        sheets.append(save_output(sheet, THUMB_DIR / f"sprite-{sheet_index}.webp", 'webp', THUMB_QUALITY))
+
+    return {'sheets': sheets, 'cells': cells}
+
+
+def update_sprite_sheets(manifest, force=False):
+    """Rebuild sprite sheets only when the set of thumbnails changed."""
+    stems = sorted(manifest['pages'])
+    key = sprite_key(stems, manifest)
+    previous = manifest.get('sprites')
+
+    if (not force and previous and previous.get('key') == key
+            and all((SITE_DIR / sheet['path']).exists() for sheet in previous['sheets'])):
+        print("→ Sprite sheets unchanged (skipped)")
+        return
+
+    # Remove sheets from previous builds (hashed names change with content)
+    for stale in THUMB_DIR.glob("sprite-*.webp"):
+        stale.unlink()
+
+    sprites = build_sprite_sheets(stems, manifest)
+    sprites['key'] = key
+    manifest['sprites'] = sprites
+    total = sum(sheet['bytes'] for sheet in sprites['sheets'])
+    print(f"✓ Packed {len(stems)} thumbnails into {len(sprites['sheets'])} sprite sheet(s) ({format_size(total)})")
+
+
+def record_files(record):
+    """All hashed files referenced by a page record."""
+    outputs = list(record.get('outputs', {}).values()) + record.get('renditions', [])
+    return {output['path'] for output in outputs}
+
+
+def remove_stale_files(old_record, new_record):
+    """Delete hashed files the previous build of a page produced but this one didn't."""
+    if not old_record:
+        return
+    keep = record_files(new_record) if new_record else set()
+    for path in record_files(old_record) - keep:
+        stale = SITE_DIR / path
+        # Stable alias names are shared across builds, only hashed files go
+        if is_hashed_name(stale) and stale.exists():
+            stale.unlink()
+
+
+def asset_entries(manifest):
+    """Logical -> hashed paths for every page output, rendition and sprite sheet."""
+    entries = {}
+    for record in manifest['pages'].values():
+        for output in list(record['outputs'].values()) + record.get('renditions', []):
+            entries[output['logical']] = output['path']
+    for sheet in manifest.get('sprites', {}).get('sheets', []):
+        entries[sheet['logical']] = sheet['path']
+    return entries
 
 
 def main():
     """Main optimization process."""
-    # Check prerequisites
-    use_imagemagick = check_imagemagick()
-    if use_imagemagick:
-        print("✓ Using ImageMagick for optimization")
-    else:
-        print("⚠ ImageMagick not found, using Pillow (slower, less optimal)")
+    parser = argparse.ArgumentParser(description='Optimize comic pages for web delivery')
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of worker processes (default: CPU count)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Reprocess every page even if unchanged since the last run'
+    )
+    args = parser.parse_args()
 
     # Create output directories
     TARGET_DIR.mkdir(parents=True, exist_ok=True)
@@ -99,63 +326,113 @@ def main():
 
     print(f"\nFound {len(page_files)} pages to optimize")
     print(f"Target: {PAGE_WIDTH}x{PAGE_HEIGHT}px WebP @ quality {WEBP_QUALITY}")
-    print(f"Thumbnails: {THUMB_WIDTH}x{THUMB_HEIGHT}px WebP @ quality {THUMB_QUALITY}\n")
-
-    total_original_size = 0
-    total_optimized_size = 0
-    total_thumb_size = 0
-
-    # Process each page
-    for i, page_file in enumerate(page_files, 1):
-        page_num = page_file.stem  # e.g., "page-001"
-        target_path = TARGET_DIR / f"{page_num}.webp"
-        thumb_path = THUMB_DIR / f"{page_num}.webp"
-
-        original_size = page_file.stat().st_size
-        total_original_size += original_size
-
-        print(f"[{i}/{len(page_files)}] Processing {page_num}...")
-
-        try:
-            # Generate optimized page
-            if use_imagemagick:
-                optimize_page_imagemagick(
-                    page_file, target_path,
-                    PAGE_WIDTH, PAGE_HEIGHT, WEBP_QUALITY
-                )
-            else:
-                optimize_page_pillow(
-                    page_file, target_path,
-                    PAGE_WIDTH, PAGE_HEIGHT, WEBP_QUALITY
-                )
-
-            optimized_size = target_path.stat().st_size
-            total_optimized_size += optimized_size
-
-            # Generate thumbnail
-            generate_thumbnail(page_file, thumb_path)
-            thumb_size = thumb_path.stat().st_size
-            total_thumb_size += thumb_size
-
-            # Calculate savings
-            reduction = (1 - optimized_size / original_size) * 100
-
-            print(f"  Original: {format_size(original_size)}")
-            print(f"  Optimized: {format_size(optimized_size)} (-{reduction:.1f}%)")
-            print(f"  Thumbnail: {format_size(thumb_size)}")
-
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            continue
-
-    # Summary
+    print(f"Thumbnails: {THUMB_WIDTH}x{THUMB_HEIGHT}px WebP @ quality {THUMB_QUALITY}")
+
+    formats = rendition_formats()
+    print(f"Renditions: {', '.join(str(w) for w in RENDITION_WIDTHS)}w in {', '.join(f.upper() for f in formats)}")
+    if 'avif' in RENDITION_FORMATS and 'avif' not in formats:
+        print("⚠ AVIF not supported by this Pillow build, skipping AVIF renditions")
+    print()
+
+    manifest = load_manifest()
+    settings = current_settings()
+    settings_key = settings_hash(settings)
+
+    # Decide which pages need work
+    source_hashes = {}
+    pending = []
+    for page_file in page_files:
+        stem = page_file.stem  # e.g., "page-001"
+        source_hashes[stem] = file_hash(page_file)
+        record = manifest['pages'].get(stem)
+        if args.force or not is_up_to_date(record, source_hashes[stem], settings_key):
+            pending.append(page_file)
+
+    skipped = len(page_files) - len(pending)
+    print(f"→ {len(pending)} page(s) to process, {skipped} unchanged (skipped)")
+    if pending:
+        print(f"  Using {min(args.jobs, len(pending))} worker process(es)\n")
+
+    failed = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            futures = {
+                executor.submit(
+                    process_page,
+                    page_file,
+                    TARGET_DIR / f"{page_file.stem}.webp",
+                    THUMB_DIR / f"{page_file.stem}.webp",
+                    formats
+                ): page_file
+                for page_file in pending
+            }
+
+            for i, future in enumerate(as_completed(futures), 1):
+                page_file = futures[future]
+                stem = page_file.stem
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[{i}/{len(pending)}] ✗ {stem}: {e}")
+                    failed.append(stem)
+                    continue
+
+                record = {
+                    'source_hash': source_hashes[stem],
+                    'source_bytes': page_file.stat().st_size,
+                    'settings_hash': settings_key,
+                    'outputs': result['outputs'],
+                    'renditions': result['renditions'],
+                    'placeholder': result['placeholder'],
+                }
+                remove_stale_files(manifest['pages'].get(stem), record)
+                manifest['pages'][stem] = record
+                outputs = result['outputs']
+
+                original_size = page_file.stat().st_size
+                optimized_size = outputs['page']['bytes']
+                reduction = (1 - optimized_size / original_size) * 100
+                print(f"[{i}/{len(pending)}] ✓ {stem}: {format_size(original_size)} → "
+                      f"{format_size(optimized_size)} (-{reduction:.1f}%), "
+                      f"thumb {format_size(outputs['thumbnail']['bytes'])}, "
+                      f"{len(result['renditions'])} renditions")
+
+    # Drop records for pages that no longer exist
+    current_stems = {page_file.stem for page_file in page_files}
+    for stem in list(manifest['pages']):
+        if stem not in current_stems:
+            remove_stale_files(manifest['pages'].pop(stem), None)
+
+    if manifest['pages']:
+        update_sprite_sheets(manifest, force=args.force)
+
+    manifest['settings'] = settings
+    save_manifest(manifest)
+    update_asset_manifest(SITE_DIR, asset_entries(manifest),
+                          prefixes=("images/pages/", "images/thumbnails/"))
+
+    # Summary (covers skipped pages too, from their manifest records)
+    records = [manifest['pages'][stem] for stem in sorted(current_stems) if stem in manifest['pages']]
+    total_original_size = sum(r['source_bytes'] for r in records)
+    total_optimized_size = sum(r['outputs']['page']['bytes'] for r in records)
+    total_thumb_size = sum(r['outputs']['thumbnail']['bytes'] for r in records)
+    total_rendition_size = sum(o['bytes'] for r in records for o in r.get('renditions', []))
+
     print("\n" + "="*60)
     print("OPTIMIZATION SUMMARY")
     print("="*60)
-    print(f"Pages processed: {len(page_files)}")
+    print(f"Pages processed: {len(pending) - len(failed)}")
+    print(f"Pages skipped (unchanged): {skipped}")
+    if failed:
+        print(f"Pages failed: {len(failed)} ({', '.join(failed)})")
+
+    if not records:
+        return
+
     print(f"\nOriginal total:   {format_size(total_original_size)}")
     print(f"Optimized total:  {format_size(total_optimized_size)}")
     print(f"Thumbnails total: {format_size(total_thumb_size)}")
+    print(f"Renditions total: {format_size(total_rendition_size)}")
     print(f"Combined web size: {format_size(total_optimized_size + total_thumb_size)}")
 
     total_reduction = (1 - (total_optimized_size + total_thumb_size) / total_original_size) * 100
@@ -164,10 +441,12 @@ def main():
 
     print(f"\n✓ Optimized images saved to: {TARGET_DIR}")
     print(f"✓ Thumbnails saved to: {THUMB_DIR}")
+    print(f"✓ Manifest saved to: {MANIFEST_FILE}")
+    print(f"✓ Asset manifest updated: {SITE_DIR / 'data/asset-manifest.json'}")
 
     # Average sizes
-    avg_page_size = total_optimized_size / len(page_files) if page_files else 0
-    avg_thumb_size = total_thumb_size / len(page_files) if page_files else 0
+    avg_page_size = total_optimized_size / len(records)
+    avg_thumb_size = total_thumb_size / len(records)
     print(f"\nAverage page size: {format_size(avg_page_size)}")
     print(f"Average thumbnail size: {format_size(avg_thumb_size)}")
 
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Optimize character, NPC, monster and location gallery images for the web.
+
+Generates a ladder of WebP/AVIF widths per gallery PNG (small widths for
+gallery cards, large widths for detail pages) under content-hashed names,
+plus an inline placeholder. Results are recorded in data/gallery-manifest.json,
+which generate_site_data.py reads (adding the renditions to the asset
+manifest and gallery data) and the detail page generators render through
+picture_html().
+
+Each source is decoded once; unchanged sources are skipped.
+"""
+
+import os
+import sys
+import html
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from PIL import Image
+from image_formats import FORMATS, is_format_supported, encode_image, format_size, make_placeholder
+from asset_manifest import write_hashed, is_hashed_name
+
+# Configuration
+SITE_DIR = Path("docs")
+GALLERY_DIRS = ["images/characters", "images/npcs", "images/monsters", "images/locations"]
+GALLERY_MANIFEST = SITE_DIR / "data/gallery-manifest.json"
+
+# Rendition ladder (capped at the source width): cards use the low end,
+# detail pages the high end
+RENDITION_WIDTHS = [320, 640, 960, 1376]
+RENDITION_FORMATS = ['avif', 'webp']
+RENDITION_QUALITY = {
+    'webp': 82,
+    'avif': 55,
+}
+
+# sizes attributes for the places gallery images appear
+CARD_SIZES = "(max-width: 768px) 100vw, 400px"
+PORTRAIT_SIZES = "300px"
+LOCATION_SIZES = "(max-width: 1200px) 100vw, 1160px"
+
+# Bump when the output pipeline changes in a way settings don't capture
+PIPELINE_VERSION = 1
+
+
+def rendition_formats():
+    """Rendition formats this Pillow build can write."""
+    return [fmt for fmt in RENDITION_FORMATS if is_format_supported(fmt)]
+
+
+def settings_hash():
+    """Hash of the settings that affect generated files."""
+    settings = {
+        'pipeline': PIPELINE_VERSION,
+        'widths': RENDITION_WIDTHS,
+        'formats': {fmt: RENDITION_QUALITY[fmt] for fmt in rendition_formats()},
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def load_gallery_manifest():
+    """Load the gallery manifest (empty if not built yet)."""
+    if not GALLERY_MANIFEST.exists():
+        return {}
+    with open(GALLERY_MANIFEST, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_gallery_manifest(manifest):
+    """Write the gallery manifest atomically."""
+    GALLERY_MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = GALLERY_MANIFEST.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True, ensure_ascii=False)
+    os.replace(tmp_file, GALLERY_MANIFEST)
+
+
+def find_sources():
+    """All gallery source PNGs (skipping hashed copies), site-relative."""
+    sources = []
+    for gallery_dir in GALLERY_DIRS:
+        directory = SITE_DIR / gallery_dir
+        if directory.exists():
+            sources.extend(
+                path for path in sorted(directory.glob("*.png")) if not is_hashed_name(path)
+            )
+    return sources
+
+
+def process_image(source_path, formats):
+    """Decode one gallery image and write its whole rendition ladder."""
+    with Image.open(source_path) as src:
+        img = src.convert('RGB')
+
+    widths = [w for w in RENDITION_WIDTHS if w < img.width]
+    if len(widths) < len(RENDITION_WIDTHS):
+        widths.append(img.width)
+
+    renditions = []
+    for width in widths:
+        height = round(img.height * width / img.width)
+        width_img = img if width == img.width else img.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            logical = source_path.with_name(f"{source_path.stem}-{width}w.{FORMATS[fmt]['ext']}")
+            data = encode_image(width_img, fmt, RENDITION_QUALITY[fmt])
+            hashed = write_hashed(logical, data)
+            renditions.append({
+                'path': hashed.relative_to(SITE_DIR).as_posix(),
+                'logical': logical.relative_to(SITE_DIR).as_posix(),
+                'format': fmt,
+                'width': width,
+                'height': height,
+                'bytes': len(data),
+            })
+
+    return {
+        'width': img.width,
+        'height': img.height,
+        'placeholder': make_placeholder(img),
+        'renditions': renditions,
+    }
+
+
+def remove_stale_renditions(old_record, new_record):
+    """Delete hashed renditions the previous build produced but this one didn't."""
+    if not old_record:
+        return
+    keep = {r['path'] for r in new_record['renditions']} if new_record else set()
+    for rendition in old_record['renditions']:
+        stale = SITE_DIR / rendition['path']
+        if rendition['path'] not in keep and stale.exists():
+            stale.unlink()
+
+
+# ---------------------------------------------------------------------------
+# HTML helpers (used by generate_site_data.py and the detail page generators)
+# ---------------------------------------------------------------------------
+
+def srcsets(record, prefix=''):
+    """Per-format srcset strings for a gallery manifest record."""
+    srcset = {}
+    for rendition in sorted(record['renditions'], key=lambda r: r['width']):
+        srcset.setdefault(rendition['format'], []).append(
+            f"{prefix}{rendition['path']} {rendition['width']}w"
+        )
+    return {fmt: ', '.join(candidates) for fmt, candidates in srcset.items()}
+
+
+def fallback_rendition(record, max_width=960):
+    """Largest WebP rendition up to max_width (else the smallest), for <img src>."""
+    webp = sorted((r for r in record['renditions'] if r['format'] == 'webp'), key=lambda r: r['width'])
+    fitting = [r for r in webp if r['width'] <= max_width]
+    if fitting:
+        return fitting[-1]
+    return webp[0] if webp else None
+
+
+def picture_html(image_src, alt, sizes, css_class=None, loading='lazy', manifest=None):
+    """
+    <picture> markup for a gallery image referenced as e.g. '../images/npcs/barth.png'.
+
+    Falls back to a plain lazy <img> when the image has no renditions yet.
+    """
+    if manifest is None:
+        manifest = load_gallery_manifest()
+
+    prefix = image_src[:image_src.index('images/')] if 'images/' in image_src else ''
+    record = manifest.get(image_src[len(prefix):])
+
+    class_attr = f' class="{css_class}"' if css_class else ''
+    img_attrs = (f'alt="{html.escape(alt)}"{class_attr} loading="{loading}" decoding="async" '
+                 f'onerror="this.src=\'{prefix}images/placeholder.png\'"')
+
+    fallback = record and fallback_rendition(record)
+    if not fallback:
+        return f'<img src="{image_src}" {img_attrs}>'
+
+    sets = srcsets(record, prefix)
+    sources = ''.join(
+        f'<source type="{FORMATS[fmt]["mime"]}" srcset="{sets[fmt]}" sizes="{sizes}">'
+        for fmt in RENDITION_FORMATS
+        if fmt in sets and fmt != 'webp'
+    )
+    style = f' style="background: url(\'{record["placeholder"]}\') center / cover no-repeat;"'
+    return (
+        f'<picture>{sources}'
+        f'<img src="{prefix}{fallback["path"]}" srcset="{sets["webp"]}" sizes="{sizes}" '
+        f'width="{record["width"]}" height="{record["height"]}" {img_attrs}{style}>'
+        f'</picture>'
+    )
+
+
+def main():
+    """Build gallery renditions."""
+    parser = argparse.ArgumentParser(description='Optimize gallery images for the web')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                        help='Reprocess every image even if unchanged since the last run')
+    args = parser.parse_args()
+
+    sources = find_sources()
+    if not sources:
+        print(f"✗ No gallery images found under {SITE_DIR}/images")
+        sys.exit(1)
+
+    formats = rendition_formats()
+    settings_key = settings_hash()
+    manifest = load_gallery_manifest()
+
+    print(f"Found {len(sources)} gallery images")
+    print(f"Renditions: {', '.join(str(w) for w in RENDITION_WIDTHS)}w in "
+          f"{', '.join(f.upper() for f in formats)}\n")
+
+    pending = []
+    source_hashes = {}
+    for source in sources:
+        logical = source.relative_to(SITE_DIR).as_posix()
+        source_hashes[logical] = hashlib.sha256(source.read_bytes()).hexdigest()
+        record = manifest.get(logical)
+        up_to_date = (
+            record
+            and record.get('source_hash') == source_hashes[logical]
+            and record.get('settings_hash') == settings_key
+            and all((SITE_DIR / r['path']).exists() for r in record['renditions'])
+        )
+        if args.force or not up_to_date:
+            pending.append(source)
+
+    print(f"→ {len(pending)} image(s) to process, {len(sources) - len(pending)} unchanged (skipped)")
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            futures = {executor.submit(process_image, source, formats): source for source in pending}
+            for i, future in enumerate(as_completed(futures), 1):
+                source = futures[future]
+                logical = source.relative_to(SITE_DIR).as_posix()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[{i}/{len(pending)}] ✗ {logical}: {e}")
+                    continue
+
+                result['source_hash'] = source_hashes[logical]
+                result['source_bytes'] = source.stat().st_size
+                result['settings_hash'] = settings_key
+                remove_stale_renditions(manifest.get(logical), result)
+                manifest[logical] = result
+
+                smallest = min(r['bytes'] for r in result['renditions'])
+                print(f"[{i}/{len(pending)}] ✓ {logical}: {format_size(result['source_bytes'])} → "
+                      f"{len(result['renditions'])} renditions (smallest {format_size(smallest)})")
+
+    # Drop records for removed sources
+    for logical in list(manifest):
+        if logical not in source_hashes:
+            remove_stale_renditions(manifest.pop(logical), None)
+
+    save_gallery_manifest(manifest)
+
+    # Summary: what a gallery card costs now vs the original PNG
+    original = sum(record['source_bytes'] for record in manifest.values())
+    cards = sum(
+        min((r['bytes'] for r in record['renditions'] if r['format'] == 'webp' and r['width'] >= 640),
+            default=record['source_bytes'])
+        for record in manifest.values()
+    )
+    print("\n" + "=" * 60)
+    print("GALLERY SUMMARY")
+    print("=" * 60)
+    print(f"Original PNGs:      {format_size(original)}")
+    print(f"Card-size WebP set: {format_size(cards)}")
+    if original:
+        print(f"Gallery view transfer: {cards / original * 100:.1f}% of original")
+    print(f"\n✓ Manifest saved to: {GALLERY_MANIFEST}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Precompressed siblings for static site files.
+
+Writes file.gz (and file.br when the brotli package is installed) next to a
+file, so hosts and CDNs that serve precompressed assets skip compressing on
+every request.
+"""
+
+import gzip
+from pathlib import Path
+from typing import Dict, List
+from image_formats import format_size
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def write_compressed(path: Path) -> Dict[str, int]:
+    """
+    Write .gz/.br siblings of a file.
+
+    Returns:
+        Sizes in bytes: {'raw': ..., 'gzip': ..., 'br': ... (None without brotli)}
+    """
+    data = path.read_bytes()
+
+    # mtime=0 keeps the .gz byte-identical across rebuilds
+    gz_data = gzip.compress(data, compresslevel=9, mtime=0)
+    path.with_name(path.name + '.gz').write_bytes(gz_data)
+
+    br_file = path.with_name(path.name + '.br')
+    br_size = None
+    if brotli is not None:
+        br_data = brotli.compress(data, quality=11)
+        br_file.write_bytes(br_data)
+        br_size = len(br_data)
+    elif br_file.exists():
+        # Never leave a .br that no longer matches its file
+        br_file.unlink()
+
+    return {'raw': len(data), 'gzip': len(gz_data), 'br': br_size}
+
+
+def print_size_report(rows: List[tuple]):
+    """Print a raw / gzip / brotli size table for (name, sizes) rows."""
+    print(f"  {'File':<28} {'Raw':>10} {'Gzip':>10} {'Brotli':>10}")
+    for name, sizes in rows:
+        br = format_size(sizes['br']) if sizes['br'] is not None else '-'
+        print(f"  {name:<28} {format_size(sizes['raw']):>10} {format_size(sizes['gzip']):>10} {br:>10}")
+
+    total_raw = sum(sizes['raw'] for _, sizes in rows)
+    total_gz = sum(sizes['gzip'] for _, sizes in rows)
+    print(f"  {'Total':<28} {format_size(total_raw):>10} {format_size(total_gz):>10}")
+    if brotli is None:
+        print("  (install 'brotli' to also write .br files)")
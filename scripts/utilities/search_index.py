@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Client-side search index for the docs site.
+
+Builds an inverted index from the page scripts (titles, characters, NPCs,
+locations and dialogue) mapping terms to scored page numbers, sharded by the
+first character of each term. A query only needs the shard for its first
+letter, and prefix matching happens in the browser (docs/js/search.js).
+"""
+
+import re
+import json
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+SEARCH_DIR_NAME = "data/search"
+INDEX_VERSION = 1
+
+# Per-field weights: a name or place outranks a passing word of dialogue
+FIELD_WEIGHTS = {
+    'character': 5,
+    'location': 4,
+    'title': 3,
+    'dialogue': 1,
+}
+
+MIN_TERM_LENGTH = 2
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from',
+    'has', 'have', 'he', 'her', 'his', 'i', 'if', 'in', 'into', 'is', 'it',
+    'its', 'me', 'my', 'no', 'not', 'of', 'on', 'or', 'our', 'she', 'so',
+    'that', 'the', 'their', 'them', 'then', 'there', 'they', 'this', 'to',
+    'up', 'us', 'was', 'we', 'were', 'what', 'will', 'with', 'you', 'your',
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents (café -> cafe); search.js does the same."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> List[str]:
+    """Index terms in text: words without possessives, stopwords or short tokens."""
+    terms = []
+    for token in TOKEN_RE.findall(normalize(text)):
+        token = token.split("'")[0]
+        if len(token) >= MIN_TERM_LENGTH and token not in STOPWORDS:
+            terms.append(token)
+    return terms
+
+
+def shard_key(term: str) -> str:
+    """Shard a term by its first character (digits and letters; '_' otherwise)."""
+    first = term[0]
+    return first if first.isascii() and first.isalnum() else '_'
+
+
+def page_fields(page_data: Dict) -> Dict[str, List[str]]:
+    """Text of a page script grouped by index field."""
+    fields = {field: [] for field in FIELD_WEIGHTS}
+    fields['title'].append(page_data.get('title', ''))
+
+    for panel in page_data.get('panels', []):
+        for key in ('characters', 'npcs'):
+            names = panel.get(key) or []
+            fields['character'].extend(names.keys() if isinstance(names, dict) else names)
+        if panel.get('location'):
+            fields['location'].append(panel['location'])
+        if panel.get('dialogue'):
+            fields['dialogue'].append(panel['dialogue'])
+
+    return fields
+
+
+def build_search_index(pages: Iterable[Dict]) -> Dict[str, Dict[int, int]]:
+    """
+    Inverted index: term -> {page number: score}.
+
+    A page scores a field's weight each time a term appears in that field.
+    """
+    index = {}
+    for page_data in pages:
+        page_num = page_data['page_num']
+        for field, texts in page_fields(page_data).items():
+            for text in texts:
+                for term in tokenize(text):
+                    postings = index.setdefault(term, {})
+                    postings[page_num] = postings.get(page_num, 0) + FIELD_WEIGHTS[field]
+    return index
+
+
+def write_search_index(index: Dict[str, Dict[int, int]], site_dir: Path) -> List[Path]:
+    """
+    Write one minified shard per first character.
+
+    Each shard maps term -> [page, score, page, score, ...] sorted by score.
+    Keys are sorted so rebuilds are byte-stable and compress well.
+    """
+    search_dir = site_dir / SEARCH_DIR_NAME
+    search_dir.mkdir(parents=True, exist_ok=True)
+
+    shards = {}
+    for term, postings in index.items():
+        ranked = sorted(postings.items(), key=lambda item: (-item[1], item[0]))
+        shards.setdefault(shard_key(term), {})[term] = [n for posting in ranked for n in posting]
+
+    written = []
+    for key, terms in sorted(shards.items()):
+        shard_file = search_dir / f"{key}.json"
+        with open(shard_file, 'w', encoding='utf-8') as f:
+            json.dump({'v': INDEX_VERSION, 'terms': terms}, f,
+                      separators=(',', ':'), sort_keys=True, ensure_ascii=False)
+        written.append(shard_file)
+
+    # Drop shards (and their compressed siblings) for first characters
+    # that no longer occur
+    current = {shard_file.name for shard_file in written}
+    for stale in search_dir.glob("*.json*"):
+        if stale.name[:stale.name.index('.json') + 5] not in current:
+            stale.unlink()
+
+    return written
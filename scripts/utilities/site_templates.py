@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Shared rendering helpers for the docs/ detail pages.
+
+The simple markdown renderer used by every detail page generator, and
+templates compiled once into literal/field segments so rendering a page is
+a single join.
+"""
+
+import re
+from string import Formatter
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class PageSource(NamedTuple):
+    """One detail page: the entity it renders and where it is written."""
+    entity_id: str
+    data: Dict
+    output: Path
+    image: Optional[str]  # Gallery image as referenced from the page ('../images/...')
+
+
+class CompiledTemplate:
+    """A str.format-style template parsed once into literal and field segments."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.segments: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if spec or conversion:
+                raise ValueError(f"Unsupported template field: {{{field}!{conversion}:{spec}}}")
+            self.segments.append((literal, field))
+        self.fields = {field for _, field in self.segments if field is not None}
+
+    def render(self, context: Dict) -> str:
+        missing = self.fields - context.keys()
+        if missing:
+            raise KeyError(f"Missing template fields: {', '.join(sorted(missing))}")
+        return ''.join(
+            literal + (str(context[field]) if field is not None else '')
+            for literal, field in self.segments
+        )
+
+
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile a str.format-style template."""
+    return CompiledTemplate(source)
+
+
+def markdown_to_html(text):
+    """Convert simple markdown to HTML."""
+    if not text:
+        return ""
+
+    # Convert **bold** to <strong>
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+
+    # Replace <br> tags with newlines for processing
+    text = text.replace('<br>', '\n')
+
+    # Split into lines
+    lines = text.split('\n')
+    html_lines = []
+    in_list = False
+    list_items = []
+
+    for line in lines:
+        stripped = line.strip()
+
+        # Handle list items
+        if stripped.startswith('- '):
+            if not in_list:
+                in_list = True
+                list_items = []
+            list_items.append(stripped[2:])  # Remove '- '
+        else:
+            # Close any open list
+            if in_list:
+                html_lines.append('<ul>')
+                for item in list_items:
+                    html_lines.append(f'<li>{item}</li>')
+                html_lines.append('</ul>')
+                in_list = False
+                list_items = []
+
+            # Add regular line
+            if stripped:
+                html_lines.append(stripped)
+            elif html_lines:  # Add line breaks for paragraph separation
+                html_lines.append('<br><br>')
+
+    # Close any remaining list
+    if in_list:
+        html_lines.append('<ul>')
+        for item in list_items:
+            html_lines.append(f'<li>{item}</li>')
+        html_lines.append('</ul>')
+
+    return '\n'.join(html_lines)
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the docs site: rebuild on change and live-reload the browser.
+
+Watches the site inputs (characters.json, locations.json, pages/*.json,
+assembled pages, gallery images, the detail page generators and the
+hand-written HTML/CSS/JS), maps each change through an in-memory graph of
+build steps to the outputs it affects, reruns only those steps, and tells
+open browsers to reload over a WebSocket.
+
+The site is served from docs/ with a small live-reload client injected into
+HTML responses. The service worker is not served in watch mode, so pages
+always come from disk.
+
+Uses watchdog (inotify on Linux) when installed, else polls file mtimes.
+
+Usage:
+    python scripts/utilities/watch_site.py                # Serve on :8000 and watch
+    python scripts/utilities/watch_site.py --port 8080
+    python scripts/utilities/watch_site.py --no-serve     # Rebuild only
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import struct
+import hashlib
+import argparse
+import importlib
+import threading
+import subprocess
+from fnmatch import fnmatch
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Set
+import build_site
+from asset_manifest import is_hashed_name
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# Configuration
+SITE_DIR = Path("docs")
+UTILITIES_DIR = Path(__file__).parent
+DEFAULT_PORT = 8000
+LIVE_RELOAD_PATH = "/__livereload"
+
+# Quiet period after the last change before rebuilding (editors write in bursts)
+DEBOUNCE_SECONDS = 0.2
+POLL_INTERVAL = 0.5
+
+# Build steps: the inputs they read (globs relative to the repo root), how
+# they run, and the steps that consume their outputs
+BUILD_STEPS = {
+    'page-images': {
+        'inputs': ["output/pages/page-*.png"],
+        'script': "optimize_for_web.py",
+        'then': ['site-data'],
+    },
+    'gallery': {
+        'inputs': [f"{SITE_DIR.as_posix()}/{gallery_dir}/*.png" for gallery_dir in
+                   ["images/characters", "images/npcs", "images/monsters", "images/locations"]],
+        'script': "optimize_gallery.py",
+        'then': ['site-data', 'detail-pages'],
+    },
+    'site-data': {
+        'inputs': ["pages/page-*.json", "output/pages/page-*.layout.json",
+                   "characters.json", "locations.json"],
+        'script': "generate_site_data.py",
+        'then': ['service-worker'],
+    },
+    'detail-pages': {
+        'inputs': ["locations.json", "scripts/utilities/site_templates.py"] + [
+            f"scripts/utilities/{module_name}.py" for module_name, _ in build_site.PAGE_KINDS.values()
+        ],
+        'script': None,  # In-process through build_site
+        'then': [],
+    },
+    'service-worker': {
+        'inputs': [f"{SITE_DIR.as_posix()}/*.html", f"{SITE_DIR.as_posix()}/css/*.css",
+                   f"{SITE_DIR.as_posix()}/js/*.js"],
+        'script': "generate_service_worker.py",
+        'then': [],
+    },
+}
+
+# Run order (each step runs after the steps that feed it)
+STEP_ORDER = ['page-images', 'gallery', 'site-data', 'detail-pages', 'service-worker']
+
+# Hand-written site files the browser reloads directly
+STATIC_INPUTS = [f"{SITE_DIR.as_posix()}/*.html", f"{SITE_DIR.as_posix()}/js/*.js"]
+STYLE_INPUTS = [f"{SITE_DIR.as_posix()}/css/*.css"]
+
+# Directories to watch (non-recursive unless listed in RECURSIVE_WATCH_DIRS)
+WATCH_DIRS = [".", "pages", "output/pages", "scripts/utilities", f"{SITE_DIR.as_posix()}"]
+RECURSIVE_WATCH_DIRS = [f"{SITE_DIR.as_posix()}/images", f"{SITE_DIR.as_posix()}/css",
+                        f"{SITE_DIR.as_posix()}/js"]
+
+LIVE_RELOAD_CLIENT = """<script>
+// Injected by watch_site.py
+(() => {
+    if ('serviceWorker' in navigator) {
+        navigator.serviceWorker.getRegistrations()
+            .then(registrations => registrations.forEach(registration => registration.unregister()));
+    }
+    const connect = () => {
+        const socket = new WebSocket(`ws://${location.host}__PATH__`);
+        socket.onmessage = event => {
+            const message = JSON.parse(event.data);
+            if (message.type === 'css') {
+                document.querySelectorAll('link[rel="stylesheet"]').forEach(link => {
+                    const url = new URL(link.href);
+                    url.searchParams.set('v', Date.now());
+                    link.href = url.href;
+                });
+            } else if (message.type === 'error') {
+                console.error(`[watch] ${message.step} failed:\\n${message.output}`);
+            } else {
+                location.reload();
+            }
+        };
+        socket.onclose = () => setTimeout(connect, 1000);
+    };
+    connect();
+})();
+</script>
+"""
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def matches(path: str, patterns: List[str]) -> bool:
+    """True if a repo-relative posix path matches any glob ('*' stays within one directory)."""
+    parts = path.split('/')
+    for pattern in patterns:
+        pattern_parts = pattern.split('/')
+        if len(pattern_parts) == len(parts) and all(map(fnmatch, parts, pattern_parts)):
+            return True
+    return False
+
+
+def is_input(path: str) -> bool:
+    """True for files watch mode reacts to (never build outputs)."""
+    if is_hashed_name(Path(path)):
+        return False
+    patterns = STATIC_INPUTS + STYLE_INPUTS
+    for step in BUILD_STEPS.values():
+        patterns = patterns + step['inputs']
+    return matches(path, patterns)
+
+
+def affected_steps(changed: Set[str]) -> List[str]:
+    """Steps whose inputs changed plus everything downstream, in run order."""
+    pending = [name for name, step in BUILD_STEPS.items()
+               if any(matches(path, step['inputs']) for path in changed)]
+    steps = set()
+    while pending:
+        name = pending.pop()
+        if name not in steps:
+            steps.add(name)
+            pending.extend(BUILD_STEPS[name]['then'])
+    return [name for name in STEP_ORDER if name in steps]
+
+
+def reload_generators(changed: Set[str]):
+    """Re-import detail page generators whose code or data changed."""
+    shared = "scripts/utilities/site_templates.py" in changed
+    if shared:
+        importlib.reload(sys.modules['site_templates'])
+    for kind, (module_name, _) in build_site.PAGE_KINDS.items():
+        stale = shared or f"scripts/utilities/{module_name}.py" in changed or (
+            kind == 'locations' and 'locations.json' in changed
+        )
+        if stale and module_name in sys.modules:
+            importlib.reload(sys.modules[module_name])
+
+
+def run_step(name: str, changed: Set[str]) -> Dict:
+    """Run one build step; returns {'ok', 'output'}."""
+    step = BUILD_STEPS[name]
+    if step['script'] is None:
+        try:
+            reload_generators(changed)
+            result = build_site.build(verbose=False)
+        except Exception as e:
+            return {'ok': False, 'output': f"{type(e).__name__}: {e}"}
+        return {'ok': True, 'output': f"{len(result['built'])} page(s) rebuilt"}
+
+    process = subprocess.run(
+        [sys.executable, str(UTILITIES_DIR / step['script'])],
+        capture_output=True, text=True
+    )
+    output = (process.stdout + process.stderr).strip()
+    return {'ok': process.returncode == 0, 'output': output}
+
+
+class LiveReload:
+    """Open live-reload WebSockets and the messages broadcast to them."""
+
+    def __init__(self):
+        self.clients = {}  # wfile -> lock
+        self.lock = threading.Lock()
+
+    def add(self, wfile):
+        with self.lock:
+            self.clients[wfile] = threading.Lock()
+
+    def remove(self, wfile):
+        with self.lock:
+            self.clients.pop(wfile, None)
+
+    def broadcast(self, message: Dict):
+        frame = websocket_frame(json.dumps(message).encode('utf-8'))
+        with self.lock:
+            clients = list(self.clients.items())
+        for wfile, lock in clients:
+            try:
+                with lock:
+                    wfile.write(frame)
+                    wfile.flush()
+            except OSError:
+                self.remove(wfile)
+        return len(clients)
+
+
+def websocket_frame(payload: bytes, opcode: int = 0x1) -> bytes:
+    """Unmasked server-to-client WebSocket frame (text by default)."""
+    header = bytes([0x80 | opcode])
+    if len(payload) < 126:
+        header += bytes([len(payload)])
+    elif len(payload) < 65536:
+        header += bytes([126]) + struct.pack('!H', len(payload))
+    else:
+        header += bytes([127]) + struct.pack('!Q', len(payload))
+    return header + payload
+
+
+def read_websocket_frame(rfile):
+    """Read one client frame; returns (opcode, payload) or None at EOF."""
+    header = rfile.read(2)
+    if len(header) < 2:
+        return None
+    opcode = header[0] & 0x0F
+    length = header[1] & 0x7F
+    if length == 126:
+        length = struct.unpack('!H', rfile.read(2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', rfile.read(8))[0]
+    mask = rfile.read(4) if header[1] & 0x80 else b'\0\0\0\0'
+    payload = bytes(b ^ mask[i % 4] for i, b in enumerate(rfile.read(length)))
+    return opcode, payload
+
+
+def make_handler(live_reload: LiveReload):
+    """Request handler serving docs/ with the live-reload client injected."""
+
+    class DevRequestHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(SITE_DIR), **kwargs)
+
+        def end_headers(self):
+            self.send_header('Cache-Control', 'no-store')
+            super().end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            url_path = self.path.split('?', 1)[0]
+            if url_path == LIVE_RELOAD_PATH:
+                return self.serve_websocket()
+            if url_path.endswith('/sw.js'):
+                # Keep the offline cache out of the edit loop
+                return self.send_error(404, "Service worker disabled in watch mode")
+
+            file_path = Path(self.translate_path(self.path))
+            if file_path.is_dir() and url_path.endswith('/'):
+                file_path = file_path / 'index.html'
+            if file_path.suffix == '.html' and file_path.is_file():
+                return self.serve_html(file_path)
+            return super().do_GET()
+
+        def serve_html(self, file_path: Path):
+            html = file_path.read_text(encoding='utf-8')
+            client = LIVE_RELOAD_CLIENT.replace('__PATH__', LIVE_RELOAD_PATH)
+            if '</body>' in html:
+                html = html.replace('</body>', client + '</body>', 1)
+            else:
+                html += client
+            body = html.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def serve_websocket(self):
+            key = self.headers.get('Sec-WebSocket-Key')
+            if not key or self.headers.get('Upgrade', '').lower() != 'websocket':
+                return self.send_error(400, "Expected a WebSocket upgrade")
+
+            accept = base64.b64encode(
+                hashlib.sha1((key + WEBSOCKET_GUID).encode('ascii')).digest()
+            ).decode('ascii')
+            self.send_response(101, 'Switching Protocols')
+            self.send_header('Upgrade', 'websocket')
+            self.send_header('Connection', 'Upgrade')
+            self.send_header('Sec-WebSocket-Accept', accept)
+            self.end_headers()
+            self.wfile.flush()
+
+            live_reload.add(self.wfile)
+            try:
+                while True:
+                    frame = read_websocket_frame(self.rfile)
+                    if frame is None or frame[0] == 0x8:  # EOF or close
+                        break
+                    if frame[0] == 0x9:  # Ping
+                        self.wfile.write(websocket_frame(frame[1], opcode=0xA))
+                        self.wfile.flush()
+            except OSError:
+                pass
+            finally:
+                live_reload.remove(self.wfile)
+                self.close_connection = True
+
+    return DevRequestHandler
+
+
+class ChangeQueue:
+    """Changed input paths collected from watcher threads."""
+
+    def __init__(self):
+        self.paths = set()
+        self.last_change = 0.0
+        self.condition = threading.Condition()
+
+    def add(self, path):
+        relative = Path(os.path.relpath(path)).as_posix()
+        if not is_input(relative):
+            return
+        with self.condition:
+            self.paths.add(relative)
+            self.last_change = time.monotonic()
+            self.condition.notify()
+
+    def wait(self) -> Set[str]:
+        """Block until changes arrive and have been quiet for DEBOUNCE_SECONDS."""
+        with self.condition:
+            while not self.paths:
+                self.condition.wait()
+            while time.monotonic() - self.last_change < DEBOUNCE_SECONDS:
+                self.condition.wait(DEBOUNCE_SECONDS)
+            paths, self.paths = self.paths, set()
+            return paths
+
+
+class WatchdogHandler(FileSystemEventHandler):
+    """Forward watchdog events to the change queue."""
+
+    def __init__(self, queue: ChangeQueue):
+        self.queue = queue
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        self.queue.add(event.src_path)
+        if getattr(event, 'dest_path', None):
+            self.queue.add(event.dest_path)
+
+
+def start_watchdog(queue: ChangeQueue):
+    """Watch input directories with watchdog (inotify on Linux)."""
+    observer = Observer()
+    handler = WatchdogHandler(queue)
+    for directory in WATCH_DIRS:
+        if Path(directory).is_dir():
+            observer.schedule(handler, directory, recursive=False)
+    for directory in RECURSIVE_WATCH_DIRS:
+        if Path(directory).is_dir():
+            observer.schedule(handler, directory, recursive=True)
+    observer.daemon = True
+    observer.start()
+    return observer
+
+
+def snapshot() -> Dict[str, tuple]:
+    """mtime and size of every watched input."""
+    state = {}
+    for directory in WATCH_DIRS + RECURSIVE_WATCH_DIRS:
+        root = Path(directory)
+        if not root.is_dir():
+            continue
+        files = root.rglob('*') if directory in RECURSIVE_WATCH_DIRS else root.iterdir()
+        for path in files:
+            relative = path.as_posix()
+            if relative not in state and is_input(relative):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                state[relative] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def start_polling(queue: ChangeQueue, interval: float):
+    """Watch input files by polling their mtimes (fallback without watchdog)."""
+    def poll():
+        previous = snapshot()
+        while True:
+            time.sleep(interval)
+            current = snapshot()
+            for path in previous.keys() | current.keys():
+                if previous.get(path) != current.get(path):
+                    queue.add(path)
+            previous = current
+
+    thread = threading.Thread(target=poll, daemon=True)
+    thread.start()
+    return thread
+
+
+def rebuild(changed: Set[str], live_reload: LiveReload):
+    """Run the steps affected by a batch of changes and notify browsers."""
+    start = time.perf_counter()
+    print(f"\n→ Changed: {', '.join(sorted(changed))}")
+
+    for name in affected_steps(changed):
+        step_start = time.perf_counter()
+        result = run_step(name, changed)
+        elapsed = (time.perf_counter() - step_start) * 1000
+        if not result['ok']:
+            print(f"  ✗ {name} failed ({elapsed:.0f} ms)\n{result['output']}")
+            live_reload.broadcast({'type': 'error', 'step': name, 'output': result['output']})
+            return
+        summary = result['output'].splitlines()[-1] if result['output'] else 'done'
+        print(f"  ✓ {name} ({elapsed:.0f} ms): {summary}")
+
+    only_styles = all(matches(path, STYLE_INPUTS) for path in changed)
+    clients = live_reload.broadcast({'type': 'css' if only_styles else 'reload'})
+    print(f"✓ Rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"({clients} browser(s) notified)")
+
+
+def main():
+    """Watch the site inputs and rebuild on change."""
+    parser = argparse.ArgumentParser(description='Rebuild the docs site on change with live reload')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'Port to serve docs/ on (default: {DEFAULT_PORT})')
+    parser.add_argument('--no-serve', action='store_true',
+                        help='Only rebuild; do not serve the site')
+    parser.add_argument('--poll', action='store_true',
+                        help='Poll file mtimes even if watchdog is installed')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help=f'Polling interval in seconds (default: {POLL_INTERVAL})')
+    args = parser.parse_args()
+
+    if not SITE_DIR.exists():
+        print(f"✗ {SITE_DIR}/ not found (run from the repository root)")
+        sys.exit(1)
+
+    live_reload = LiveReload()
+    queue = ChangeQueue()
+
+    # Bring detail pages up to date (and warm the generator imports)
+    result = build_site.build(verbose=False)
+    print(f"✓ Detail pages: {len(result['built'])} rebuilt, {result['unchanged']} unchanged")
+
+    if Observer is not None and not args.poll:
+        start_watchdog(queue)
+        print("✓ Watching with watchdog")
+    else:
+        start_polling(queue, args.interval)
+        print(f"✓ Watching by polling every {args.interval}s (install 'watchdog' for inotify)")
+
+    if not args.no_serve:
+        server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(live_reload))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"✓ Serving {SITE_DIR}/ at http://127.0.0.1:{args.port}/ with live reload")
+
+    print("Press Ctrl+C to stop")
+    try:
+        while True:
+            rebuild(queue.wait(), live_reload)
+    except KeyboardInterrupt:
+        print("\n✓ Stopped")
+
+
+if __name__ == "__main__":
+    main()